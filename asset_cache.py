@@ -0,0 +1,53 @@
+"""
+Shared cache of scaled image assets.
+
+Drawing code asks for an asset by name at a target size and gets back a
+surface that is already scaled and converted for blitting. Scaled copies are
+keyed by (asset name, size, smooth/fast) and evicted least-recently-used once
+the cache goes over ASSET_CACHE_MB, so steady-state frames do no rescaling at
+all; `stats()` exposes the hit/miss counters to confirm that.
+
+Sources are registered by name, either up front with `register()` or lazily
+by passing `source=` to `scaled()`. Registering a different surface under an
+existing name (e.g. icons reloaded for a new resolution) retires the old
+scaled copies.
+"""
+import pygame
+
+from surface_cache import SurfaceCache
+
+ASSET_CACHE_MB = 32
+
+_sources = {}   # name -> (surface, generation)
+_scaled = SurfaceCache(max_bytes=ASSET_CACHE_MB * 1024 * 1024)
+
+
+def register(name, surface):
+    """Make `surface` the source image for `name`."""
+    current = _sources.get(name)
+    if current is not None and current[0] is surface:
+        return
+    generation = current[1] + 1 if current is not None else 0
+    _sources[name] = (surface, generation)
+
+
+def scaled(name, size, smooth=True, source=None):
+    """Return asset `name` scaled to `size`, building and caching it on first use."""
+    if source is not None:
+        register(name, source)
+    surface, generation = _sources[name]
+    size = (int(size[0]), int(size[1]))
+
+    def build():
+        scale = pygame.transform.smoothscale if smooth else pygame.transform.scale
+        img = scale(surface, size)
+        if pygame.display.get_surface() is not None:
+            img = img.convert_alpha()
+        return img
+
+    return _scaled.get_or_create((name, generation, size, smooth), build)
+
+
+def stats():
+    """Hit/miss/eviction counters and bytes held by the scaled-asset cache."""
+    return _scaled.stats()
@@ -0,0 +1,136 @@
+"""
+Incremental sync of the dashboard poll's ticket history.
+
+The dashboard poll used to download and re-apply the whole `mapped`
+history every 2 seconds, even though the history rarely changes between
+polls. DashboardSync sends a cursor with each poll and applies only what
+changed since then to the TicketStore and MarkerTotals.
+
+Protocol (extra fields on the existing app_dashboard_data.php POST):
+
+    request   cursor=<opaque>      `sync.cursor` of the last response applied;
+                                   omitted on the first poll and after a reset
+    response  "sync": {"mode": "delta", "base": <cursor sent>,
+                       "cursor": <new>, "removed": [ticket serials],
+                       "new_at": "head" | "tail"}
+                  `mapped` holds only the tickets inserted or changed
+                  since `base`; new tickets go at the head (the
+                  default: a newest-first history) or the tail of the
+                  history, in the order they are listed
+              "sync": {"mode": "full", "cursor": <new>}
+                  `mapped` is the whole history: first poll, or the
+                  server rejected the cursor (unknown, expired, from
+                  before a restart)
+              no "sync"
+                  a server without delta support: `mapped` is the whole
+                  history and nothing is sent back
+
+A delta is applied only if its `base` is the cursor this client sent.
+Anything else drops the cursor, so the next poll asks for a full resync.
+The other dashboard fields (server time, last spin, results history) come
+in every response as before. push_client feeds its "history" events,
+which have the same shape, to `apply()` too; calls are serialised.
+
+Every poll's body size and parse time (JSON decode plus applying the rows)
+are recorded per mode; `stats()` / `report()` summarise them.
+"""
+import json
+import threading
+import time
+from collections import deque
+
+import http_client
+
+STATS_WINDOW = 200      # polls kept for the percentiles
+MODES = ("full", "delta", "legacy", "reset")
+
+
+class DashboardSync:
+    def __init__(self, tickets, totals):
+        self.tickets = tickets      # ticket_store.TicketStore
+        self.totals = totals        # history_model.MarkerTotals, fed by change()
+        self.cursor = None
+        self._lock = threading.Lock()
+        self._apply_lock = threading.Lock()     # poll thread vs push thread
+        self._polls = {}            # mode -> [polls, bytes, rows]
+        self._recent = deque(maxlen=STATS_WINDOW)   # (mode, bytes, parse seconds)
+
+    def poll(self, user_id):
+        """POST the dashboard poll and apply it; returns the decoded response."""
+        form = {"ID": str(user_id)}
+        if self.cursor is not None:
+            form["cursor"] = self.cursor
+        resp = http_client.post("dashboard", data=form)
+        resp.raise_for_status()
+        return self.apply(resp.content)
+
+    def apply(self, body):
+        """Decode one dashboard response body and apply its history rows."""
+        with self._apply_lock:
+            return self._apply(body)
+
+    def _apply(self, body):
+        t0 = time.perf_counter()
+        data = json.loads(body)
+        rows = data.get('mapped') or []
+        sync = data.get('sync')
+        mode = sync.get('mode') if isinstance(sync, dict) else None
+
+        if mode == "delta":
+            if self.cursor is None or sync.get('base') != self.cursor:
+                # Relative to a state this client doesn't hold: skip it
+                # and resync on the next poll
+                mode, rows = "reset", []
+                self.cursor = None
+            else:
+                self.totals.change(*self.tickets.apply(rows, sync.get('removed') or (),
+                                                       sync.get('new_at') or "head"))
+                self.cursor = sync.get('cursor')
+        else:
+            self.totals.change(*self.tickets.sync(rows))
+            if mode == "full":
+                self.cursor = sync.get('cursor')
+            else:
+                mode = "legacy"
+                self.cursor = None
+
+        elapsed = time.perf_counter() - t0
+        with self._lock:
+            counts = self._polls.setdefault(mode, [0, 0, 0])
+            counts[0] += 1
+            counts[1] += len(body)
+            counts[2] += len(rows)
+            self._recent.append((mode, len(body), elapsed))
+        return data
+
+    def stats(self):
+        """
+        Per mode: polls, rows applied and bytes per poll, plus parse time
+        mean / p50 / p95 in ms over the last STATS_WINDOW polls.
+        """
+        with self._lock:
+            polls = {mode: list(c) for mode, c in self._polls.items()}
+            recent = list(self._recent)
+        out = {}
+        for mode in MODES:
+            if mode not in polls:
+                continue
+            n, nbytes, rows = polls[mode]
+            parse = sorted(t for m, _, t in recent if m == mode)
+            k = len(parse)
+            out[mode] = {
+                "polls":         n,
+                "rows":          rows,
+                "bytes_per_poll": nbytes // n,
+                "parse_mean_ms": round(sum(parse) / k * 1000, 2) if k else 0.0,
+                "parse_p50_ms":  round(parse[k // 2] * 1000, 2) if k else 0.0,
+                "parse_p95_ms":  round(parse[min(k - 1, k * 95 // 100)] * 1000, 2) if k else 0.0,
+            }
+        return out
+
+    def report(self):
+        """One-line summary of bytes and parse time per poll, by sync mode."""
+        parts = [f"{mode} {s['polls']} polls, {s['bytes_per_poll'] / 1024:.1f} KiB/poll, "
+                 f"parse p50 {s['parse_p50_ms']:.2f} ms"
+                 for mode, s in self.stats().items()]
+        return "sync: " + ("; ".join(parts) or "no polls")
@@ -0,0 +1,69 @@
+"""
+One-shot callbacks at deadlines on the server clock.
+
+The main loop used to notice cycle events by testing the countdown every
+frame (`remaining == 5`, `remaining <= 0`), which misses a second-wide
+window when a frame stalls across it, and used sleeper threads for delayed
+work. DeadlineScheduler keeps named events in a heap ordered by deadline
+(ties in the order they were added). The loop calls `run_due(now)` once
+per frame, and every event whose deadline has passed fires exactly once,
+in deadline order, however late the frame is. The callback receives its
+deadline, so it can work from when it was due rather than when it ran.
+
+Adding an event under a name that is already pending replaces it, which
+is how a cycle is re-aligned after a server time correction. `next_in(now)`
+tells the frame scheduler how long it may sleep before the next deadline,
+so an idle loop wakes on time instead of on its next idle frame.
+"""
+import heapq
+import itertools
+
+
+class DeadlineScheduler:
+    def __init__(self):
+        self._heap = []             # [deadline, seq, name, fn, live]
+        self._by_name = {}          # name -> its pending heap entry
+        self._seq = itertools.count()
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def at(self, deadline, name, fn):
+        """Call fn(deadline) once `deadline` has passed, replacing any pending `name`."""
+        self.cancel(name)
+        entry = [deadline, next(self._seq), name, fn, True]
+        self._by_name[name] = entry
+        heapq.heappush(self._heap, entry)
+
+    def cancel(self, name):
+        entry = self._by_name.pop(name, None)
+        if entry is not None:
+            entry[4] = False        # dropped lazily when it reaches the top
+
+    def pending(self, name):
+        """Deadline of the pending event `name`, or None."""
+        entry = self._by_name.get(name)
+        return entry[0] if entry is not None else None
+
+    def run_due(self, now):
+        """Fire every event due at `now`, earliest first; returns their names."""
+        fired = []
+        heap = self._heap
+        while heap and (not heap[0][4] or heap[0][0] <= now):
+            deadline, _, name, fn, live = heapq.heappop(heap)
+            if not live:
+                continue
+            del self._by_name[name]
+            fired.append(name)
+            # may add events, including ones already due: the loop picks them up
+            fn(deadline)
+        return fired
+
+    def next_in(self, now):
+        """Seconds from `now` to the next deadline (0 if overdue), None if nothing is pending."""
+        heap = self._heap
+        while heap and not heap[0][4]:
+            heapq.heappop(heap)
+        if not heap:
+            return None
+        return max(0.0, heap[0][0] - now)
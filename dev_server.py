@@ -0,0 +1,420 @@
+"""
+Local stand-in for the game server's API, for development and load tests.
+
+    python dev_server.py --rows 50000
+    SPIN_API_BASE=http://127.0.0.1:8765/api/ python main_app.py
+
+Serves the endpoints in http_client.ENDPOINTS (same paths, request bodies
+and the response fields the client reads) from an in-memory history of
+synthetic tickets. Placed bets add tickets, and every 2-minute cycle
+settles the open ones, so the history changes the way the real one does.
+The dashboard speaks the delta-sync protocol described in dashboard_sync;
+with --legacy it sends the full history every poll, as the production
+server does. --latency delays every reply, to check the UI stays responsive
+on a slow link.
+
+GET app_events.php is the push stream push_client subscribes to (see
+there for the events).
+
+    python dev_server.py --bench --rows 1000,10000,100000
+
+runs the server in-process and compares bytes and parse time per poll of
+full and delta sync while a few tickets change between polls.
+"""
+import argparse
+import json
+import random
+import secrets
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+CYCLE_DURATION = 120
+CHANGE_LOG_MAX = 100_000        # changes a cursor can be behind before it expires
+RESULTS_HISTORY = 10
+STARTING_POINTS = 10000
+RESULT_PUSH_LEAD = 6            # seconds before the spin the result is pushed
+HEARTBEAT_S = 10                # push stream "time" event interval
+STREAM_TICK_S = 0.5             # push stream wakes at least this often
+
+
+class History:
+    """
+    The tickets plus a log of changed serials. Cursors are "<epoch>:<seq>";
+    a delta from seq n lists the tickets logged after n. A cursor from
+    another epoch (a restarted server) or older than the log is rejected.
+    """
+
+    def __init__(self, rows=0, keep=None, seed=0):
+        self.rng = random.Random(seed)
+        self.keep = keep                # most tickets kept, oldest dropped first
+        self.tickets = {}               # serial -> row, oldest first
+        self.epoch = secrets.token_hex(4)
+        self.log = []                   # serial changed at seq log_start + i
+        self.log_t = []                 # ... and when
+        self.log_start = 1
+        self.results = []               # game_results_history, newest first
+        self.lock = threading.Lock()
+        self.changed = threading.Condition(self.lock)   # notified after each request
+        self._serial = 100000
+        now = time.time()
+        for i in range(rows):
+            self.add_ticket(self.rng.choice((10, 20, 50, 100)), now - (rows - i) * 30, settle=i < rows - 3)
+
+    @property
+    def seq(self):
+        return self.log_start + len(self.log) - 1
+
+    def cursor(self):
+        return f"{self.epoch}:{self.seq}"
+
+    def _changed(self, serial):
+        self.log.append(serial)
+        self.log_t.append(time.time())
+        if len(self.log) > CHANGE_LOG_MAX:
+            drop = len(self.log) - CHANGE_LOG_MAX
+            del self.log[:drop]
+            del self.log_t[:drop]
+            self.log_start += drop
+
+    def add_ticket(self, amount, withdraw_ts, settle=False):
+        self._serial += 1
+        serial = f"T{self._serial}"
+        self.tickets[serial] = {
+            "ticket_serial": serial,
+            "bet_amount":    str(amount),
+            "claim_point":   "",
+            "unclaim_point": "",
+            "withdraw_time": time.strftime("%H:%M:%S", time.localtime(withdraw_ts)),
+            "game_result":   None,
+        }
+        if settle:
+            self.settle(serial, self.rng.randrange(12))
+        self._changed(serial)
+        if self.keep is not None and len(self.tickets) > self.keep:
+            oldest = next(iter(self.tickets))
+            del self.tickets[oldest]
+            self._changed(oldest)
+        return serial
+
+    def settle(self, serial, number):
+        row = self.tickets[serial]
+        won = self.rng.random() < 1 / 12
+        points = str(int(row["bet_amount"]) * 10) if won else "0"
+        row["claim_point"] = "0"
+        row["unclaim_point"] = points
+        row["game_result"] = {"winning_number": number} if won else {"lose_number": number}
+        self._changed(serial)
+
+    def settle_open(self, number):
+        for serial, row in self.tickets.items():
+            if row["game_result"] is None:
+                self.settle(serial, number)
+
+    def delta_since(self, cursor):
+        """(rows, removed serials) changed after `cursor`, or None if it can't be served."""
+        try:
+            epoch, seq = cursor.split(":")
+            seq = int(seq)
+        except (AttributeError, ValueError):
+            return None
+        if epoch != self.epoch or seq > self.seq or seq < self.log_start - 1:
+            return None
+        rows, removed = [], []
+        for serial in dict.fromkeys(self.log[seq - self.log_start + 1:]):
+            row = self.tickets.get(serial)
+            if row is None:
+                removed.append(serial)
+            else:
+                rows.append(row)
+        return rows, removed
+
+    def changed_at(self, cursor):
+        """When the first change after `cursor` was made (a cursor delta_since accepted)."""
+        i = int(cursor.split(":")[1]) - self.log_start + 1
+        return self.log_t[i] if i < len(self.log_t) else None
+
+
+class Game:
+    """Cycle timing, results and the per-endpoint handlers."""
+
+    def __init__(self, history, legacy=False):
+        self.history = history
+        self.legacy = legacy
+        self.chosen = {}                # withdraw timestamp -> segment index
+        self.settled_cycle = self.cycle_start()
+        self.points = STARTING_POINTS   # the one account's balance
+        self.points_at = time.time()    # when it last changed
+        self.stopped = threading.Event()    # ends the push streams
+
+    @staticmethod
+    def cycle_start(now=None):
+        now = time.time() if now is None else now
+        return now - now % CYCLE_DURATION
+
+    def _tick(self):
+        # Settle open tickets once per finished cycle
+        start = self.cycle_start()
+        if start > self.settled_cycle:
+            h = self.history
+            number = self.chosen.pop(start, h.rng.randrange(12))
+            h.settle_open(number)
+            h.results.insert(0, {"created_time": time.strftime("%H:%M", time.localtime(start)),
+                                 "result_number": number})
+            del h.results[RESULTS_HISTORY:]
+            self.settled_cycle = start
+
+    def _sync(self, data, cursor):
+        # `mapped` and `sync` for a client holding `cursor`
+        h = self.history
+        delta = h.delta_since(cursor) if cursor else None
+        if delta is None:
+            data["mapped"] = list(h.tickets.values())
+            data["sync"] = {"mode": "full", "cursor": h.cursor()}
+        else:
+            data["mapped"], removed = delta
+            # The history is oldest first, so new tickets go at the end
+            data["sync"] = {"mode": "delta", "base": cursor, "cursor": h.cursor(), "removed": removed,
+                            "new_at": "tail"}
+        return data
+
+    def _add_points(self, points):
+        self.points += points
+        self.points_at = time.time()
+
+    def dashboard(self, form, body):
+        h = self.history
+        self._tick()
+        data = {
+            "server_timestamp":     time.time(),
+            "last_spin_timestamp":  self.settled_cycle,
+            "game_results_history": h.results,
+        }
+        if self.legacy:
+            data["mapped"] = list(h.tickets.values())
+            return data
+        return self._sync(data, (form.get("cursor") or [None])[0])
+
+    def make_result(self, form, body):
+        withdraw = int(body.get("withdraw_time", 0))
+        index = self.chosen.setdefault(withdraw, self.history.rng.randrange(12))
+        return {"choosenindex": index, "chooseindexpoint": 0,
+                "game_results_history": self.history.results}
+
+    def place_bet(self, form, body):
+        bets = body.get("bets") or {}
+        amount = sum(int(v) for v in bets.values())
+        if amount <= 0:
+            return {"status": "error", "message": "no bets"}
+        self._add_points(-amount)
+        serial = self.history.add_ticket(amount, self.cycle_start() + CYCLE_DURATION)
+        return {"status": "success", "data": {
+            "serial": serial,
+            "ticket": {"id": serial[1:], "serial_number": serial, "user_id": body.get("User_id"),
+                       "amount": amount, "created_at": body.get("Withdraw_time"),
+                       "card_name": json.dumps(bets)},
+        }}
+
+    def claim_point(self, form, body):
+        row = self.history.tickets.get(body.get("ticket_serial"))
+        if row is None:
+            return {"status": "error", "message": "unknown ticket"}
+        points = float(row["unclaim_point"] or 0)
+        if points <= 0:
+            return {"status": "already_claimed"}
+        row["claim_point"], row["unclaim_point"] = row["unclaim_point"], "0"
+        self.history._changed(row["ticket_serial"])
+        self._add_points(points)
+        return {"status": "success", "added_points": points}
+
+    def toggle_auto_claim(self, form, body):
+        return {"status": "success", "auto_claim": body.get("auto_claim")}
+
+    def sign_in(self, form, body):
+        login = (form.get("login") or ["guest"])[0]
+        return {"status": True, "data": {"id": 1, "username": login, "first_name": login.title(),
+                                         "last_name": "", "points": self.points, "winning_points": 0,
+                                         "auto_claim": 0}}
+
+    def stream(self, query):
+        """
+        Yield (event, data) for one push subscriber, forever: the history
+        from its `cursor` on, the result RESULT_PUSH_LEAD s before each
+        spin, the balance, and the time every HEARTBEAT_S.
+        """
+        h = self.history
+        cursor = (query.get("cursor") or [None])[0]
+        seq = pushed_result = points_at = None
+        beat = 0.0
+        while not self.stopped.is_set():
+            out = []
+            with h.changed:
+                if seq == h.seq:
+                    h.changed.wait(STREAM_TICK_S)
+                self._tick()
+                now = time.time()
+                if seq != h.seq:
+                    data = self._sync({}, cursor)
+                    delta = data["sync"]["mode"] == "delta"
+                    data["changed_at"] = h.changed_at(cursor) if delta else None
+                    if data["sync"]["mode"] == "full" or data["mapped"] or data["sync"]["removed"]:
+                        out.append(("history", data))
+                    cursor, seq = data["sync"]["cursor"], h.seq
+                end = int(self.cycle_start(now)) + CYCLE_DURATION
+                if end - now <= RESULT_PUSH_LEAD and pushed_result != end:
+                    data = self.make_result({}, {"withdraw_time": end})
+                    data.update(withdraw_time=end, changed_at=now)
+                    out.append(("result", data))
+                    pushed_result = end
+                if points_at != self.points_at:
+                    # the first one is the balance as it stands, not a change
+                    changed_at = self.points_at if points_at is not None else None
+                    points_at = self.points_at
+                    out.append(("balance", {"points": self.points, "changed_at": changed_at}))
+                if now - beat >= HEARTBEAT_S:
+                    beat = now
+                    out.append(("time", {"server_timestamp": now, "last_spin_timestamp": self.settled_cycle,
+                                         "changed_at": now}))
+            yield from out
+
+    ROUTES = {
+        "app_dashboard_data.php":    dashboard,
+        "app_make_result.php":       make_result,
+        "app_place_bet.php":         place_bet,
+        "app_claim_point.php":       claim_point,
+        "app_toggle_auto_claim.php": toggle_auto_claim,
+        "app-sign-in.php":           sign_in,
+    }
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # keep-alive, like the production server
+    game = None
+    latency = 0.0                       # seconds added before every reply
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_POST(self):
+        raw = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        route = Game.ROUTES.get(self.path.rsplit("/", 1)[-1])
+        if route is None:
+            self._send(404, {"status": False, "message": "not found"})
+            return
+        form, body = {}, {}
+        if self.headers.get("Content-Type", "").startswith("application/json"):
+            body = json.loads(raw or b"{}")
+        else:
+            form = parse_qs(raw.decode())
+        if self.latency:
+            time.sleep(self.latency)
+        with self.game.history.changed:
+            data = route(self.game, form, body)
+            self.game.history.changed.notify_all()
+        self._send(200, data)
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if path.rsplit("/", 1)[-1] != "app_events.php":
+            self._send(404, {"status": False, "message": "not found"})
+            return
+        # One chunk per event, so the client sees each as soon as it's written
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for name, data in self.game.stream(parse_qs(query)):
+                event = f"event: {name}\ndata: {json.dumps(data)}\n\n".encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+                self.wfile.flush()
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+    def _send(self, code, data):
+        payload = json.dumps(data).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+def serve(game, port=0, latency=0.0):
+    """Start the server on a daemon thread; returns it (server_port has the port)."""
+    game.stopped.clear()
+    handler = type("GameHandler", (Handler,), {"game": game, "latency": latency})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop(server):
+    """Shut `server` down, ending its push streams too."""
+    server.RequestHandlerClass.game.stopped.set()
+    server.shutdown()
+    server.server_close()
+
+
+def bench(sizes, polls, churn):
+    """Bytes and parse time per poll, full vs delta sync, `churn` tickets changed per poll."""
+    import http_client
+    import history_model
+    from dashboard_sync import DashboardSync
+    from ticket_store import TicketStore
+
+    for n in sizes:
+        print(f"\n{n:,} tickets, {churn} changed per poll")
+        for legacy in (True, False):
+            history = History(rows=n)
+            server = serve(Game(history, legacy=legacy))
+            url = f"http://127.0.0.1:{server.server_port}/api/app_dashboard_data.php"
+            http_client.ENDPOINTS["dashboard"] = http_client.ENDPOINTS["dashboard"]._replace(url=url)
+            sync = DashboardSync(TicketStore(), history_model.MarkerTotals())
+            sync.poll(1)                # initial load, full either way
+            for _ in range(polls):
+                with history.lock:
+                    for serial in history.rng.sample(list(history.tickets), churn):
+                        history.settle(serial, history.rng.randrange(12))
+                    history.add_ticket(10, time.time())
+                sync.poll(1)
+            stop(server)
+            mode = "legacy" if legacy else "delta"
+            s = sync.stats()[mode]
+            print(f"  {'full every poll' if legacy else 'delta sync':<16} {s['bytes_per_poll']:>11,} B/poll   "
+                  f"parse p50 {s['parse_p50_ms']:8.2f} ms   p95 {s['parse_p95_ms']:8.2f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rows", default="200", help="tickets to start with (comma-separated with --bench)")
+    parser.add_argument("--keep", type=int, help="keep at most this many tickets, dropping the oldest")
+    parser.add_argument("--legacy", action="store_true", help="send the full history every poll")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before every reply")
+    parser.add_argument("--bench", action="store_true", help="compare full and delta polls, then exit")
+    parser.add_argument("--polls", type=int, default=30, help="timed polls per --bench case")
+    parser.add_argument("--churn", type=int, default=3, help="tickets changed between --bench polls")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        bench([int(x) for x in args.rows.split(",")], args.polls, args.churn)
+        return
+    game = Game(History(rows=int(args.rows), keep=args.keep), legacy=args.legacy)
+    server = serve(game, args.port, args.latency)
+    print(f"serving on http://127.0.0.1:{server.server_port}/api/ "
+          f"({len(game.history.tickets)} tickets, {'legacy' if args.legacy else 'delta'} sync)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        stop(server)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Dirty-rectangle bookkeeping for the main loop.
+
+Each frame the loop registers its UI regions in drawing order with `add()`:
+a name, a state key (anything comparable that changes whenever the region
+would look different) and a function that draws the region and returns the
+rect(s) it covered. `draw()` then redraws only the regions whose state
+changed, plus every region overlapping one of them, after restoring their
+previous areas from the backdrop; `present()` pushes just those areas to the
+display with pygame.display.update().
+
+A full redraw and flip happens on the first frame, after `invalidate()` and
+whenever the tracker is disabled, so the same code path serves both modes.
+"""
+import pygame
+
+
+def _as_rects(drawn):
+    """Normalise a draw function's return value to a list of non-empty Rects."""
+    if drawn is None:
+        return []
+    if isinstance(drawn, pygame.Rect):
+        drawn = [drawn]
+    return [pygame.Rect(r) for r in drawn if r and r[2] > 0 and r[3] > 0]
+
+
+class DirtyRegions:
+    def __init__(self, backdrop, enabled=True):
+        self.backdrop = backdrop    # full-screen surface everything is drawn over
+        self.enabled = enabled
+        self._last = {}             # name -> (state, rects) as last drawn
+        self._queue = []            # [(name, state, draw_fn)] for this frame
+        self._updates = None        # rects to push, or None for a full flip
+        self._full = True
+        self.redrawn = 0            # regions redrawn by the last draw()
+        self.updated_px = 0         # pixels pushed by the last present()
+
+    def invalidate(self):
+        """Redraw everything and flip on the next frame."""
+        self._full = True
+
+    def add(self, name, state, draw_fn):
+        self._queue.append((name, state, draw_fn))
+
+    def _resolve(self, queue):
+        """Names to redraw and the old areas that must be restored first."""
+        dirty, areas = set(), []
+        names = set()
+        for name, state, _ in queue:
+            names.add(name)
+            last = self._last.get(name)
+            if last is None or last[0] != state:
+                dirty.add(name)
+                if last is not None:
+                    areas.extend(last[1])
+        # Regions not registered this frame are simply cleared
+        for name in set(self._last) - names:
+            areas.extend(self._last.pop(name)[1])
+
+        # Anything overlapping a restored area has to be redrawn as well
+        changed = True
+        while changed:
+            changed = False
+            for name, _, _ in queue:
+                if name in dirty or name not in self._last:
+                    continue
+                rects = self._last[name][1]
+                if any(r.collidelist(areas) != -1 for r in rects):
+                    dirty.add(name)
+                    areas.extend(rects)
+                    changed = True
+        return dirty, areas
+
+    def draw(self, screen):
+        """Restore and redraw this frame's changed regions (all of them on a full frame)."""
+        queue, self._queue = self._queue, []
+        full = self._full or not self.enabled
+        self._full = False
+
+        if full:
+            screen.blit(self.backdrop, (0, 0))
+            dirty, areas = {name for name, _, _ in queue}, []
+            self._last.clear()
+        else:
+            dirty, areas = self._resolve(queue)
+            for r in areas:
+                screen.blit(self.backdrop, r, r)
+
+        drawn = []
+        for name, state, draw_fn in queue:
+            if name not in dirty:
+                continue
+            rects = _as_rects(draw_fn())
+            self._last[name] = (state, rects)
+            drawn.extend(rects)
+
+        if not full:
+            # A region that grew past its old area may have covered a clean
+            # region drawn above it; repaint everything next frame to be safe
+            for name, _, _ in queue:
+                if name not in dirty and any(
+                        r.collidelist(drawn) != -1 for r in self._last[name][1]):
+                    self._full = True
+                    break
+
+        self.redrawn = len(dirty)
+        self._updates = None if full else areas + drawn
+
+    def present(self, extra=()):
+        """
+        Flip after a full frame, otherwise update only the redrawn areas plus
+        `extra` (rects drawn over the regions after draw(), e.g. an overlay).
+        """
+        if self._updates is None:
+            pygame.display.flip()
+            surf = pygame.display.get_surface()
+            self.updated_px = surf.get_width() * surf.get_height() if surf else 0
+        else:
+            self._updates.extend(_as_rects(extra))
+            if self._updates:
+                pygame.display.update(self._updates)
+            self.updated_px = sum(r.width * r.height for r in self._updates)
@@ -0,0 +1,67 @@
+"""
+Shared pygame fonts.
+
+Fonts are keyed by (family, size, bold) and built once; every later request
+for the same key returns the same Font object, so drawing code can ask for a
+font every frame without a SysFont lookup or a font file load. family=None is
+pygame's bundled default font, the one `Font(None, size)` returns.
+
+`preload()` resolves the system font table and the UI's fixed fonts at
+startup and `report()` summarises how long that took. Sizes are mostly
+derived from the screen, so `set_screen_size()` drops every font when the
+resolution changes and they are rebuilt on demand at the new sizes.
+"""
+import time
+
+import pygame
+
+_fonts = {}             # (family, size, bold) -> Font
+_build_ms = {}          # (family, size, bold) -> ms spent building it
+_sysfont_ms = None      # ms spent scanning the system font table
+_screen_size = None
+
+
+def get_font(family, size, bold=False):
+    """Shared Font for (family, size, bold), built on first request."""
+    key = (family, int(size), bool(bold))
+    font = _fonts.get(key)
+    if font is None:
+        t0 = time.perf_counter()
+        font = pygame.font.SysFont(family, key[1], bold=key[2])
+        _build_ms[key] = (time.perf_counter() - t0) * 1000
+        _fonts[key] = font
+    return font
+
+
+def preload(specs=()):
+    """Scan the system fonts once and build each (family, size, bold) in `specs`."""
+    global _sysfont_ms
+    if _sysfont_ms is None:
+        t0 = time.perf_counter()
+        pygame.font.get_fonts()     # populates pygame's system font table
+        _sysfont_ms = (time.perf_counter() - t0) * 1000
+    for family, size, bold in specs:
+        get_font(family, size, bold)
+
+
+def set_screen_size(size):
+    """Drop all fonts if the screen size differs from the last one seen."""
+    global _screen_size
+    size = tuple(size)
+    if size != _screen_size:
+        if _screen_size is not None:
+            _fonts.clear()
+            _build_ms.clear()
+        _screen_size = size
+
+
+def report():
+    """One-line summary of font resolution cost, for startup logging."""
+    total = sum(_build_ms.values())
+    slowest = max(_build_ms.items(), key=lambda kv: kv[1], default=None)
+    line = (f"fonts: system table {_sysfont_ms or 0.0:.1f} ms, "
+            f"{len(_fonts)} fonts built in {total:.1f} ms")
+    if slowest is not None:
+        (family, size, bold), ms = slowest
+        line += f" (slowest {family or 'default'} {size}{' bold' if bold else ''}: {ms:.1f} ms)"
+    return line
@@ -0,0 +1,111 @@
+"""
+Adaptive frame rate for the main loop.
+
+The loop only needs full rate while something on screen moves: the wheel
+spinning, the result blinking, a table being scrolled or the selected chip
+rotating. The rest of each cycle only the clock and the countdown change, so
+`tick(animating)` drops to IDLE_FPS and sleeps in `pygame.event.wait()` with
+a timeout instead of `Clock.tick()`. Any input wakes it immediately; the
+event is kept and handed back by `events()` so the loop sees it as usual, and
+the loop stays at full rate for INPUT_GRACE_S after it so hover and wheel
+scrolling feel the same as before. `wake_in` cuts an idle wait short so the
+loop is awake for its next timed event (see deadlines.py).
+
+Wall time and process CPU time are accumulated per rate; `report()`
+summarises how long the loop ran at each and the CPU it used there.
+"""
+import time
+
+import pygame
+
+ACTIVE_FPS = 60
+IDLE_FPS = 4
+INPUT_GRACE_S = 0.5
+
+_INPUT_EVENTS = {
+    pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN, pygame.MOUSEBUTTONUP,
+    pygame.MOUSEWHEEL, pygame.KEYDOWN, pygame.KEYUP,
+    pygame.TEXTINPUT, pygame.WINDOWFOCUSGAINED, pygame.WINDOWEXPOSED,
+}
+
+
+class FrameScheduler:
+    def __init__(self, active_fps=ACTIVE_FPS, idle_fps=IDLE_FPS):
+        self.active_fps = active_fps
+        self.idle_fps = idle_fps
+        self.clock = pygame.time.Clock()
+        self.dt = 0.0               # seconds since the previous frame
+        self.mode = "active"
+        self._pending = []          # events taken by event.wait(), not yet seen
+        self._last_input = float("-inf")
+        self._frame_t = time.perf_counter()
+        self._frame_cpu = time.process_time()
+        self._wall = {"active": 0.0, "idle": 0.0}
+        self._cpu = {"active": 0.0, "idle": 0.0}
+        self._frames = {"active": 0, "idle": 0}
+
+    def events(self):
+        """All events since the last call, including any that woke an idle wait."""
+        evs = self._pending + pygame.event.get()
+        self._pending = []
+        if any(ev.type in _INPUT_EVENTS for ev in evs):
+            self._last_input = time.perf_counter()
+        return evs
+
+    def tick(self, animating, wake_in=None):
+        """
+        End the frame: full rate if animating or just after input, else idle,
+        but for no longer than `wake_in` seconds when given.
+        """
+        now = time.perf_counter()
+        active = animating or now - self._last_input < INPUT_GRACE_S
+        self.mode = "active" if active else "idle"
+
+        if active:
+            self.clock.tick(self.active_fps)
+        else:
+            budget_ms = 1000 // self.idle_fps
+            timeout = budget_ms - int((now - self._frame_t) * 1000)
+            if wake_in is not None:
+                # round up, so the loop wakes just after the deadline, not before
+                timeout = min(timeout, int(wake_in * 1000) + 1)
+            if timeout > 0:
+                ev = pygame.event.wait(timeout)
+                if ev.type != pygame.NOEVENT:
+                    self._pending.append(ev)
+            # keep Clock's notion of the last frame current for the next active tick
+            self.clock.tick()
+
+        end, cpu = time.perf_counter(), time.process_time()
+        self.dt = end - self._frame_t
+        self._wall[self.mode] += self.dt
+        self._cpu[self.mode] += cpu - self._frame_cpu
+        self._frames[self.mode] += 1
+        self._frame_t, self._frame_cpu = end, cpu
+
+    def stats(self):
+        """Per-rate wall seconds, CPU seconds, frame count and CPU percentage."""
+        out = {}
+        for mode in ("active", "idle"):
+            wall = self._wall[mode]
+            out[mode] = {
+                "wall_s": wall,
+                "cpu_s": self._cpu[mode],
+                "frames": self._frames[mode],
+                "cpu_pct": 100.0 * self._cpu[mode] / wall if wall else 0.0,
+            }
+        return out
+
+    def report(self):
+        """One-line summary of time and CPU spent at each rate."""
+        s = self.stats()
+        total = s["active"]["wall_s"] + s["idle"]["wall_s"]
+        cpu = s["active"]["cpu_s"] + s["idle"]["cpu_s"]
+        parts = [
+            f"{mode} {self.active_fps if mode == 'active' else self.idle_fps} fps "
+            f"{s[mode]['wall_s']:.1f} s ({s[mode]['frames']} frames, "
+            f"{s[mode]['cpu_pct']:.0f}% CPU)"
+            for mode in ("active", "idle")
+        ]
+        avg = 100.0 * cpu / total if total else 0.0
+        return "frames: " + ", ".join(parts) + f"; overall {avg:.0f}% CPU"
@@ -0,0 +1,187 @@
+"""
+Per-stage frame timing for the main loop.
+
+The loop wraps each stage in `stage(name)` (or passes draw callbacks through
+`timed(name, fn)`) and calls `end_frame()` once per frame. Each stage's time
+is summed over the frame and kept in a rolling window of WINDOW_FRAMES
+frames. From that window the F3 overlay (`draw_overlay()`) shows p50, p95 and
+max per stage. With a log path configured, every frame is also appended as
+one JSON line to a file rotated at LOG_MAX_BYTES.
+
+Timing is off unless the overlay is shown or a log is configured. While it is
+off, `stage()` returns a shared no-op context manager, `timed()` returns the
+function unchanged and `end_frame()` returns immediately, so the hooks can
+stay in production builds.
+"""
+import contextlib
+import json
+import os
+import time
+from collections import deque
+
+import pygame
+
+from font_registry import get_font
+
+WINDOW_FRAMES      = 300
+OVERLAY_REFRESH_MS = 250
+LOG_MAX_BYTES      = 5 * 1024 * 1024
+LOG_BACKUPS        = 3
+
+enabled = False         # collecting timings: overlay shown or log configured
+overlay = False
+
+_NULL_STAGE = contextlib.nullcontext()
+_frame = {}             # stage -> seconds spent in it this frame
+_window = {}            # stage -> deque of per-frame ms
+_frame_start = None
+_log_path = None
+_log_file = None
+_overlay_surf = None
+_overlay_at = 0
+
+
+class _Stage:
+    __slots__ = ("name", "t0")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        add(self.name, time.perf_counter() - self.t0)
+
+
+def _update_enabled():
+    global enabled, _frame_start
+    was, enabled = enabled, overlay or _log_path is not None
+    if enabled and not was:
+        _frame.clear()
+        _frame_start = time.perf_counter()
+
+
+def configure(log_path=None):
+    """Start (or with None stop) writing one JSON line per frame to `log_path`."""
+    global _log_path, _log_file
+    if _log_file is not None:
+        _log_file.close()
+        _log_file = None
+    _log_path = log_path
+    _update_enabled()
+
+
+def toggle_overlay():
+    global overlay, _overlay_surf
+    overlay = not overlay
+    _overlay_surf = None
+    _update_enabled()
+    return overlay
+
+
+def stage(name):
+    """Context manager adding the time spent inside it to stage `name`."""
+    if not enabled:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def timed(name, fn):
+    """`fn` wrapped so each call is added to stage `name` (just `fn` while off)."""
+    if not enabled:
+        return fn
+
+    def wrapper(*args, **kwargs):
+        with _Stage(name):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def add(name, seconds):
+    _frame[name] = _frame.get(name, 0.0) + seconds
+
+
+def end_frame():
+    """Close the current frame: roll the stage times into the window and log them."""
+    global _frame_start
+    if not enabled:
+        return
+    now = time.perf_counter()
+    frame = {name: s * 1000 for name, s in _frame.items()}
+    frame["frame"] = (now - _frame_start) * 1000
+    _frame.clear()
+    _frame_start = now
+
+    for name in frame:
+        if name not in _window:
+            _window[name] = deque(maxlen=WINDOW_FRAMES)
+    for name, samples in _window.items():
+        samples.append(frame.get(name, 0.0))
+
+    if _log_path is not None:
+        _write_log(frame)
+
+
+def _rotate():
+    global _log_file
+    _log_file.close()
+    _log_file = None
+    for i in range(LOG_BACKUPS - 1, 0, -1):
+        src = f"{_log_path}.{i}"
+        if os.path.exists(src):
+            os.replace(src, f"{_log_path}.{i + 1}")
+    os.replace(_log_path, f"{_log_path}.1")
+
+
+def _write_log(frame):
+    global _log_file
+    if _log_file is None:
+        _log_file = open(_log_path, "a", encoding="utf-8")
+    record = {"t": round(time.time(), 3)}
+    record.update((name, round(ms, 3)) for name, ms in frame.items())
+    _log_file.write(json.dumps(record) + "\n")
+    if _log_file.tell() >= LOG_MAX_BYTES:
+        _rotate()
+
+
+def summary():
+    """{stage: (p50, p95, max)} in ms over the rolling window."""
+    out = {}
+    for name, samples in _window.items():
+        ordered = sorted(samples)
+        if not ordered:
+            continue
+        n = len(ordered)
+        out[name] = (ordered[n // 2], ordered[min(n - 1, n * 95 // 100)], ordered[-1])
+    return out
+
+
+def _build_overlay():
+    font = get_font(None, 20)
+    rows = [("stage", "p50", "p95", "max")]
+    stats = summary()
+    # Total frame time last, the stages in order of their p95
+    names = sorted((n for n in stats if n != "frame"), key=lambda n: -stats[n][1])
+    if "frame" in stats:
+        names.append("frame")
+    rows += [(name, *(f"{v:.2f}" for v in stats[name])) for name in names]
+
+    col_x, line_h, pad = (0, 110, 170, 230), font.get_linesize(), 6
+    surf = pygame.Surface((290 + pad * 2, line_h * len(rows) + pad * 2))
+    surf.fill((0, 0, 0))
+    for i, row in enumerate(rows):
+        color = (255, 255, 0) if i == 0 else (255, 255, 255)
+        for x, text in zip(col_x, row):
+            surf.blit(font.render(text, True, color), (pad + x, pad + i * line_h))
+    return surf
+
+
+def draw_overlay(screen, pos=(10, 60)):
+    """Draw the stage table (refreshed every OVERLAY_REFRESH_MS); returns its rect."""
+    global _overlay_surf, _overlay_at
+    now = pygame.time.get_ticks()
+    if _overlay_surf is None or now - _overlay_at >= OVERLAY_REFRESH_MS:
+        _overlay_surf = _build_overlay()
+        _overlay_at = now
+    return screen.blit(_overlay_surf, pos)
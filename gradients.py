@@ -0,0 +1,75 @@
+"""
+Vertical gradient surfaces, generated in one shot and memoised.
+
+`vertical()` returns a surface filled top→bottom from one colour to another,
+optionally with rounded corners, keyed by (size, colours, border radius) so
+each distinct gradient is built once and reused every frame after that. The
+colour ramp is computed for all rows at once and broadcast across the width
+with NumPy / pygame.surfarray; without NumPy it falls back to one
+`pygame.draw.line` per row. Both paths produce the same pixels as each
+other and as the per-row loops they replaced in wheel_module: row y gets
+int(top + y / (h - 1) * (bottom - top)). main_app's
+create_gold_gradient_surface is the exception: its old loop ramped over
+y / h, so it never quite reached the bottom colour, and through vertical()
+most rows now come out a level or two darker (up to 4 at 20 px high).
+"""
+import pygame
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from surface_cache import SurfaceCache
+
+GRADIENT_CACHE_MB = 16
+
+_gradients = SurfaceCache(max_bytes=GRADIENT_CACHE_MB * 1024 * 1024)
+
+
+def _fill_numpy(surf, top, bottom):
+    w, h = surf.get_size()
+    t = np.arange(h) / max(1, h - 1)
+    top = np.asarray(top, dtype=float)
+    ramp = (top + t[:, None] * (np.asarray(bottom, dtype=float) - top)).astype(np.uint8)
+    pygame.surfarray.blit_array(surf, np.broadcast_to(ramp, (w, h, 3)))
+
+
+def _fill_lines(surf, top, bottom):
+    w, h = surf.get_size()
+    for y in range(h):
+        t = y / max(1, h - 1)
+        color = tuple(int(top[i] + t * (bottom[i] - top[i])) for i in range(3))
+        pygame.draw.line(surf, color, (0, y), (w, y))
+
+
+def _build(size, top, bottom, border_radius):
+    grad = pygame.Surface(size)
+    if np is not None:
+        _fill_numpy(grad, top, bottom)
+    else:
+        _fill_lines(grad, top, bottom)
+
+    if border_radius > 0:
+        # Rounded mask multiplied by the gradient, as draw_vertical_gradient_rect did
+        rounded = pygame.Surface(size, pygame.SRCALPHA)
+        pygame.draw.rect(rounded, (255, 255, 255, 255), (0, 0, *size), border_radius=border_radius)
+        rounded.blit(grad, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
+        grad = rounded
+
+    if pygame.display.get_surface() is not None:
+        grad = grad.convert_alpha() if border_radius > 0 else grad.convert()
+    return grad
+
+
+def vertical(size, top, bottom, border_radius=0):
+    """Shared top→bottom gradient surface of `size`; do not draw onto it."""
+    size = (int(size[0]), int(size[1]))
+    top, bottom = tuple(top[:3]), tuple(bottom[:3])
+    key = (size, top, bottom, border_radius)
+    return _gradients.get_or_create(key, lambda: _build(size, top, bottom, border_radius))
+
+
+def stats():
+    """Hit/miss/eviction counters and bytes held by the gradient cache."""
+    return _gradients.stats()
@@ -0,0 +1,216 @@
+"""
+View-model for the dashboard's history rows.
+
+The dashboard's `mapped` rows arrive as raw JSON dicts; DashboardSync
+(by poll or push) files them into a ticket_store.TicketStore, whose view()
+turns each row into a HistoryRecord the first time a screen asks for it:
+points parsed to floats, the status, the display strings, the card behind
+the Marker Card and whether the Claim button is live. The History and Card
+History screens draw from these records, so nothing is parsed per frame,
+and a row that hasn't changed since the last poll keeps its old record.
+MarkerTotals keeps the Account screen's per-card totals from the Amounts
+TicketStore reports for each change.
+"""
+from collections import namedtuple
+from dataclasses import dataclass
+from typing import Optional
+
+# Status column values
+BET_PLACED = "Bet Placed"
+LOOSE      = "Loose"
+WIN        = "WIN"
+
+SUITS = ('Spades', 'Diamond', 'Clubs', 'Hearts')
+
+# The fields of a HistoryRecord that MarkerTotals counts; TicketStore reports
+# its changes as these rather than building whole records
+Amounts = namedtuple("Amounts", "ticket_serial marker bet_amount claim_amount unclaim_amount")
+
+
+@dataclass(eq=False)
+class HistoryRecord:
+    """One parsed history row; treat as read-only (they're shared between polls)."""
+    key: tuple                  # (ticket_serial, content hash or store version): row-cache identity
+    ticket_serial: object
+    cp: Optional[float]         # claim_point / unclaim_point, None where missing
+    up: Optional[float]
+    status: str                 # BET_PLACED, LOOSE or WIN
+    win_point: str              # Win_point column text
+    action: str                 # Action button label
+    claimable: bool             # Action button is a live “Claim”
+    card: Optional[int]         # number 0-11 shown as the Marker Card
+    face: Optional[str]         # 'K' / 'Q' / 'J' of that card
+    suit: Optional[str]         # one of SUITS
+    marker: object              # Account screen group: winning/losing number, None = NA
+    bet_amount: float           # Account screen sums (0.0 where missing)
+    claim_amount: float
+    unclaim_amount: float
+    row: dict                   # the raw row, for plain text columns
+
+    def text(self, field):
+        return str(self.row.get(field, ''))
+
+
+def to_val(v):
+    """A points field as a float, None where missing or not a number."""
+    try:
+        return float(v) if v not in (None, '', 'NA') else None
+    except:
+        return None
+
+
+def _amount(v):
+    try:
+        return float(v or 0)
+    except:
+        return 0.0
+
+
+def status_of(cp, up):
+    """BET_PLACED, LOOSE or WIN for parsed claim / unclaim points."""
+    if cp is None and up is None:
+        return BET_PLACED
+    elif cp == 0 and up == 0:
+        return LOOSE
+    elif (cp or 0) > 0 or (up or 0) > 0:
+        return WIN
+    return LOOSE
+
+
+def _win_point(cp, up):
+    if cp is None and up is None:
+        return "NA"
+    elif cp == 0 and up == 0:
+        return "0"
+    elif cp and cp > 0:
+        return str(int(cp)) if cp.is_integer() else str(cp)
+    elif up and up > 0:
+        return str(int(up)) if up.is_integer() else str(up)
+    return "0"
+
+
+def _action(cp, up):
+    """(label, claimable) of the Action button."""
+    if (cp in (None, 0)) and (up in (None, 0)):
+        return "Unclaimable", False
+    elif up == 0 and cp and cp > 0:
+        return "Claimed", False
+    elif cp == 0 and up and up > 0:
+        return "Claim", True
+    return "Unclaimable", False
+
+
+def record(row, key=None):
+    """HistoryRecord for one raw `mapped` row."""
+    if key is None:
+        key = _row_key(row)
+    cp = to_val(row.get('claim_point'))
+    up = to_val(row.get('unclaim_point'))
+    status = status_of(cp, up)
+    action, claimable = _action(cp, up)
+
+    card = face = suit = marker = None
+    if status != BET_PLACED:
+        gr = row.get('game_result') or {}
+        try:
+            card = int(gr.get('winning_number') or gr.get('lose_number'))
+        except:
+            card = None
+        if card is not None:
+            face = 'K' if card < 4 else 'Q' if card < 8 else 'J'
+            suit = SUITS[card % 4]
+        if gr.get('winning_number') is not None:
+            marker = gr.get('winning_number')
+        elif gr.get('lose_number') is not None:
+            marker = gr.get('lose_number')
+
+    return HistoryRecord(
+        key=key,
+        ticket_serial=row.get('ticket_serial'),
+        cp=cp, up=up,
+        status=status,
+        win_point=_win_point(cp, up),
+        action=action,
+        claimable=claimable,
+        card=card, face=face, suit=suit,
+        marker=marker,
+        bet_amount=_amount(row.get('bet_amount', 0)),
+        claim_amount=_amount(row.get('claim_point', 0)),
+        unclaim_amount=_amount(row.get('unclaim_point', 0)),
+        row=row,
+    )
+
+
+def _row_key(row):
+    return row.get('ticket_serial'), hash(repr(row))
+
+
+def _cents(amount):
+    return round(amount * 100)
+
+
+def _marker_sort_key(k):
+    # None (NA) first, then numeric ascending; ties (3 vs "3", anything
+    # non-numeric) in a fixed order rather than first-seen order
+    if k is None:
+        return -1, "", ""
+    rank = int(k) if isinstance(k, (int, float, str)) and str(k).isdigit() else float('inf')
+    return rank, type(k).__name__, str(k)
+
+
+class MarkerTotals:
+    """
+    Account screen totals (bet / claim / unclaim) per Marker Card, kept up
+    to date incrementally.
+
+    DashboardSync passes each change on to `change()` as the Amounts of
+    the rows TicketStore replaced or dropped and of the ones it added, so
+    the arithmetic scales with the changes rather than the history.
+    Amounts are summed in integer cents, so removing a row leaves no
+    rounding residue behind. `rows` holds the summary records sorted for
+    draw_table; it is replaced, never mutated, so the UI thread can read it
+    while a poll updates the totals.
+    """
+
+    def __init__(self):
+        self._totals = {}       # marker -> [rows, bet, claim, unclaim] (amounts in cents)
+        self.rows = []
+
+    def change(self, old=(), new=()):
+        """
+        Subtract the `old` records (or Amounts) and add the `new` ones:
+        TicketStore.sync() / apply() return exactly these lists.
+        """
+        for rec in old:
+            self._add(rec, -1)
+        for rec in new:
+            self._add(rec, 1)
+        if old or new:
+            self.rows = self._summary_rows()
+
+    def _add(self, rec, sign):
+        totals = self._totals.get(rec.marker)
+        if totals is None:
+            totals = self._totals[rec.marker] = [0, 0, 0, 0]
+        totals[0] += sign
+        totals[1] += sign * _cents(rec.bet_amount)
+        totals[2] += sign * _cents(rec.claim_amount)
+        totals[3] += sign * _cents(rec.unclaim_amount)
+        if totals[0] == 0:
+            del self._totals[rec.marker]
+
+    def _summary_rows(self):
+        out = []
+        for marker in sorted(self._totals, key=_marker_sort_key):
+            _, bet, claim, unclaim = self._totals[marker]
+            if marker is None:
+                marker_str = "NA"
+            else:
+                marker_str = str(int(marker) if isinstance(marker, float) and marker.is_integer() else str(marker))
+            out.append(record({
+                'card_type': marker_str,
+                'bet_amount': f"{bet / 100:.2f}",
+                'claim_point': f"{claim / 100:.2f}",
+                'unclaim_point': f"{unclaim / 100:.2f}"
+            }))
+        return out
@@ -0,0 +1,133 @@
+"""
+Point-to-widget hit testing and cursor changes.
+
+`HitIndex` buckets (rect, target) pairs into a uniform grid of `cell_size`
+pixel cells, so `hit(pos)` only looks at the few rects overlapping the
+cell under the point instead of scanning every widget. When rects overlap,
+the one added first wins, matching the order a linear scan would test them.
+Indexes are meant to be built once from a layout and rebuilt only when it
+changes.
+
+`CursorManager` remembers the cursor it last set and calls
+pygame.mouse.set_cursor only on transitions. On drivers without system
+cursors (e.g. SDL's dummy driver) the first failure is swallowed and later
+calls are no-ops.
+
+Run this module directly for a click/hover benchmark against a linear scan.
+"""
+import pygame
+
+DEFAULT_CELL_SIZE = 64
+
+
+class HitIndex:
+    def __init__(self, items=(), cell_size=DEFAULT_CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells = {}        # (col, row) -> [(order, rect, target)]
+        self._count = 0
+        for rect, target in items:
+            self.add(rect, target)
+
+    def __len__(self):
+        return self._count
+
+    def add(self, rect, target):
+        rect = pygame.Rect(rect)
+        if rect.width <= 0 or rect.height <= 0:
+            return
+        cs = self.cell_size
+        entry = (self._count, rect, target)
+        self._count += 1
+        for cx in range(rect.left // cs, (rect.right - 1) // cs + 1):
+            for cy in range(rect.top // cs, (rect.bottom - 1) // cs + 1):
+                self._cells.setdefault((cx, cy), []).append(entry)
+
+    def hit(self, pos):
+        """Target of the first-added rect containing `pos`, or None."""
+        x, y = pos
+        cs = self.cell_size
+        for _, rect, target in self._cells.get((x // cs, y // cs), ()):
+            # Entries are kept in insertion order, so the first match wins
+            if rect.collidepoint(x, y):
+                return target
+        return None
+
+
+class CursorManager:
+    def __init__(self):
+        self.current = None
+        self.supported = True
+
+    def set(self, cursor):
+        """Switch to `cursor` (e.g. pygame.SYSTEM_CURSOR_HAND) if it isn't already."""
+        if cursor == self.current or not self.supported:
+            return
+        try:
+            pygame.mouse.set_cursor(cursor)
+        except pygame.error:
+            self.supported = False
+            return
+        self.current = cursor
+
+
+# Shared by every screen so transitions are tracked against the real cursor
+cursor = CursorManager()
+
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    def linear(items, pos):
+        for rect, target in items:
+            if rect.collidepoint(pos):
+                return target
+        return None
+
+    def bench(label, items, points, repeat=20):
+        index = HitIndex(items)
+        assert all(index.hit(p) == linear(items, p) for p in points)
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for p in points:
+                linear(items, p)
+        t_lin = (time.perf_counter() - t0) / (repeat * len(points)) * 1e6
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            for p in points:
+                index.hit(p)
+        t_idx = (time.perf_counter() - t0) / (repeat * len(points)) * 1e6
+        t0 = time.perf_counter()
+        HitIndex(items)
+        t_build = (time.perf_counter() - t0) * 1000
+        print(f"{label:<34} {len(items):5d} rects  linear {t_lin:6.2f} us  "
+              f"index {t_idx:5.2f} us  build {t_build:6.2f} ms")
+
+    import layout
+
+    rng = random.Random(0)
+    sw, sh = 1366, 768
+    scr = layout.screen((sw, sh))
+    board = layout.board((sw, sh), *scr.board_origin)
+
+    # The board's clickable widgets, in handle_click's order
+    widgets = [(board.bet_button_rect, "bet")]
+    widgets += [(r, ("chip", i)) for i, r in enumerate(board.chip_rects)]
+    widgets += [(r, ("rank", k)) for k, r in board.rank_icon_rects.items()]
+    widgets += [(r, ("suit", k)) for k, r in board.suit_icon_rects.items()]
+    widgets += [(r, ("cell", k)) for k, r in board.cell_rects.items()]
+    widgets += [(board.clear_button_rect, "clear"), (board.double_button_rect, "double"),
+                (board.repeat_button_rect, "repeat")]
+
+    # 10x as many widgets: the same set tiled over a ten times taller canvas
+    tall = [(pygame.Rect(r).move(0, k * sh), (k, t)) for k in range(10) for r, t in widgets]
+
+    clicks = [r.center for r, _ in widgets]
+    hover = [(rng.randrange(sw), rng.randrange(sh)) for _ in range(2000)]
+    hover_tall = [(rng.randrange(sw), rng.randrange(sh * 10)) for _ in range(2000)]
+    clicks_tall = [r.center for r, _ in tall]
+
+    bench("board clicks", widgets, clicks)
+    bench("board hover (random points)", widgets, hover)
+    bench("10x widgets clicks", tall, clicks_tall)
+    bench("10x widgets hover (random points)", tall, hover_tall)
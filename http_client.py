@@ -0,0 +1,257 @@
+"""
+Shared HTTP client for the game server's API.
+
+Every call goes through one keep-alive requests.Session, so the 2-second
+dashboard poll and the button calls reuse pooled connections instead of
+paying a fresh TCP+TLS handshake each time. Endpoints are registered by
+name in ENDPOINTS, each with its own (connect, read) timeout, a deadline
+budget for the whole call (retries and waits included) and a retry limit.
+
+A call is retried when the request never reached the server (connection
+refused, DNS failure, connect timeout). Endpoints marked idempotent are
+also retried on read timeouts, dropped connections and 502/503/504. The
+wait before each retry is drawn uniformly from [0, backoff] ("full
+jitter"), with the backoff doubling per attempt up to BACKOFF_CAP, and no
+retry starts unless it still has MIN_ATTEMPT_S of the budget left.
+
+All endpoints share one CircuitBreaker, as they are one backend. After
+BREAKER_FAILURES failed calls in a row it opens, and calls fail at once
+with CircuitOpenError, a requests ConnectionError, for BREAKER_COOLDOWN
+seconds. After that a single trial call is let through, and its outcome
+closes the breaker or opens it again. A call counts as failed if it
+raised or ended with a 5xx response.
+
+`stats()` returns per-endpoint call, failure and retry counts with latency
+percentiles over the last LATENCY_WINDOW calls, and `report()` formats
+them as one line.
+"""
+import os
+import random
+import threading
+import time
+from collections import deque, namedtuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+# SPIN_API_BASE points the client elsewhere, e.g. at dev_server.py
+BASE_URL = os.environ.get("SPIN_API_BASE", "https://spintofortune.in/api/")
+
+POOL_SIZE         = 4       # kept-alive connections: poll thread, UI thread, spare
+BACKOFF_BASE      = 0.25    # seconds; first retry waits up to this
+BACKOFF_CAP       = 2.0
+MIN_ATTEMPT_S     = 0.5     # don't start a retry with less budget than this
+BREAKER_FAILURES  = 5
+BREAKER_COOLDOWN  = 15.0
+LATENCY_WINDOW    = 200
+RETRY_STATUS      = (502, 503, 504)
+
+# timeout: (connect, read) seconds per attempt; budget: seconds for the whole
+# call; retries: attempts after the first
+Endpoint = namedtuple("Endpoint", "url timeout budget retries idempotent")
+
+ENDPOINTS = {
+    # The poll only reads; a call that runs out of budget is superseded by
+    # the next poll anyway
+    "dashboard":   Endpoint(BASE_URL + "app_dashboard_data.php",    (3.05, 5),  6.0,  2, True),
+    # Asked for 5 s before the spin starts and useless after that, so the
+    # budget is tight. The server picks the result here, so only unsent
+    # requests are retried
+    "result":      Endpoint(BASE_URL + "app_make_result.php",       (2, 4.5),   4.5,  1, False),
+    "place_bet":   Endpoint(BASE_URL + "app_place_bet.php",         (3.05, 10), 12.0, 1, False),
+    # The server answers 'already_claimed' to a repeated claim
+    "claim_point": Endpoint(BASE_URL + "app_claim_point.php",       (3.05, 10), 12.0, 2, True),
+    # Sends the new setting rather than flipping it server-side
+    "auto_claim":  Endpoint(BASE_URL + "app_toggle_auto_claim.php", (3.05, 5),  8.0,  2, True),
+    "sign_in":     Endpoint(BASE_URL + "app-sign-in.php",           (3.05, 10), 10.0, 1, True),
+}
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Raised without sending anything while the breaker is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, failures=BREAKER_FAILURES, cooldown=BREAKER_COOLDOWN):
+        self.failures = failures
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failed = 0            # failed calls in a row
+        self._opened_at = None      # monotonic time the breaker opened, None = closed
+        self._trial = False         # a half-open trial call is in flight
+
+    @property
+    def state(self):
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._trial or time.monotonic() - self._opened_at < self.cooldown:
+                return "open"
+            return "half-open"
+
+    def retry_in(self):
+        """Seconds until the next trial call is allowed (0 when closed)."""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self._opened_at + self.cooldown - time.monotonic())
+
+    def allow(self):
+        """Whether a call may go out now; a half-open breaker lets one through."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial or time.monotonic() - self._opened_at < self.cooldown:
+                return False
+            self._trial = True
+            return True
+
+    def record(self, ok):
+        with self._lock:
+            if ok:
+                self._failed = 0
+                self._opened_at = None
+            else:
+                self._failed += 1
+                if self._trial or self._failed >= self.failures:
+                    self._opened_at = time.monotonic()
+            self._trial = False
+
+
+class _Counter:
+    __slots__ = ("calls", "failures", "retries", "rejected", "latencies")
+
+    def __init__(self):
+        self.calls = self.failures = self.retries = self.rejected = 0
+        self.latencies = deque(maxlen=LATENCY_WINDOW)   # seconds per finished call
+
+
+def _new_session():
+    s = requests.Session()
+    # Retries are done here, per endpoint, so the adapter must not add its own
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE, max_retries=0)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+session = _new_session()
+breaker = CircuitBreaker()
+
+_lock = threading.Lock()
+_counters = {}          # endpoint name -> _Counter
+
+
+def _counter(name):
+    with _lock:
+        c = _counters.get(name)
+        if c is None:
+            c = _counters[name] = _Counter()
+        return c
+
+
+def never_sent(exc):
+    """True for failures that happened before the request reached the server."""
+    if isinstance(exc, (CircuitOpenError, requests.exceptions.ConnectTimeout)):
+        return True
+    if isinstance(exc, requests.exceptions.ConnectionError) and exc.args:
+        return isinstance(getattr(exc.args[0], "reason", None), NewConnectionError)
+    return False
+
+
+def _may_retry(ep, exc):
+    if never_sent(exc):
+        return True
+    return ep.idempotent and isinstance(exc, (requests.exceptions.Timeout,
+                                              requests.exceptions.ConnectionError))
+
+
+def _send(ep, counter, kwargs):
+    deadline = time.monotonic() + ep.budget
+    connect, read = ep.timeout
+    attempt = 0
+    while True:
+        remaining = deadline - time.monotonic()
+        failure = resp = None
+        try:
+            resp = session.post(ep.url, timeout=(min(connect, remaining), min(read, remaining)), **kwargs)
+        except requests.RequestException as e:
+            if not _may_retry(ep, e):
+                raise
+            failure = e
+        else:
+            if not (ep.idempotent and resp.status_code in RETRY_STATUS):
+                return resp
+
+        wait = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+        if attempt >= ep.retries or deadline - time.monotonic() - wait < MIN_ATTEMPT_S:
+            if failure is not None:
+                raise failure
+            return resp
+        if resp is not None:
+            resp.close()
+        attempt += 1
+        with _lock:
+            counter.retries += 1
+        time.sleep(wait)
+
+
+def post(name, **kwargs):
+    """
+    POST to endpoint `name` with requests' keyword arguments (data, json,
+    headers, ...) and return the Response. Error statuses are returned as
+    usual, after any retries; network failures raise requests exceptions,
+    CircuitOpenError while the breaker is open.
+    """
+    ep = ENDPOINTS[name]
+    counter = _counter(name)
+    if not breaker.allow():
+        with _lock:
+            counter.rejected += 1
+        raise CircuitOpenError(f"{name}: server unreachable, next try in {breaker.retry_in():.0f} s")
+
+    ok = False
+    t0 = time.monotonic()
+    try:
+        resp = _send(ep, counter, kwargs)
+        ok = resp.status_code < 500
+        return resp
+    finally:
+        elapsed = time.monotonic() - t0
+        breaker.record(ok)
+        with _lock:
+            counter.calls += 1
+            counter.failures += not ok
+            counter.latencies.append(elapsed)
+
+
+def stats():
+    """Per endpoint: calls, failures, retries, rejected and latency mean / p50 / p95 / max in ms."""
+    out = {}
+    with _lock:
+        items = [(name, c.calls, c.failures, c.retries, c.rejected, sorted(c.latencies))
+                 for name, c in _counters.items()]
+    for name, calls, failures, retries, rejected, lat in items:
+        n = len(lat)
+        out[name] = {
+            "calls":    calls,
+            "failures": failures,
+            "retries":  retries,
+            "rejected": rejected,
+            "mean_ms":  round(sum(lat) / n * 1000, 1) if n else 0.0,
+            "p50_ms":   round(lat[n // 2] * 1000, 1) if n else 0.0,
+            "p95_ms":   round(lat[min(n - 1, n * 95 // 100)] * 1000, 1) if n else 0.0,
+            "max_ms":   round(lat[-1] * 1000, 1) if n else 0.0,
+        }
+    return out
+
+
+def report():
+    """One-line summary of each endpoint's calls and latency."""
+    parts = []
+    for name, s in stats().items():
+        part = f"{name} {s['calls']} calls, p50 {s['p50_ms']:.0f} ms, p95 {s['p95_ms']:.0f} ms"
+        extra = [f"{s[k]} {k}" for k in ("failures", "retries", "rejected") if s[k]]
+        parts.append(part + (f" ({', '.join(extra)})" if extra else ""))
+    return "http: " + ("; ".join(parts) or "no calls") + f"; breaker {breaker.state}"
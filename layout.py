@@ -0,0 +1,268 @@
+"""
+Screen geometry, computed once per resolution.
+
+`screen(size)` returns a ScreenLayout with the header, nav buttons, wheel,
+countdown ring and board origin; `board(size, x0, y0, rows, cols,
+chip_count)` returns a BoardLayout with every rect the betting board, chip
+tray, buttons and history row are drawn at and hit-tested against. Both are
+frozen and memoised, so drawing code and click handling read the same
+objects instead of redoing the arithmetic each frame; `set_screen_size()`
+drops them when the resolution changes.
+
+The Rects inside are shared: copy one before moving or resizing it. Layouts
+compare and hash by identity, so one can be used directly in a cache key.
+"""
+from dataclasses import dataclass
+from types import MappingProxyType
+
+import pygame
+
+BOARD_BUTTON_SIZE = (100, 30)
+
+_screens = {}           # size -> ScreenLayout
+_boards = {}            # (size, x0, y0, rows, cols, chip_count) -> BoardLayout
+_screen_size = None
+
+
+@dataclass(frozen=True, eq=False)
+class BoardLayout:
+    x0: int
+    y0: int
+    rows: int
+    cols: int
+    y0_adj: int             # table top (the board sits 60 px above y0)
+    cell_h: int
+    col_w: int
+    table_w: int
+    table_h: int
+    y_start: int            # top of the grid inside the table
+
+    table_rect: pygame.Rect
+    withdraw_cell: pygame.Rect
+    suit_icon_rects: MappingProxyType   # column -> “All <Suit>” header cell
+    rank_icon_rects: MappingProxyType   # row -> “All <Rank>” header cell
+    cell_rects: MappingProxyType        # (row, col) -> play cell box
+    ribbon_rects: MappingProxyType      # (row, col) -> ribbon across its bottom
+    placed_chip_radius: int
+
+    chip_radius: int
+    chip_centers: tuple
+    chip_rects: tuple
+
+    bet_button_rect: pygame.Rect
+    clear_button_rect: pygame.Rect
+    double_button_rect: pygame.Rect
+    repeat_button_rect: pygame.Rect
+
+    history_y: int
+    history_box_size: int
+
+    def history_rects(self, count):
+        """Box rects of a history row of `count` entries: newest first and wider."""
+        box_size = self.history_box_size
+        spacing  = 4  # fixed gap between boxes
+        narrow_w = int(box_size * 0.75)
+        widths   = [box_size] + [narrow_w] * (count - 1)
+        total_w  = sum(widths) + spacing * (count - 1)
+
+        rects, x = [], self.x0 + (self.table_w - total_w) // 2
+        for w in widths:
+            rects.append(pygame.Rect(x, self.history_y, w, box_size))
+            x += w + spacing
+        return rects
+
+
+@dataclass(frozen=True, eq=False)
+class ScreenLayout:
+    size: tuple
+    padding: int
+    icon_size: int
+    margin_top: int             # header bar height
+    header_mid_y: int
+    close_btn: pygame.Rect
+    min_btn: pygame.Rect
+    checkbox_rect: pygame.Rect  # “Auto Claim” checkbox
+    info_text_pos: tuple        # clock line, right of the checkbox
+    balance_right: int          # balance box ends here, left of the minimise button
+
+    account_btn: pygame.Rect
+    history_btn: pygame.Rect
+    simple_btn: pygame.Rect
+    back_btn: pygame.Rect
+
+    num_segments: int
+    wheel_center: tuple
+    outer_radius: int
+    mid_radius: int
+    inner_radius: int
+    ribbon_thickness: int       # ring around the wheel
+
+    countdown_center: tuple
+    countdown_radius: int
+    countdown_font_size: int
+    label_font_size: int        # bottom-right withdraw label
+
+    label_size: int             # rank icons
+    suit_size: int              # suit icons
+    board_origin: tuple         # (x0, y0) passed to draw_left_table
+
+
+def set_screen_size(size):
+    """Drop all layouts if the screen size differs from the last one seen."""
+    global _screen_size
+    size = tuple(size)
+    if size != _screen_size:
+        _screens.clear()
+        _boards.clear()
+        _screen_size = size
+
+
+def screen(size):
+    size = tuple(size)
+    lay = _screens.get(size)
+    if lay is None:
+        lay = _screens[size] = _build_screen(size)
+    return lay
+
+
+def board(size, x0, y0, rows=4, cols=5, chip_count=7):
+    key = (tuple(size), x0, y0, rows, cols, chip_count)
+    lay = _boards.get(key)
+    if lay is None:
+        lay = _boards[key] = _build_board(*key)
+    return lay
+
+
+def _build_screen(size):
+    sw, sh = size
+    short = min(sw, sh)
+
+    padding    = 10
+    icon_size  = int(short * 0.03)
+    margin_top = icon_size + padding * 2
+
+    close_btn = pygame.Rect(sw - icon_size - padding, padding, icon_size, icon_size)
+    min_btn   = pygame.Rect(close_btn.x - icon_size - padding, padding, icon_size, icon_size)
+
+    checkbox_size = 24
+    checkbox_rect = pygame.Rect(40, (margin_top - checkbox_size) // 2, checkbox_size, checkbox_size)
+
+    btn_w   = int(sw * 0.1)
+    btn_h   = int(sh * 0.05)
+    top_y   = margin_top + padding
+    pad     = 10
+    start_x = sw - pad - (btn_w * 3 + pad * 2)
+
+    outer_radius = int(short * 0.30)
+    mid_radius   = int(short * 0.18)
+    inner_radius = int(short * 0.08)
+
+    countdown_radius = int(short * 0.05)
+    padding_br       = 20
+
+    return ScreenLayout(
+        size=(sw, sh),
+        padding=padding,
+        icon_size=icon_size,
+        margin_top=margin_top,
+        header_mid_y=margin_top // 2,
+        close_btn=close_btn,
+        min_btn=min_btn,
+        checkbox_rect=checkbox_rect,
+        info_text_pos=(checkbox_rect.right + 10, checkbox_rect.top),
+        balance_right=min_btn.left - 10,
+        account_btn=pygame.Rect(start_x, top_y, btn_w, btn_h),
+        history_btn=pygame.Rect(start_x + btn_w + pad, top_y, btn_w, btn_h),
+        simple_btn=pygame.Rect(start_x + 2 * (btn_w + pad), top_y, btn_w, btn_h),
+        back_btn=pygame.Rect(50, sh - 70, 100, 40),
+        num_segments=12,
+        wheel_center=(int(sw * 0.75), int(sh // 2)),
+        outer_radius=outer_radius,
+        mid_radius=mid_radius,
+        inner_radius=inner_radius,
+        ribbon_thickness=max(6, int(short * 0.015)),
+        countdown_center=(sw - countdown_radius - padding_br, sh - countdown_radius - padding_br),
+        countdown_radius=countdown_radius,
+        countdown_font_size=int(short * 0.04),
+        label_font_size=int(short * 0.03),
+        label_size=int(short * 0.05),
+        suit_size=int(short * 0.04),
+        board_origin=(50, 100 + margin_top),
+    )
+
+
+def _build_board(size, x0, y0, rows, cols, chip_count):
+    sw, sh = size
+
+    # Move table up by 60 px
+    y0_adj = y0 - 60
+
+    base_height = int(sh * 0.55)
+    cell_h      = base_height // rows
+    extra_h     = cell_h // 2
+    table_h     = cell_h * rows + extra_h
+    col_w       = int((sw * 0.48) // cols)
+    table_w     = col_w * cols
+    y_start     = y0_adj + (table_h - cell_h * rows) // 2
+
+    # Header row: suits in columns 1.., ranks in rows 1..
+    suit_icon_rects = {c: pygame.Rect(x0 + col_w * c, y_start, col_w, cell_h) for c in range(1, cols)}
+    rank_icon_rects = {r: pygame.Rect(x0, y_start + r * cell_h, col_w, cell_h) for r in range(1, rows)}
+
+    # Play cells: an inset box with a ribbon across its lower part
+    cell_rects, ribbon_rects = {}, {}
+    for r in range(1, rows):
+        for c in range(1, cols):
+            left, top = x0 + col_w * c, y_start + r * cell_h
+            box_w = int(col_w * 0.7)
+            box_h = int(cell_h * 0.9)
+            box = pygame.Rect(int(left + (col_w - box_w) / 2), int(top + (cell_h - box_h) / 2), box_w, box_h)
+            cell_rects[(r, c)] = box
+
+            ribbon_h = int(box_h * 0.2)
+            ribbon_w = int(box_w * 1.05)
+            ribbon_rects[(r, c)] = pygame.Rect(
+                int(box.left - (ribbon_w - box_w) / 2),
+                int(box.bottom - ribbon_h - int(box_h * 0.1)),
+                ribbon_w, ribbon_h
+            )
+
+    # Chip tray below the table
+    chip_radius  = int(min(cell_h, col_w) // 3)
+    chip_dia     = chip_radius * 2
+    chip_spacing = chip_dia + 20
+    chips_y      = y0_adj + table_h + chip_radius + 20
+    chip_centers = tuple((x0 + 10 + i * chip_spacing, chips_y) for i in range(chip_count))
+    chip_rects   = tuple(pygame.Rect(cx - chip_radius, cy - chip_radius, chip_dia, chip_dia)
+                         for cx, cy in chip_centers)
+
+    # 2×2 button grid, right of the chips
+    btn_w, btn_h = BOARD_BUTTON_SIZE
+    btn_spacing  = 8
+    left_shift   = 70
+    margin       = 180
+    btn_x        = sw - margin - (btn_w * 2 + btn_spacing) - left_shift
+    btn_y        = y0_adj + table_h + chip_dia + 30
+
+    return BoardLayout(
+        x0=x0, y0=y0, rows=rows, cols=cols,
+        y0_adj=y0_adj, cell_h=cell_h, col_w=col_w,
+        table_w=table_w, table_h=table_h, y_start=y_start,
+        table_rect=pygame.Rect(x0, y0_adj, table_w, table_h),
+        withdraw_cell=pygame.Rect(x0, y_start, col_w, cell_h),
+        suit_icon_rects=MappingProxyType(suit_icon_rects),
+        rank_icon_rects=MappingProxyType(rank_icon_rects),
+        cell_rects=MappingProxyType(cell_rects),
+        ribbon_rects=MappingProxyType(ribbon_rects),
+        placed_chip_radius=int(min(cell_h, col_w) // 6),
+        chip_radius=chip_radius,
+        chip_centers=chip_centers,
+        chip_rects=chip_rects,
+        bet_button_rect=pygame.Rect(btn_x, btn_y, btn_w, btn_h),
+        clear_button_rect=pygame.Rect(btn_x + btn_w + btn_spacing, btn_y, btn_w, btn_h),
+        double_button_rect=pygame.Rect(btn_x, btn_y + btn_h + btn_spacing, btn_w, btn_h),
+        repeat_button_rect=pygame.Rect(btn_x + btn_w + btn_spacing, btn_y + btn_h + btn_spacing, btn_w, btn_h),
+        # History just beneath the two rows of buttons
+        history_y=y0_adj + table_h + chip_dia + 10 + btn_h * 2 - 14,
+        history_box_size=int(min(col_w, cell_h) * 0.7),
+    )
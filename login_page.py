@@ -1,5 +1,5 @@
 import webview
-import requests
+import http_client
 import os
 import sys
 import base64
@@ -203,10 +203,9 @@ class API:
     def login(self, username, password):
         """Called from JS: performs POST, returns JSON dict."""
         try:
-            resp = requests.post(
-                "https://spintofortune.in/api/app-sign-in.php",
-                data={"login": username, "password": password},
-                timeout=10
+            resp = http_client.post(
+                "sign_in",
+                data={"login": username, "password": password}
             )
             return resp.json()
         except Exception as e:
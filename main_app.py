@@ -4,10 +4,23 @@ import random
 import time
 import threading
 import json
-import requests
+import http_client
+import net_executor
 import os
-from datetime import datetime, timedelta
+from datetime import datetime
 import app_globals
+import polar
+import asset_cache
+import gradients
+import font_registry
+import layout
+from font_registry import get_font
+from dirty_rects import DirtyRegions
+from frame_scheduler import FrameScheduler
+from deadlines import DeadlineScheduler
+import poll_policy
+import frame_timing
+from text_cache import render_text
 
 import wheel_module
 from wheel_module import (
@@ -16,24 +29,49 @@ from wheel_module import (
     draw_left_table,
     handle_click
 )
+import table_module
+import history_model
+from ticket_store import TicketStore
+from dashboard_sync import DashboardSync
+from push_client import PushClient
 from table_module import draw_table, handle_claim_click
 
 LAST_SPIN_FILE = "last_spin.json"
 CYCLE_DURATION = 120      # seconds (2 minutes)
-DASHBOARD_API  = "https://spintofortune.in/api/app_dashboard_data.php"
-RESULT_API     = "https://spintofortune.in/api/app_make_result.php"
+RESULT_LEAD    = 5        # seconds before the spin the result is fetched
+RESULT_RETRY   = 0.5      # seconds between result retries
+WIN_DELAY      = 5        # seconds after the spin starts the win is added
+BLINK_DURATION = 5.0
+
+# Posted by the poll and push threads; the main loop applies server time
+# and the last spin to the cycle (see sync_server_time)
+SERVER_SYNC = pygame.event.custom_type()
+# A result or balance from the push stream (see push_received)
+PUSH_EVENT = pygame.event.custom_type()
 
 RED_BG      = (200, 0, 0)
 BLUE_RIBBON = (0, 0, 200)
 GREEN       = (0, 255, 0)
 
+# Redraw only changed screen regions instead of the full frame (helps
+# software-rendered fullscreen on low-end kiosk PCs); SPIN_DIRTY_RECTS=1
+DIRTY_RECT_RENDERING = os.environ.get("SPIN_DIRTY_RECTS", "0") == "1"
+
+# Per-stage frame timings, one JSON line per frame, go to this file when set;
+# F3 toggles the on-screen timing overlay either way
+FRAME_TIMING_LOG = os.environ.get("SPIN_FRAME_LOG")
+
+# Take results, history and balance from the server's push stream, polling
+# only while it is down; SPIN_PUSH=1 (the server must support it)
+PUSH_UPDATES = os.environ.get("SPIN_PUSH", "0") == "1"
+
 
 def draw_text_centered(surface, text, font, y, color=(255,255,255)):
     """
     Renders `text` with `font` onto `surface`, centered horizontally at vertical position `y`.
     """
     # Render the text to a new surface
-    text_surf = font.render(text, True, color)
+    text_surf = render_text(font, text, color)
     # Grab its rect and set the midtop
     text_rect = text_surf.get_rect(midtop=(surface.get_width() // 2, y))
     # Blit it
@@ -47,10 +85,10 @@ def draw_message_box(surface, text, font, y=80,
                      border_radius=6):
     """
     Draws `text` centered horizontally at vertical position `y`,
-    on a blue background box with white text.
+    on a blue background box with white text. Returns the box rect.
     """
     # Render text surface
-    text_surf = font.render(text, True, text_color)
+    text_surf = render_text(font, text, text_color)
     text_rect = text_surf.get_rect(midtop=(surface.get_width() // 2, y))
     
     # Expand to a background rect
@@ -64,6 +102,7 @@ def draw_message_box(surface, text, font, y=80,
     # Draw background and then text
     pygame.draw.rect(surface, bg_color, bg_rect, border_radius=border_radius)
     surface.blit(text_surf, text_rect)
+    return bg_rect
 
 
 
@@ -135,27 +174,68 @@ def load_last_cycle_timestamp():
 def format_withdraw_time(ts):
     return datetime.fromtimestamp(ts).strftime('%H:%M:%S')
 
+def cycle_start_at(ts):
+    """Start of the cycle holding `ts`; cycles start on even local minutes."""
+    offset = datetime.fromtimestamp(ts).astimezone().utcoffset().total_seconds()
+    return ts - (ts + offset) % CYCLE_DURATION
+
+def advance_cycle(start, ts):
+    """Cycle start `start` moved on by whole cycles to the cycle holding `ts`."""
+    if ts < start:
+        return start
+    return start + (ts - start) // CYCLE_DURATION * CYCLE_DURATION
+
+def fetch_result(payload):
+    """Worker side of the RESULT_API call."""
+    resp = http_client.post(
+        "result",
+        json=payload,
+        headers={"Content-Type": "application/json"}
+    )
+    return resp.json()
+
+def save_auto_claim(payload_json):
+    """Worker side of the auto claim checkbox."""
+    headers = {
+        "Content-Type":   "application/json; charset=UTF-8",
+        "Content-Length": str(len(payload_json))
+    }
+    resp = http_client.post("auto_claim", data=payload_json, headers=headers)
+
+    # always print status
+    #print(f"Response HTTP {resp.status_code}")
+
+    # try JSON first
+    try:
+        data = resp.json()
+        #print("Response JSON:", json.dumps(data, indent=2))
+    except ValueError:
+        # fallback to raw text
+        print("Response text:", resp.text)
+        data = None
+
+    # if it’s a non‐2xx, raise here so the checkbox is reverted
+    if resp.status_code >= 400:
+        # now you’ll see the server-sent body too
+        print("Response body:", resp.text)
+        resp.raise_for_status()
+    return data
+
 def create_gold_gradient_surface(width, height):
-    gradient = pygame.Surface((width, height))
-    start_color = (255, 215, 0)
-    end_color   = (184, 134, 11)
-    for y in range(height):
-        ratio = y / height
-        r = int(start_color[0] * (1 - ratio) + end_color[0] * ratio)
-        g = int(start_color[1] * (1 - ratio) + end_color[1] * ratio)
-        b = int(start_color[2] * (1 - ratio) + end_color[2] * ratio)
-        pygame.draw.line(gradient, (r, g, b), (0, y), (width, y))
-    return gradient
+    return gradients.vertical((width, height), (255, 215, 0), (184, 134, 11))
 
 def launch_main_app(user_data):
     pygame.init()
     info = pygame.display.Info()
     sw, sh = info.current_w, info.current_h
     screen = pygame.display.set_mode((sw, sh))
+    font_registry.set_screen_size((sw, sh))
+    layout.set_screen_size((sw, sh))
+    lay = layout.screen((sw, sh))
     pygame.display.set_caption("Main App - Spinning Wheel and History")
 
-    # Flag to ensure RESULT_API is called only once per cycle
-    result_api_called = False
+    resp_data = {}      # last RESULT_API reply ...
+    resp_end  = None    # ... and the withdraw time (spin) it is for
 
     # ───── COLORS ─────────────────────────────────────────────────────────────────
     BLACK      = (0, 0, 0)
@@ -166,32 +246,35 @@ def launch_main_app(user_data):
     YELLOW_BG  = (255, 255, 0)
 
     # ───── FONTS ──────────────────────────────────────────────────────────────────
-    font = pygame.font.SysFont("Arial", 24, bold=True)
-    small_font = pygame.font.SysFont("Arial", 20)
+    font_registry.preload([
+        ("Arial", 24, True), ("Arial", 20, False), ("Arial", 32, True),
+        ("Arial", lay.label_font_size, True),
+        ("Arial", lay.countdown_font_size, True),
+    ])
+    print(font_registry.report())
+    font = get_font("Arial", 24, bold=True)
+    small_font = get_font("Arial", 20)
 
     # ───── LOAD ICONS ──────────────────────────────────────────────────────────────
-    label_size = int(min(sw, sh) * 0.05)
+    label_size = lay.label_size
     labels_kjq = {}
     for key in ['K', 'J', 'Q']:
-        img = pygame.image.load(resource_path(f"golden-{key.lower()}.png")).convert_alpha()
-        labels_kjq[key] = pygame.transform.smoothscale(img, (label_size, label_size))
+        name = f"golden-{key.lower()}"
+        asset_cache.register(name, pygame.image.load(resource_path(f"{name}.png")).convert_alpha())
+        labels_kjq[key] = asset_cache.scaled(name, (label_size, label_size))
 
-    suit_size = int(min(sw, sh) * 0.04)
+    suit_size = lay.suit_size
     labels_suits = {}
     for suit in ['clubs', 'diamond', 'hearts', 'spades']:
-        img = pygame.image.load(resource_path(f"golden-{suit}.png")).convert_alpha()
-        labels_suits[suit.capitalize()] = pygame.transform.smoothscale(img, (suit_size, suit_size))
+        name = f"golden-{suit}"
+        asset_cache.register(name, pygame.image.load(resource_path(f"{name}.png")).convert_alpha())
+        labels_suits[suit.capitalize()] = asset_cache.scaled(name, (suit_size, suit_size))
 
     bg_img = pygame.image.load(resource_path("overlay-bg.jpg")).convert()
     bg_img = pygame.transform.scale(bg_img, (sw, sh))
 
     # ───── WHEEL SETUP ───────────────────────────────────────────────────────────
-    num_segments   = 12
-    outer_radius   = int(min(sw, sh) * 0.20)
-    mid_radius     = outer_radius // 2
-    inner_radius   = mid_radius // 2
-    wheel_center   = (int(sw * 0.75), int(sh // 2))
-
+    num_segments   = lay.num_segments
     outer_colors   = [(150, 0, 0)] * num_segments
     mid_colors     = [(0, 0, 100) if i % 2 == 0 else (0, 0, 50) for i in range(num_segments)]
 
@@ -201,30 +284,35 @@ def launch_main_app(user_data):
     total_rot     = 0.0
     spin_start    = 0.0
 
-    padding    = 10
-    icon_size  = int(min(sw, sh) * 0.03)
-    margin_top = icon_size + padding * 2
-
-    close_btn = pygame.Rect(sw - icon_size - padding, padding, icon_size, icon_size)
-    min_btn   = pygame.Rect(close_btn.x - icon_size - padding, padding, icon_size, icon_size)
-
-    btn_w = int(sw * 0.1)
-    btn_h = int(sh * 0.05)
-    top_y = margin_top + padding
-    pad   = 10
-    total_w = btn_w * 3 + pad * 2
-    start_x = sw - pad - total_w
-
-    account_btn = pygame.Rect(start_x, top_y, btn_w, btn_h)
-    history_btn = pygame.Rect(start_x + btn_w + pad, top_y, btn_w, btn_h)
-    simple_btn  = pygame.Rect(start_x + 2 * (btn_w + pad), top_y, btn_w, btn_h)
-
-    back_btn = pygame.Rect(50, sh - 70, 100, 40)
+    margin_top = lay.margin_top
+    close_btn, min_btn = lay.close_btn, lay.min_btn
+    account_btn, history_btn, simple_btn = lay.account_btn, lay.history_btn, lay.simple_btn
+    back_btn = lay.back_btn
+    board_x0, board_y0 = lay.board_origin
+
+    # ───── BACKDROP & DIRTY REGIONS ──────────────────────────────────────────────
+    # Background image plus the header bar; every frame starts from this and
+    # dirty-rect mode restores changed regions from it
+    backdrop = bg_img.copy()
+    pygame.draw.rect(backdrop, WOOD_BLACK, (0, 0, sw, margin_top))
+    pygame.draw.line(backdrop, (255, 0, 0),
+                     (0, margin_top - 2), (sw, margin_top - 2), 2)
+    regions = DirtyRegions(backdrop, enabled=DIRTY_RECT_RENDERING)
+    drawn_mode = None
+    if FRAME_TIMING_LOG:
+        frame_timing.configure(FRAME_TIMING_LOG)
+
+    tickets       = TicketStore()                  # the dashboard's `mapped` rows, columnar
+    marker_totals = history_model.MarkerTotals()   # Account screen totals, updated per poll
+    dashboard     = DashboardSync(tickets, marker_totals)
+
+    # Bets and the auto-claim toggle send this; set before any poll or push
+    app_globals.User_id = str(user_data['id'])
 
     # ───── FETCH INITIAL SERVER TIME ──────────────────────────────────────────────
+    # This poll also loads the full history, so the ones in api_loop are deltas
     try:
-        resp = requests.post(DASHBOARD_API, data={"ID": str(user_data['id'])})
-        data = resp.json()
+        data = dashboard.poll(user_data['id'])
         app_globals.history_json = data.get('game_results_history', [])
         #print("Response from:", app_globals.history_json)
         server_ts = data.get("server_timestamp", time.time())
@@ -235,20 +323,12 @@ def launch_main_app(user_data):
     base_local_ts  = time.time()
 
     # ───── “NEXT WITHDRAW” ON AN EVEN :00 ─────────────────────────────────────────
-    server_dt = datetime.fromtimestamp(base_server_ts)
-    if server_dt.minute % 2 == 1:
-        candidate = server_dt.replace(second=0, microsecond=0) + timedelta(minutes=1)
-    else:
-        candidate = server_dt.replace(second=0, microsecond=0) + timedelta(minutes=2)
-
-    next_action_ts = candidate.timestamp()
-
     # ───── SET CYCLE START (120s countdown) ─────────────────────────────────────
-    cycle_start_ts = next_action_ts - CYCLE_DURATION
+    cycle_start_ts = cycle_start_at(base_server_ts)
     save_last_cycle_timestamp(cycle_start_ts)
 
     # ───── IMMEDIATELY STORE the raw numeric timestamp for withdraw ─────────────
-    withdraw_ts = next_action_ts
+    withdraw_ts = cycle_start_ts + CYCLE_DURATION
     app_globals.Withdraw_time = format_withdraw_time(withdraw_ts)
     wheel_module.print_withdraw_time()
 
@@ -259,7 +339,6 @@ def launch_main_app(user_data):
     app_globals.auto_claim = user_data.get('auto_claim', 0)
     #print(f"Updated initial globals.total_win_today → {app_globals.total_win_today}")
 
-    mapped_list      = []
     waiting_for_blink= False
     blink_mode       = False
     blink_start_time = 0.0
@@ -273,101 +352,90 @@ def launch_main_app(user_data):
     # ───── LOAD LAST CYCLE FROM DISK ─────────────────────────────────────────────
     persisted_start = load_last_cycle_timestamp()
     if persisted_start is not None:
-        last_cycle = persisted_start
-        while last_cycle + CYCLE_DURATION <= base_server_ts:
-            last_cycle += CYCLE_DURATION
-        cycle_start_ts = last_cycle
-        next_action_ts = cycle_start_ts + CYCLE_DURATION
-        withdraw_ts     = next_action_ts
+        cycle_start_ts = advance_cycle(persisted_start, base_server_ts)
+        withdraw_ts    = cycle_start_ts + CYCLE_DURATION
 
         app_globals.Withdraw_time = format_withdraw_time(withdraw_ts)
         wheel_module.print_withdraw_time()
         save_last_cycle_timestamp(cycle_start_ts)
 
-    def api_loop():
-        nonlocal mapped_list, base_server_ts, base_local_ts
-        nonlocal next_action_ts, withdraw_ts, cycle_start_ts
-        nonlocal waiting_for_blink
+    def server_now():
+        return base_server_ts + (time.time() - base_local_ts)
 
+    def api_loop():
+        # Paced by cycle phase, bets and claims, and failures; see poll_policy
         while True:
-            time.sleep(2)
+            poll_policy.policy.wait(poll_policy.policy.next_delay(withdraw_ts - server_now()))
+            if poll_policy.policy.push_up:
+                continue        # the push stream is bringing the updates
+            cycle = cycle_start_ts
+            phase = poll_policy.policy.phase(withdraw_ts - server_now())
+            ok = False
             try:
-                resp = requests.post(DASHBOARD_API, data={"ID": str(user_data['id'])})
-                data = resp.json()
-                app_globals.User_id = str(user_data['id'])
-                mapped_list = data.get('mapped', [])
-                # #print("Response from DASHBOARD API mapped_list:", mapped_list)
-
-                srv_now = data.get('server_timestamp')
-                if srv_now:
-                    base_server_ts = srv_now
-                    base_local_ts  = time.time()
-
-                srv_last = data.get('last_spin_timestamp')
-                if srv_last:
-                    srv_dt = datetime.fromtimestamp(srv_last)
-                    aligned_min = srv_dt.minute - (srv_dt.minute % 2)
-                    aligned_cycle_dt = srv_dt.replace(minute=aligned_min, second=0, microsecond=0)
-                    last_cycle = aligned_cycle_dt.timestamp()
-
-                    while last_cycle + CYCLE_DURATION <= base_server_ts:
-                        last_cycle += CYCLE_DURATION
-
-                    cycle_start_ts = last_cycle
-                    next_action_ts = cycle_start_ts + CYCLE_DURATION
-                    withdraw_ts     = next_action_ts
-
-                    app_globals.Withdraw_time = format_withdraw_time(withdraw_ts)
-                    wheel_module.print_withdraw_time()
-                    save_last_cycle_timestamp(cycle_start_ts)
-
-                if base_server_ts >= next_action_ts:
-                    cycle_start_ts = next_action_ts
-                    next_action_ts = cycle_start_ts + CYCLE_DURATION
-                    withdraw_ts    = next_action_ts
-
-                    app_globals.Withdraw_time = format_withdraw_time(withdraw_ts)
-                    wheel_module.print_withdraw_time()
-                    save_last_cycle_timestamp(cycle_start_ts)
-
-                    # Reset for the next‐spin blink logic
-                    waiting_for_blink = False
-                    # Also reset RESULT_API flag for new cycle
-                    result_api_called = False
-
+                # Parse rows here, once per poll, not per frame on the UI thread;
+                # only the tickets that changed reach the store and Account totals
+                data = dashboard.poll(user_data['id'])
+                # #print("Response from DASHBOARD API mapped:", data.get('mapped'))
+
+                # The clock and the cycle belong to the main loop
+                pygame.event.post(pygame.event.Event(
+                    SERVER_SYNC,
+                    server_ts=data.get('server_timestamp'),
+                    local_ts=time.time(),
+                    last_spin=data.get('last_spin_timestamp'),
+                ))
+                ok = True
             except Exception:
                 pass
+            poll_policy.policy.record(cycle, phase, ok)
 
     threading.Thread(target=api_loop, daemon=True).start()
 
-    clock = pygame.time.Clock()
+    def push_event(name, data):
+        # On the push thread: hand the event to the main loop
+        if name == "time":
+            pygame.event.post(pygame.event.Event(
+                SERVER_SYNC,
+                server_ts=data.get('server_timestamp'),
+                local_ts=time.time(),
+                last_spin=data.get('last_spin_timestamp'),
+            ))
+        else:
+            pygame.event.post(pygame.event.Event(PUSH_EVENT, name=name, data=data))
+
+    push = None
+    if PUSH_UPDATES:
+        # While it's up api_loop never polls, so nothing here may wait on a
+        # poll: the stream subscribes as the User_id bets are sent with
+        push = PushClient(app_globals.User_id, dashboard, push_event,
+                          on_state=poll_policy.policy.set_push).start()
+
+    scheduler = FrameScheduler()
     show_mode = 'wheel'
 
     def draw_timer_ring(surface, center, radius, remaining, total):
         fraction = max(0.0, min(1.0, remaining / total))
-        start_ang = -90 * (3.14 / 180)
-        end_ang   = (360 * fraction - 90) * (3.14 / 180)
-        rect = pygame.Rect(0, 0, radius * 2, radius * 2)
-        rect.center = center
-        pygame.draw.circle(surface, (50, 50, 50), center, radius, 4)
-        pygame.draw.arc(surface, ORANGE, rect, start_ang, end_ang, 4)
+        ring_rect = pygame.draw.circle(surface, (50, 50, 50), center, radius, 4)
+        # Counter-clockwise from 6 o'clock, like the old pygame.draw.arc call;
+        # the 4 px stroke sits inside `radius` just as the arc's did
+        pts = polar.arc_points(center, radius - 2, 90, -360 * fraction)
+        if len(pts) > 1:
+            ring_rect.union_ip(pygame.draw.lines(surface, ORANGE, False, pts, 4))
+        return ring_rect
 
     def compute_countdown():
-        curr_local = time.time()
-        elapsed = curr_local - base_local_ts
-        current_server_ts = base_server_ts + elapsed
+        current_server_ts = server_now()
         remaining = max(0, int((cycle_start_ts + CYCLE_DURATION) - current_server_ts))
         return remaining, current_server_ts
 
     def draw_withdraw_time_label():
         label = f""
-        fs = int(min(sw, sh) * 0.03)
-        lbl_font = pygame.font.SysFont("Arial", fs, bold=True)
-        surf = lbl_font.render(label, True, YELLOW_BG)
+        lbl_font = get_font("Arial", lay.label_font_size, bold=True)
+        surf = render_text(lbl_font, label, YELLOW_BG)
         padding = 20
         x = sw - surf.get_width() - padding
-        y = sh - surf.get_height() - padding - int(min(sw, sh) * 0.05) - 10
-        screen.blit(surf, (x, y))
+        y = sh - surf.get_height() - padding - lay.countdown_radius - 10
+        return screen.blit(surf, (x, y))
 
     def segment_to_cell(idx):
         """
@@ -381,237 +449,316 @@ def launch_main_app(user_data):
         cidx = idx % 4 + 1
         return (ridx, cidx)
 
+    # ─── Cycle events, fired by `deadlines` on the server clock ───
+    # The main loop runs them once per frame (run_due), so each fires exactly
+    # once even if a frame stalls across its deadline
+    deadlines = DeadlineScheduler()
+
+    def schedule_cycle(start):
+        """(Re)schedule the result fetch, spin and roll-over of the cycle from `start`."""
+        end = start + CYCLE_DURATION
+        deadlines.at(end - RESULT_LEAD, "fetch_result", lambda due: request_result(end))
+        deadlines.at(end, "start_spin", start_spin)
+        deadlines.at(end, "roll_cycle", roll_cycle)
+
+    def set_cycle(start):
+        nonlocal cycle_start_ts, withdraw_ts
+        cycle_start_ts = start
+        withdraw_ts    = start + CYCLE_DURATION
+        app_globals.Withdraw_time = format_withdraw_time(withdraw_ts)
+        wheel_module.print_withdraw_time()
+        save_last_cycle_timestamp(cycle_start_ts)
+        schedule_cycle(start)
+
+    def request_result(end):
+        # On a worker; result_arrived() applies the reply
+        nonlocal resp_data, resp_end
+        if resp_end != end:
+            resp_data, resp_end = {}, None      # the last cycle's reply must not carry over
+        payload = {
+            # Numeric timestamp
+            "withdraw_time": int(end),
+            "user_id":       str(user_data['id'])
+        }
+        net_executor.submit(fetch_result, payload, key="result",
+                            on_done=lambda data, error: result_arrived(end, data, error))
+
+    def start_spin(due):
+        nonlocal spinning, spin_start, total_rot, result_index
+        spins    = random.randint(3, 6)
+        target_i = app_globals.FORCED_SEGMENT
+        win_value = 0
+        if resp_end == due:
+            win_value = int(resp_data.get("chooseindexpoint", 0))
+        else:
+            # Late or failed fetch: the wheel lands on the last forced segment,
+            # but no win, history or result highlight is taken from it
+            print("No result for this spin; win and history not updated")
+        if win_value:
+            deadlines.at(due + WIN_DELAY, f"add_win {due}", lambda _: add_win(win_value))
+
+        desired_final_ang = compute_final_angle_for_segment(target_i, num_segments)
+        delta_ang = (desired_final_ang - spin_base_ang) % 360.0
+        total_rot   = spins * 360.0 + delta_ang
+        spin_start  = due
+        spinning    = True
+        result_index = None
+        deadlines.at(due + wheel_module.SPIN_DURATION, "end_spin", end_spin)
+
+        #print(f"*** Spinning wheel → stopping on segment #{target_i}; "f"desired_final_ang=f"spin_base_ang={spin_base_ang:.1f}°, delta={delta_ang:.1f}°, "f"total_rot={total_rot:.1f}° ***")
+
+    def end_spin(due):
+        nonlocal spinning, current_ang, spin_base_ang, result_index
+        nonlocal waiting_for_blink, blink_mode, blink_start_time
+        spinning = False
+        current_ang = spin_base_ang + update_spin(due, spin_start, total_rot)[0]
+        spin_base_ang = current_ang
+        if resp_end == spin_start:
+            app_globals.history_json = resp_data.get('game_results_history', [])
+            result_index = app_globals.FORCED_SEGMENT
+        if waiting_for_blink:
+            blink_mode = True
+            blink_start_time = due
+            waiting_for_blink = False
+            deadlines.at(due + BLINK_DURATION, "end_blink", end_blink)
+
+    def end_blink(due):
+        nonlocal blink_mode, highlight_on
+        blink_mode = False
+        highlight_on = False
+
+    def add_win(win_value):
+        app_globals.total_win_today = int(app_globals.total_win_today) + win_value * 10
+
+    def roll_cycle(due):
+        # In one step, so a long stall doesn't replay the cycles it missed
+        set_cycle(advance_cycle(due, server_now()))
+
+    def sync_server_time(ev):
+        nonlocal base_server_ts, base_local_ts
+        if ev.server_ts:
+            base_server_ts = ev.server_ts
+            base_local_ts  = ev.local_ts
+            # A correction forward may have passed a deadline: fire it
+            # before re-aligning, so the cycle it ends still spins
+            deadlines.run_due(server_now())
+        if ev.last_spin:
+            start = advance_cycle(cycle_start_at(ev.last_spin), server_now())
+            # One cycle back means this one was rolled a moment early by the
+            # old clock; re-aligning would spin it twice
+            if start > cycle_start_ts or start < cycle_start_ts - CYCLE_DURATION:
+                set_cycle(start)
+
+    # ─── Network completions, delivered on this thread by net_executor.handle() ───
+    def result_arrived(end, data, error):
+        nonlocal resp_data, resp_end, waiting_for_blink
+        if error is not None:
+            print("Error fetching forced segment:", error)
+            # Try again while there is still time before the spin
+            retry = server_now() + RESULT_RETRY
+            if retry < end - 1:
+                deadlines.at(retry, "fetch_result", lambda due: request_result(end))
+            return
+        if server_now() >= end:
+            print("Forced segment arrived after the spin started; ignored")
+            return
+        resp_data, resp_end = data, end
+
+        # Print entire JSON response each time
+        #print("Response from RESULT_API (at remaining==5):", resp_data)
+
+        choosen = resp_data.get("choosenindex")
+        if choosen is not None:
+            app_globals.FORCED_SEGMENT = int(choosen)
+            #print(f"Updated globals.FORCED_SEGMENT → {app_globals.FORCED_SEGMENT}")
+        waiting_for_blink = True
+
+    def push_received(ev):
+        if ev.name == "result":
+            # Pushed ahead of the fetch, which is then not needed
+            end = withdraw_ts
+            if ev.data.get("withdraw_time") == int(end) and deadlines.pending("fetch_result") is not None:
+                deadlines.cancel("fetch_result")
+                result_arrived(end, ev.data, None)
+        elif ev.name == "balance":
+            app_globals.user_data_points = ev.data.get("points", app_globals.user_data_points)
+
+    def auto_claim_saved(previous, data, error):
+        if error is not None:
+            print("Other error:", error)
+            app_globals.auto_claim = previous
+            app_globals.message = "Auto claim setting was not saved. Please try again."
+            app_globals.message_time = pygame.time.get_ticks()
+
+    def shutdown():
+        # Window closed or Close clicked: print the run's reports and exit
+        print(scheduler.report())
+        print(http_client.report())
+        print(dashboard.report())
+        print(poll_policy.policy.report())
+        if push is not None:
+            print(push.report())
+            push.stop()
+        net_executor.shutdown()
+        pygame.quit()
+        sys.exit()
+
+    schedule_cycle(cycle_start_ts)
     while True:
-        dt = clock.get_time() / 1000.0
-        now_local = time.time()
+        dt = scheduler.dt
+        # Result fetch, spin start and end, blink end, win, cycle roll-over
+        deadlines.run_due(server_now())
         remaining, current_server_ts = compute_countdown()
 
-        # ─── Fetch forced segment exactly when remaining == 5 ───
-        if remaining == 5 and not result_api_called:
-            try:
-                payload = {
-                    # Numeric timestamp
-                    "withdraw_time": int(withdraw_ts),
-                    "user_id":       str(user_data['id'])
-                }
-                resp = requests.post(
-                    RESULT_API,
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                )
-                resp_data = resp.json()
-
-                # Print entire JSON response each time
-                #print("Response from RESULT_API (at remaining==5):", resp_data)
-
-                choosen = resp_data.get("choosenindex")
-                if choosen is not None:
-                    app_globals.FORCED_SEGMENT = int(choosen)
-                    #print(f"Updated globals.FORCED_SEGMENT → {app_globals.FORCED_SEGMENT}")
-                waiting_for_blink = True
-                result_api_called = True
-            except Exception as e:
-                print("Error fetching forced segment:", e)
-
-        # ─── When countdown hits 0, schedule forced spin ───
-        if remaining <= 0 and not spinning:
-            spins    = random.randint(3, 6)
-            target_i = app_globals.FORCED_SEGMENT
-            win_value = int(resp_data.get("chooseindexpoint", 0))
-
-            if win_value is not None:
-                #print(f"Updated before globals.total_win_today → {app_globals.total_win_today}")
-                def delayed_update():
-                    time.sleep(5)
-                    app_globals.total_win_today = int(app_globals.total_win_today) + win_value * 10
-
-                threading.Thread(target=delayed_update).start()
-                #print(f"Updated after globals.total_win_today → {app_globals.total_win_today}")
-
-            desired_final_ang = compute_final_angle_for_segment(target_i, num_segments)
-            delta_ang = (desired_final_ang - spin_base_ang) % 360.0
-            total_rot   = spins * 360.0 + delta_ang
-            spin_start  = current_server_ts
-            spinning    = True
-            result_index = None
-
-            #print(f"*** Spinning wheel → stopping on segment #{target_i}; "f"desired_final_ang=f"spin_base_ang={spin_base_ang:.1f}°, delta={delta_ang:.1f}°, "f"total_rot={total_rot:.1f}° ***")
-
-            # Schedule next cycle immediately
-            cycle_start_ts = cycle_start_ts + CYCLE_DURATION
-            next_action_ts = cycle_start_ts + CYCLE_DURATION
-            withdraw_ts    = next_action_ts
-            app_globals.Withdraw_time = format_withdraw_time(withdraw_ts)
-            wheel_module.print_withdraw_time()
-            save_last_cycle_timestamp(cycle_start_ts)
-            # Reset flag for next cycle
-            result_api_called = False
-
         # ─── Handle events ───
-        for ev in pygame.event.get():
-            if ev.type == pygame.QUIT:
-                pygame.quit()
-                sys.exit()
-            if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
-                if close_btn.collidepoint(ev.pos):
-                    pygame.quit()
-                    sys.exit()
-                if min_btn.collidepoint(ev.pos):
-                    pygame.display.iconify()
-                if show_mode == 'wheel':
-                    if account_btn.collidepoint(ev.pos):
-                        show_mode = 'summary'
-                    elif history_btn.collidepoint(ev.pos):
-                        show_mode = 'history'
-                    elif simple_btn.collidepoint(ev.pos):
-                        show_mode = 'simple'
+        with frame_timing.stage("events"):
+            claim_click = None
+            for ev in scheduler.events():
+                if net_executor.handle(ev):
+                    continue
+                if ev.type == SERVER_SYNC:
+                    sync_server_time(ev)
+                    continue
+                if ev.type == PUSH_EVENT:
+                    push_received(ev)
+                    continue
+                if ev.type == pygame.QUIT:
+                    shutdown()
+                if ev.type == pygame.KEYDOWN and ev.key == pygame.K_F3:
+                    frame_timing.toggle_overlay()
+                    regions.invalidate()
+                if ev.type == pygame.MOUSEWHEEL and show_mode != 'wheel':
+                    table_module.scroll(ev.y)
+                if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
+                    claim_click = ev.pos
+                    if close_btn.collidepoint(ev.pos):
+                        shutdown()
+                    if min_btn.collidepoint(ev.pos):
+                        pygame.display.iconify()
+                    if show_mode == 'wheel':
+                        if account_btn.collidepoint(ev.pos):
+                            show_mode = 'summary'
+                        elif history_btn.collidepoint(ev.pos):
+                            show_mode = 'history'
+                        elif simple_btn.collidepoint(ev.pos):
+                            show_mode = 'simple'
+                        else:
+                            # ─── Player clicked on the wheel to place a bet ───
+                            bet_amt = handle_click(ev.pos, compute_countdown)
+                            if isinstance(bet_amt, (int, float)):
+                                # Subtract the bet amount from globals.user_data_points
+                                app_globals.user_data_points = max(0, app_globals.user_data_points - bet_amt)
+                                #print(f"Bet placed: {bet_amt}, New balance = {app_globals.user_data_points}")
                     else:
-                        # ─── Player clicked on the wheel to place a bet ───
-                        bet_amt = handle_click(ev.pos, compute_countdown)
-                        if isinstance(bet_amt, (int, float)):
-                            # Subtract the bet amount from globals.user_data_points
-                            app_globals.user_data_points = max(0, app_globals.user_data_points - bet_amt)
-                            #print(f"Bet placed: {bet_amt}, New balance = {app_globals.user_data_points}")
-                else:
-                    if back_btn.collidepoint(ev.pos):
-                        show_mode = 'wheel'
-
-            if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
-                mx, my = ev.pos
-                # did we click the checkbox?
-                checkbox_rect = pygame.Rect(checkbox_x, checkbox_y, checkbox_size, checkbox_size)
-                if checkbox_rect.collidepoint(mx, my):
-                    # toggle and (optionally) persist
-                    app_globals.auto_claim = 0 if app_globals.auto_claim else 1
-                    url = "https://spintofortune.in/api/app_toggle_auto_claim.php"
-                    
-                    payload = {"user_id": app_globals.User_id,"auto_claim": app_globals.auto_claim}
-                    payload_json = json.dumps(payload)
-
-                    headers = {
-                        "Content-Type":   "application/json; charset=UTF-8",
-                        "Content-Length": str(len(payload_json))
-                    }
-
-                    try:
-                        resp = requests.post(url, data=payload_json, headers=headers)
-
-                        # always print status
-                        #print(f"Response HTTP {resp.status_code}")
-
-                        # try JSON first
-                        try:
-                            data = resp.json()
-                            #print("Response JSON:", json.dumps(data, indent=2))
-                        except ValueError:
-                            # fallback to raw text
-                            print("Response text:", resp.text)
-
-                        # if it’s a non‐2xx, raise here if you still want an exception
-                        if resp.status_code >= 400:
-                            resp.raise_for_status()
-
-                    except requests.exceptions.HTTPError as http_err:
-                        # now you’ll see the server-sent body too
-                        #print("HTTP error occurred:", http_err)
-                        print("Response body:", http_err.response.text)
-                    except Exception as e:
-                        print("Other error:", e)
-                    #print('auto_claim', app_globals.auto_claim)
+                        if back_btn.collidepoint(ev.pos):
+                            show_mode = 'wheel'
+
+                if ev.type == pygame.MOUSEBUTTONDOWN and ev.button == 1:
+                    mx, my = ev.pos
+                    # did we click the checkbox?
+                    if lay.checkbox_rect.collidepoint(mx, my) and not net_executor.pending("auto_claim"):
+                        # toggle now, persist on a worker (reverted if that fails)
+                        previous = app_globals.auto_claim
+                        app_globals.auto_claim = 0 if app_globals.auto_claim else 1
+                        payload = {"user_id": app_globals.User_id,"auto_claim": app_globals.auto_claim}
+                        net_executor.submit(
+                            save_auto_claim, json.dumps(payload), key="auto_claim",
+                            label="Saving auto claim...",
+                            on_done=lambda data, error, previous=previous: auto_claim_saved(previous, data, error))
+                        #print('auto_claim', app_globals.auto_claim)
         # ─── Update rotation + scrolling text offset ───
+        # (end_spin stops it)
         if spinning:
-            delta_ang, still_spinning = update_spin(now_local, spin_start, total_rot)
+            delta_ang, _ = update_spin(current_server_ts, spin_start, total_rot)
             current_ang = spin_base_ang + delta_ang
 
             anim_offset += anim_speed * dt
 
-            if not still_spinning:
-                spinning = False
-                app_globals.history_json = resp_data.get('game_results_history', [])
-                spin_base_ang = current_ang
-                result_index = app_globals.FORCED_SEGMENT
-                if waiting_for_blink:
-                    blink_mode = True
-                    blink_start_time = time.time()
-                    waiting_for_blink = False
-
         # ─── Draw UI ───
-        screen.fill(BLACK)
-        screen.blit(bg_img, (0, 0))
-
-        # Header + border
-        pygame.draw.rect(screen, WOOD_BLACK, (0, 0, sw, margin_top))
-        pygame.draw.line(screen, (255, 0, 0),
-                         (0, margin_top - 2), (sw, margin_top - 2), 2)
+        # Every region is registered with a state key and a draw function. In
+        # dirty-rect mode only regions whose state changed (or that overlap
+        # one) are restored from the backdrop and redrawn; see dirty_rects.py.
+        # Mode switches, and the table screens, always redraw and flip.
+        if show_mode != drawn_mode or show_mode != 'wheel':
+            regions.invalidate()
+            drawn_mode = show_mode
 
         mx, my = pygame.mouse.get_pos()
 
         # Close & Minimize
         is_hover_close = close_btn.collidepoint(mx, my)
-        if is_hover_close:
-            hr = close_btn.inflate(6, 6)
-            pygame.draw.rect(screen, YELLOW_BG, hr)
-            pygame.draw.rect(screen, VIOLET, hr, 2)
-            cx, cy = close_btn.center
-            off = 8
-            pygame.draw.line(screen, VIOLET,
-                             (cx - off, cy - off), (cx + off, cy + off), 3)
-            pygame.draw.line(screen, VIOLET,
-                             (cx - off, cy + off), (cx + off, cy - off), 3)
-        else:
-            hr = close_btn.inflate(4, 4)
-            pygame.draw.rect(screen, YELLOW_BG, hr)
-            cx, cy = close_btn.center
-            off = 8
-            pygame.draw.line(screen, BLACK,
-                             (cx - off, cy - off), (cx + off, cy + off), 3)
-            pygame.draw.line(screen, BLACK,
-                             (cx - off, cy + off), (cx + off, cy - off), 3)
-
         is_hover_min = min_btn.collidepoint(mx, my)
-        if is_hover_min:
-            hr2 = min_btn.inflate(6, 6)
-            pygame.draw.rect(screen, YELLOW_BG, hr2)
-            pygame.draw.rect(screen, VIOLET, hr2, 2)
-            mx_c, my_c = min_btn.center
-            off = 8
-            pygame.draw.line(screen, BLACK,
-                             (mx_c - off, my_c), (mx_c + off, my_c), 3)
-        else:
-            hr2 = min_btn.inflate(4, 4)
-            pygame.draw.rect(screen, YELLOW_BG, hr2)
-            pygame.draw.rect(screen, BLACK, hr2, 2)
-            mx_c, my_c = min_btn.center
-            off = 8
-            pygame.draw.line(screen, BLACK,
-                             (mx_c - off, my_c), (mx_c + off, my_c), 3)
 
-        # Player name & balance
+        def draw_window_buttons():
+            if is_hover_close:
+                hr = close_btn.inflate(6, 6)
+                pygame.draw.rect(screen, YELLOW_BG, hr)
+                pygame.draw.rect(screen, VIOLET, hr, 2)
+                cx, cy = close_btn.center
+                off = 8
+                pygame.draw.line(screen, VIOLET,
+                                 (cx - off, cy - off), (cx + off, cy + off), 3)
+                pygame.draw.line(screen, VIOLET,
+                                 (cx - off, cy + off), (cx + off, cy - off), 3)
+            else:
+                hr = close_btn.inflate(4, 4)
+                pygame.draw.rect(screen, YELLOW_BG, hr)
+                cx, cy = close_btn.center
+                off = 8
+                pygame.draw.line(screen, BLACK,
+                                 (cx - off, cy - off), (cx + off, cy + off), 3)
+                pygame.draw.line(screen, BLACK,
+                                 (cx - off, cy + off), (cx + off, cy - off), 3)
+
+            if is_hover_min:
+                hr2 = min_btn.inflate(6, 6)
+                pygame.draw.rect(screen, YELLOW_BG, hr2)
+                pygame.draw.rect(screen, VIOLET, hr2, 2)
+                mx_c, my_c = min_btn.center
+                off = 8
+                pygame.draw.line(screen, BLACK,
+                                 (mx_c - off, my_c), (mx_c + off, my_c), 3)
+            else:
+                hr2 = min_btn.inflate(4, 4)
+                pygame.draw.rect(screen, YELLOW_BG, hr2)
+                pygame.draw.rect(screen, BLACK, hr2, 2)
+                mx_c, my_c = min_btn.center
+                off = 8
+                pygame.draw.line(screen, BLACK,
+                                 (mx_c - off, my_c), (mx_c + off, my_c), 3)
+            return [close_btn.inflate(6, 6), min_btn.inflate(6, 6)]
+
+        regions.add("window_buttons", (is_hover_close, is_hover_min), frame_timing.timed("hud", draw_window_buttons))
+
         # Player name & balance
         player_name = f"{user_data.get('first_name', '')} {user_data.get('last_name', '')}"
-        player_surf = font.render(player_name, True, YELLOW_BG)
-        player_rect = player_surf.get_rect()
 
         # ─── BALANCE DISPLAY ─────────────────────────────────────────────────────────
         balance_text = f"Balance : {app_globals.user_data_points}"
-        balance_surf = font.render(balance_text, True, YELLOW_BG)
-        balance_rect = balance_surf.get_rect()
-        spacing = 10
-        bp_x = 10
-        bp_y = 4
-        balance_border = balance_rect.inflate(bp_x, bp_y)
-        balance_border.right = min_btn.left - spacing
-        v_center = margin_top // 2
-        player_rect.centery = v_center
-        balance_border.centery = v_center
-        balance_rect.left = balance_border.left + (bp_x // 2)
-        balance_rect.top = balance_border.top + (bp_y // 2)
-        gap = 10
-        player_rect.right = balance_border.left - gap
-
-        screen.blit(player_surf, player_rect)
-        pygame.draw.rect(screen, YELLOW_BG, balance_border, 2)
-        screen.blit(balance_surf, balance_rect)
+
+        def draw_balance():
+            player_surf = render_text(font, player_name, YELLOW_BG)
+            player_rect = player_surf.get_rect()
+            balance_surf = render_text(font, balance_text, YELLOW_BG)
+            balance_rect = balance_surf.get_rect()
+            bp_x = 10
+            bp_y = 4
+            balance_border = balance_rect.inflate(bp_x, bp_y)
+            balance_border.right = lay.balance_right
+            v_center = lay.header_mid_y
+            player_rect.centery = v_center
+            balance_border.centery = v_center
+            balance_rect.left = balance_border.left + (bp_x // 2)
+            balance_rect.top = balance_border.top + (bp_y // 2)
+            gap = 10
+            player_rect.right = balance_border.left - gap
+
+            screen.blit(player_surf, player_rect)
+            pygame.draw.rect(screen, YELLOW_BG, balance_border, 2)
+            screen.blit(balance_surf, balance_rect)
+            return [player_rect, balance_border]
+
+        regions.add("balance", (player_name, balance_text), frame_timing.timed("hud", draw_balance))
 
 
 
@@ -620,22 +767,6 @@ def launch_main_app(user_data):
 
         # …
 
-        checkbox_size = 24
-        checkbox_x = 40   # moved 20px to the right (was 20)
-        checkbox_y = (margin_top - checkbox_size) // 2
-
-        # Draw the checkbox border
-        checkbox_rect = pygame.Rect(checkbox_x, checkbox_y, checkbox_size, checkbox_size)
-        pygame.draw.rect(screen, WHITE, checkbox_rect, 2)  # 2 px border
-
-        if app_globals.auto_claim:
-            # Draw a check mark instead of filling
-            # calculate three key points for a nice “tick”
-            start = (checkbox_x + 4, checkbox_y + checkbox_size // 2)
-            mid   = (checkbox_x + checkbox_size // 2, checkbox_y + checkbox_size - 4)
-            end   = (checkbox_x + checkbox_size - 4, checkbox_y + 4)
-            pygame.draw.line(screen, GREEN, start, mid, 3)
-            pygame.draw.line(screen, GREEN, mid,   end, 3)
         # Current date/time & wins
         current_clock = datetime.now().strftime('%H:%M:%S')
         current_date  = datetime.now().strftime('%d-%m-%Y')
@@ -646,99 +777,138 @@ def launch_main_app(user_data):
             f"Win:{app_globals.total_win_today}   "
             
         )
-        text_surf = font.render(info_txt, True, YELLOW_BG)
-        screen.blit(text_surf, (checkbox_x + checkbox_size + 10, checkbox_y))
+
+        def draw_clock_line():
+            # Draw the checkbox border
+            checkbox_rect = lay.checkbox_rect
+            checkbox_x, checkbox_y = checkbox_rect.topleft
+            checkbox_size = checkbox_rect.width
+            pygame.draw.rect(screen, WHITE, checkbox_rect, 2)  # 2 px border
+
+            if app_globals.auto_claim:
+                # Draw a check mark instead of filling
+                # calculate three key points for a nice “tick”
+                start = (checkbox_x + 4, checkbox_y + checkbox_size // 2)
+                mid   = (checkbox_x + checkbox_size // 2, checkbox_y + checkbox_size - 4)
+                end   = (checkbox_x + checkbox_size - 4, checkbox_y + 4)
+                pygame.draw.line(screen, GREEN, start, mid, 3)
+                pygame.draw.line(screen, GREEN, mid,   end, 3)
+            # Changes every second, so it bypasses the text cache
+            text_surf = font.render(info_txt, True, YELLOW_BG)
+            return [checkbox_rect,
+                    screen.blit(text_surf, lay.info_text_pos)]
+
+        regions.add("clock", (app_globals.auto_claim, info_txt), frame_timing.timed("hud", draw_clock_line))
 
         # ─── Draw Left Table (possibly blinking ribbon) ───
+        # (end_blink stops it)
         if blink_mode:
-            elapsed_blink = time.time() - blink_start_time
-            if elapsed_blink < 5.0:
-                highlight_on = (int((elapsed_blink * 1000) // 500) % 2 == 0)
-            else:
-                blink_mode = False
-                highlight_on = False
+            elapsed_blink = current_server_ts - blink_start_time
+            highlight_on = (int((elapsed_blink * 1000) // 500) % 2 == 0)
 
-            blink_cell = segment_to_cell(app_globals.FORCED_SEGMENT)
-            draw_left_table(
-                screen, current_server_ts, labels_kjq, labels_suits,
-                x0=50, y0=100 + margin_top,
-                label_size=label_size, suit_size=suit_size,
-                small_font=small_font,
-                highlight_cell=blink_cell,
-                highlight_on=highlight_on
-            )
+            board_highlight = (segment_to_cell(app_globals.FORCED_SEGMENT), highlight_on)
         else:
-            draw_left_table(
+            board_highlight = (None, False)
+
+        def draw_board():
+            return draw_left_table(
                 screen, current_server_ts, labels_kjq, labels_suits,
-                x0=50, y0=100 + margin_top,
+                x0=board_x0, y0=board_y0,
                 label_size=label_size, suit_size=suit_size,
-                small_font=small_font
+                small_font=small_font,
+                highlight_cell=board_highlight[0],
+                highlight_on=board_highlight[1],
+                draw_tray=False,
+                draw_history=False
             )
 
+        regions.add("board", wheel_module.left_table_state(*board_highlight),
+                    frame_timing.timed("board", draw_board))
+        regions.add(
+            "chip_tray", wheel_module.chip_tray_state(current_server_ts),
+            frame_timing.timed("board", lambda: wheel_module.draw_chip_tray(screen, current_server_ts, board_x0, board_y0, small_font))
+        )
+        regions.add(
+            "history",
+            wheel_module.history_signature(getattr(app_globals, "history_json", [])),
+            frame_timing.timed("board", lambda: wheel_module.draw_history_strip(screen, board_x0, board_y0, labels_kjq, labels_suits))
+        )
+        regions.add(
+            "history_latest", wheel_module.history_state(),
+            frame_timing.timed("board", lambda: wheel_module.draw_history_latest(screen, board_x0, board_y0, labels_kjq, labels_suits))
+        )
+
         # ─── Draw & update the wheel ───
         if blink_mode:
-            elapsed_blink2 = time.time() - blink_start_time
-            if elapsed_blink2 < 5.0:
-                highlight_on2 = (int((elapsed_blink2 * 1000) // 500) % 2 == 0)
-            else:
-                highlight_on2 = False
-
-            draw_wheel(
-                screen, wheel_center, outer_radius, mid_radius, inner_radius,
-                num_segments, outer_colors, mid_colors,
-                labels_kjq, labels_suits,
-                current_ang,
-                is_spinning=spinning,
-                anim_offset=anim_offset,
-                result_index=result_index,
-                highlight_index=app_globals.FORCED_SEGMENT,
-                highlight_on=highlight_on2
-            )
+            elapsed_blink2 = current_server_ts - blink_start_time
+            highlight_on2 = (int((elapsed_blink2 * 1000) // 500) % 2 == 0)
+            wheel_highlight = (app_globals.FORCED_SEGMENT, highlight_on2)
         else:
-            draw_wheel(
-                screen, wheel_center, outer_radius, mid_radius, inner_radius,
+            wheel_highlight = (None, False)
+
+        def draw_wheel_region():
+            return draw_wheel(
+                screen, lay.wheel_center, lay.outer_radius, lay.mid_radius, lay.inner_radius,
+                lay.ribbon_thickness,
                 num_segments, outer_colors, mid_colors,
                 labels_kjq, labels_suits,
                 current_ang,
                 is_spinning=spinning,
                 anim_offset=anim_offset,
                 result_index=result_index,
-                highlight_index=None,
-                highlight_on=False
+                highlight_index=wheel_highlight[0],
+                highlight_on=wheel_highlight[1]
             )
 
+        wheel_state = (current_ang, spinning, int(anim_offset) if spinning else None,
+                       result_index, wheel_highlight)
+        regions.add("wheel", wheel_state, frame_timing.timed("wheel", draw_wheel_region))
+
         # ─── Draw countdown ring & timer ───
-        radius = int(min(sw, sh) * 0.05)
-        padding_br = 20
-        center = (sw - radius - padding_br, sh - radius - padding_br)
-        draw_timer_ring(screen, center, radius, remaining, CYCLE_DURATION)
-        fs = int(min(sw, sh) * 0.04)
-        countdown_font = pygame.font.SysFont("Arial", fs, bold=True)
-        txt_surf = countdown_font.render(f"{remaining}s", True, WHITE)
-        screen.blit(txt_surf, (center[0] - txt_surf.get_width() // 2,
-                               center[1] - txt_surf.get_height() // 2))
+        def draw_countdown():
+            center = lay.countdown_center
+            ring_rect = draw_timer_ring(screen, center, lay.countdown_radius, remaining, CYCLE_DURATION)
+            countdown_font = get_font("Arial", lay.countdown_font_size, bold=True)
+            txt_surf = render_text(countdown_font, f"{remaining}s", WHITE)
+            txt_rect = screen.blit(txt_surf, (center[0] - txt_surf.get_width() // 2,
+                                              center[1] - txt_surf.get_height() // 2))
+            return [ring_rect, txt_rect]
+
+        regions.add("countdown", remaining, frame_timing.timed("hud", draw_countdown))
 
         # ─── Draw “Withdraw @ HH:MM:00” ───
+        shown_message = None
         if hasattr(app_globals, 'message') and app_globals.message:
             now = pygame.time.get_ticks()
             if app_globals.message and now - app_globals.message_time < 3000:
-                draw_message_box(screen, app_globals.message, font, y=80)
+                shown_message = app_globals.message
             elif now - app_globals.message_time >= 3000:
                 app_globals.message = ""
-        
-        
-        draw_withdraw_time_label()
+        if not shown_message:
+            # a bet / setting still on the wire
+            pending = net_executor.pending_labels()
+            shown_message = pending[0] if pending else None
+        if shown_message:
+            regions.add("message", shown_message, frame_timing.timed(
+                "hud", lambda: draw_message_box(screen, shown_message, font, y=80)))
+
+        regions.add("withdraw_label", None, frame_timing.timed("hud", draw_withdraw_time_label))
 
         # ─── Draw nav buttons ───
-        for btn, txt in [(account_btn, "Account"),
-                         (history_btn, "History"),
-                         (simple_btn, "Card History")]:
-            pygame.draw.rect(screen, ORANGE, btn)
-            w, h = font.size(txt)
-            screen.blit(
-                font.render(txt, True, BLACK),
-                (btn.x + (btn.width - w) // 2, btn.y + (btn.height - h) // 2)
-            )
+        def draw_nav_buttons():
+            for btn, txt in [(account_btn, "Account"),
+                             (history_btn, "History"),
+                             (simple_btn, "Card History")]:
+                pygame.draw.rect(screen, ORANGE, btn)
+                w, h = font.size(txt)
+                screen.blit(
+                    render_text(font, txt, BLACK),
+                    (btn.x + (btn.width - w) // 2, btn.y + (btn.height - h) // 2)
+                )
+            return [account_btn, history_btn, simple_btn]
+
+        regions.add("nav_buttons", None, frame_timing.timed("hud", draw_nav_buttons))
+        regions.draw(screen)
 
         # “History” screen
 
@@ -748,136 +918,73 @@ def launch_main_app(user_data):
                 "win_point", "claim_point", "unclaim_point",'withdraw_time',
                 "status", "action"
             ]
-            draw_table(
-                screen, cols, mapped_list, "History",
-                pygame.font.SysFont("Arial", 32, bold=True),
-                small_font, sw,
-                labels_kjq=labels_kjq,
-                labels_suits=labels_suits
-            )
-            # now that draw_table has set up draw_table.buttons:
-            handle_claim_click(ev.pos)
+            with frame_timing.stage("table"):
+                draw_table(
+                    screen, cols, tickets.view(), "History",
+                    get_font("Arial", 32, bold=True),
+                    small_font, sw,
+                    labels_kjq=labels_kjq,
+                    labels_suits=labels_suits
+                )
+            # now that draw_table has indexed its buttons:
+            if claim_click is not None:
+                handle_claim_click(claim_click)
 
             pygame.draw.rect(screen, ORANGE, back_btn)
             screen.blit(
-                pygame.font.SysFont("Arial", 32, bold=True).render("Close", True, BLACK),
+                render_text(get_font("Arial", 32, bold=True), "Close", BLACK),
                 (back_btn.x + 20, back_btn.y + 5)
             )
 
 
         # “Summary” screen
         elif show_mode == 'summary':
-            # Group sums by Marker Card
-            from collections import defaultdict
-
-            def get_marker_and_values(row):
-                # Determine cp_val, up_val
-                cp_raw = row.get('claim_point')
-                up_raw = row.get('unclaim_point')
-                try:
-                    cp_val = float(cp_raw) if cp_raw not in (None, '', 'NA') else None
-                except:
-                    cp_val = None
-                try:
-                    up_val = float(up_raw) if up_raw not in (None, '', 'NA') else None
-                except:
-                    up_val = None
-                # Determine status
-                if cp_val is None and up_val is None:
-                    status = "Bet Placed"
-                elif cp_val == 0 and up_val == 0:
-                    status = "Loose"
-                elif (cp_val is not None and cp_val > 0) or (up_val is not None and up_val > 0):
-                    status = "WIN"
-                else:
-                    status = "Loose"
-                # Determine marker key
-                if status == "Bet Placed":
-                    marker = None  # represent NA
-                else:
-                    gr = row.get('game_result', {})
-                    if gr.get('winning_number') is not None:
-                        marker = gr.get('winning_number')
-                    elif gr.get('lose_number') is not None:
-                        marker = gr.get('lose_number')
-                    else:
-                        marker = None
-                # Extract numeric fields to sum
-                try:
-                    bet = float(row.get('bet_amount', 0) or 0)
-                except:
-                    bet = 0.0
-                try:
-                    claim = float(row.get('claim_point', 0) or 0)
-                except:
-                    claim = 0.0
-                try:
-                    unclaim = float(row.get('unclaim_point', 0) or 0)
-                except:
-                    unclaim = 0.0
-                return marker, bet, claim, unclaim
-
-            sums = defaultdict(lambda: {'bet': 0.0, 'claim': 0.0, 'unclaim': 0.0})
-            for row in mapped_list:
-                marker, bet, claim, unclaim = get_marker_and_values(row)
-                sums[marker]['bet'] += bet
-                sums[marker]['claim'] += claim
-                sums[marker]['unclaim'] += unclaim
-
-            # Build summary rows: one per marker key
-            summary_rows = []
-            # Sort keys: put None (NA) first, then numeric ascending
-            keys = list(sums.keys())
-            def sort_key(k):
-                if k is None:
-                    return -1
-                return int(k) if isinstance(k, (int, float, str)) and str(k).isdigit() else float('inf')
-            keys_sorted = sorted(keys, key=sort_key)
-            for marker in keys_sorted:
-                vals = sums[marker]
-                if marker is None:
-                    marker_str = "NA"
-                else:
-                    marker_str = str(int(marker) if isinstance(marker, float) and marker.is_integer() else str(marker))
-                summary_rows.append({
-                    'card_type': marker_str,
-                    'bet_amount': f"{vals['bet']:.2f}",
-                    'claim_point': f"{vals['claim']:.2f}",
-                    'unclaim_point': f"{vals['unclaim']:.2f}"
-                })
-
+            # Sums by Marker Card, kept by marker_totals as polls arrive
             cols3 = ["card_type", "bet_amount", "claim_point", "unclaim_point"]
-            draw_table(
-                screen, cols3, summary_rows, "Card History",
-                pygame.font.SysFont("Arial", 32, bold=True),
-                small_font, sw,
-                labels_kjq=None,  # so draw_table will render the text in 'card_type'
-                labels_suits=None
-            )
+            with frame_timing.stage("table"):
+                draw_table(
+                    screen, cols3, marker_totals.rows, "Card History",
+                    get_font("Arial", 32, bold=True),
+                    small_font, sw,
+                    labels_kjq=None,  # so draw_table will render the text in 'card_type'
+                    labels_suits=None
+                )
             pygame.draw.rect(screen, ORANGE, back_btn)
             screen.blit(
-                pygame.font.SysFont("Arial", 32, bold=True).render("Close", True, BLACK),
+                render_text(get_font("Arial", 32, bold=True), "Close", BLACK),
                 (back_btn.x + 20, back_btn.y + 5)
             )
 
         # “Simple” screen
         elif show_mode == 'simple':
             cols3 = ["card_type", "ticket_serial", "bet_amount", "claim_point", "unclaim_point",'withdraw_time']
-            draw_table(
-                screen, cols3, mapped_list, "Card History",
-                pygame.font.SysFont("Arial", 32, bold=True),
-                small_font, sw,
-                labels_kjq=labels_kjq,
-                labels_suits=labels_suits
-            )
+            with frame_timing.stage("table"):
+                draw_table(
+                    screen, cols3, tickets.view(), "Card History",
+                    get_font("Arial", 32, bold=True),
+                    small_font, sw,
+                    labels_kjq=labels_kjq,
+                    labels_suits=labels_suits
+                )
             pygame.draw.rect(screen, ORANGE, back_btn)
             screen.blit(
-                pygame.font.SysFont("Arial", 32, bold=True).render("Close", True, BLACK),
+                render_text(get_font("Arial", 32, bold=True), "Close", BLACK),
                 (back_btn.x + 20, back_btn.y + 5)
             )
 
-        pygame.display.flip()
-        clock.tick(60)
+        # Timing overlay goes over everything; it is opaque, so pushing its
+        # rect each frame is enough even when the regions under it are clean
+        overlay_rects = [frame_timing.draw_overlay(screen)] if frame_timing.overlay else []
+        with frame_timing.stage("present"):
+            regions.present(overlay_rects)
+
+        # Full rate only while something moves, including the table easing
+        # toward its scroll position
+        with frame_timing.stage("wait"):
+            scheduler.tick(spinning or blink_mode or wheel_module.selected_chip is not None
+                           or (show_mode != 'wheel' and table_module.scrolling()),
+                           wake_in=deadlines.next_in(server_now()))
+        frame_timing.end_frame()
 
 if __name__ == "__main__":
     dummy = {
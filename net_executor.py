@@ -0,0 +1,89 @@
+"""
+Background execution of the UI's network calls.
+
+The bet, claim, auto-claim and result calls used to run on the pygame
+thread and froze the screen for a whole round trip. `submit(fn, ...)` runs
+`fn` on a small worker pool instead and returns its Future at once. When
+it finishes, a NET_DONE event is posted to pygame's queue (which also
+wakes FrameScheduler's idle wait). The main loop passes every event to
+`handle(ev)`, which calls the job's `on_done(result, error)` there, on the
+UI thread, so game state is only ever changed from one thread.
+
+Jobs can carry a `key`: while a job with that key is in flight, `pending(key)`
+is true, and UI code uses it to ignore repeated clicks. A job's `label`
+(e.g. "Placing bet...") is listed by `pending_labels()` for the HUD until
+it completes.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+MAX_WORKERS = 4         # matches http_client.POOL_SIZE
+
+NET_DONE = pygame.event.custom_type()
+
+_pool = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="net")
+_lock = threading.Lock()
+_jobs = {}              # id -> job, in submission order
+_next_id = 0
+
+
+class _Job:
+    __slots__ = ("id", "key", "label", "on_done", "future")
+
+    def __init__(self, id, key, label, on_done):
+        self.id = id
+        self.key = key
+        self.label = label
+        self.on_done = on_done
+        self.future = None
+
+
+def _post_done(job):
+    try:
+        pygame.event.post(pygame.event.Event(NET_DONE, job=job.id))
+    except pygame.error:
+        # Display already shut down; nobody is left to deliver to
+        with _lock:
+            _jobs.pop(job.id, None)
+
+
+def submit(fn, *args, on_done=None, key=None, label=None):
+    """Run fn(*args) on a worker; on_done(result, error) runs later via handle()."""
+    global _next_id
+    with _lock:
+        _next_id += 1
+        job = _jobs[_next_id] = _Job(_next_id, key, label, on_done)
+    job.future = _pool.submit(fn, *args)
+    job.future.add_done_callback(lambda _: _post_done(job))
+    return job.future
+
+
+def handle(ev):
+    """Deliver a NET_DONE event to its job's on_done; returns True if `ev` was one."""
+    if ev.type != NET_DONE:
+        return False
+    with _lock:
+        job = _jobs.pop(ev.job, None)
+    if job is not None and job.on_done is not None and not job.future.cancelled():
+        error = job.future.exception()
+        job.on_done(None if error is not None else job.future.result(), error)
+    return True
+
+
+def pending(key=None):
+    """Whether a job with `key` (any job if None) hasn't been delivered yet."""
+    with _lock:
+        return any(key is None or job.key == key for job in _jobs.values())
+
+
+def pending_labels():
+    """Labels of the undelivered jobs that have one, oldest first."""
+    with _lock:
+        return [job.label for job in _jobs.values() if job.label]
+
+
+def shutdown():
+    """Drop queued jobs; calls already on the wire finish in the background."""
+    _pool.shutdown(wait=False, cancel_futures=True)
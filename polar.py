@@ -0,0 +1,187 @@
+"""
+Precomputed polar geometry for the wheel, the chip stripes and the countdown ring.
+
+Unit-circle tables are built once per point count and scaled once per radius.
+A rotation is then either an index shift into the table (when the angle falls
+on a table step) or a single vectorised rotation, instead of one cos/sin pair
+per vertex per frame. Angles are in degrees, clockwise on screen (y points
+down), matching the rest of the drawing code.
+
+Run `python polar.py` for a micro-benchmark against the per-point trig loops.
+"""
+import math
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+@lru_cache(maxsize=None)
+def _unit_circle(points):
+    """cos/sin of k * 360/points for k in range(points)."""
+    if np is not None:
+        a = np.arange(points) * (2 * math.pi / points)
+        return np.cos(a), np.sin(a)
+    step = 2 * math.pi / points
+    return ([math.cos(k * step) for k in range(points)],
+            [math.sin(k * step) for k in range(points)])
+
+
+# Below this many vertices plain lists beat NumPy's per-call overhead
+_NUMPY_MIN_POINTS = 48
+
+
+@lru_cache(maxsize=256)
+def _scaled_circle(points, radius, vectorised):
+    cos_t, sin_t = _unit_circle(points)
+    if np is not None:
+        xs, ys = cos_t * radius, sin_t * radius
+        return (xs, ys) if vectorised else (xs.tolist(), ys.tolist())
+    return [c * radius for c in cos_t], [s * radius for s in sin_t]
+
+
+def _to_points(center, xs, ys):
+    """Translate and truncate to int like the original `int(cx + r*cos(a))`."""
+    cx, cy = center
+    if np is not None and not isinstance(xs, list):
+        return list(zip((xs + cx).astype(int).tolist(), (ys + cy).astype(int).tolist()))
+    return [(int(cx + x), int(cy + y)) for x, y in zip(xs, ys)]
+
+
+def _rotated(points, radius, angle_deg, idx):
+    """Table entries `idx` of a `points`-step circle of `radius`, turned by `angle_deg`."""
+    vectorised = np is not None and len(idx) >= _NUMPY_MIN_POINTS
+    xs, ys = _scaled_circle(points, radius, vectorised)
+    shift = angle_deg * points / 360.0
+    if shift == int(shift):
+        # Angle lands on a table step: rotation is just an index shift
+        if vectorised:
+            k = (np.asarray(idx) + int(shift)) % points
+            return xs[k], ys[k]
+        k = [(i + int(shift)) % points for i in idx]
+        return [xs[i] for i in k], [ys[i] for i in k]
+
+    c, s = math.cos(math.radians(angle_deg)), math.sin(math.radians(angle_deg))
+    if vectorised:
+        k = np.asarray(idx) % points
+        bx, by = xs[k], ys[k]
+        return bx * c - by * s, bx * s + by * c
+    k = [i % points for i in idx]
+    return ([xs[i] * c - ys[i] * s for i in k],
+            [xs[i] * s + ys[i] * c for i in k])
+
+
+@lru_cache(maxsize=512)
+def ring_points(center, radius, count, angle_deg=0.0, offset=0.0):
+    """
+    `count` evenly spaced points at (i + offset) * 360/count + angle_deg.
+    Used for radial lines, icon positions and the ribbon dots/arrows; results
+    are memoised, so a wheel standing still costs a dictionary lookup.
+    """
+    xs, ys = _rotated(count, radius, angle_deg + offset * 360.0 / count, range(count))
+    return tuple(_to_points(center, xs, ys))
+
+
+def segment_arc(center, radius, num_segments, steps, index, angle_deg=0.0):
+    """The steps+1 arc points of segment `index` (shared table for all segments)."""
+    start = index * steps
+    xs, ys = _rotated(num_segments * steps, radius, angle_deg, range(start, start + steps + 1))
+    return _to_points(center, xs, ys)
+
+
+def segment_polygons(center, radius, num_segments, steps, angle_deg=0.0):
+    """Pie-slice polygons ([center] + arc) for every segment of the wheel."""
+    points = num_segments * steps
+    xs, ys = _rotated(points, radius, angle_deg, range(points + 1))
+    ring = _to_points(center, xs, ys)
+    center = tuple(center)
+    return [[center] + ring[i * steps:(i + 1) * steps + 1] for i in range(num_segments)]
+
+
+def arc_points(center, radius, start_deg, sweep_deg, points_per_circle=360):
+    """
+    Points along an arc starting at `start_deg` and sweeping `sweep_deg`
+    (negative sweeps run counter-clockwise), sampled from the table.
+    """
+    n = int(abs(sweep_deg) * points_per_circle / 360.0)
+    if n < 1:
+        return []
+    direction = 1 if sweep_deg > 0 else -1
+    idx = [k * direction for k in range(n + 1)]
+    xs, ys = _rotated(points_per_circle, radius, start_deg, idx)
+    return _to_points(center, xs, ys)
+
+
+@lru_cache(maxsize=64)
+def chip_stripes(radius, outer_r, inner_r, count, width_deg):
+    """
+    Quads for the `count` stripes of a chip drawn on a (2*radius)² surface:
+    outer edge at `outer_r`, inner edge at `inner_r`, each `width_deg` wide.
+    """
+    half = width_deg / 2
+    center = (radius, radius)
+    o_plus  = ring_points(center, outer_r, count, half)
+    o_minus = ring_points(center, outer_r, count, -half)
+    i_minus = ring_points(center, inner_r, count, -half)
+    i_plus  = ring_points(center, inner_r, count, half)
+    return tuple(tuple(q) for q in zip(o_plus, o_minus, i_minus, i_plus))
+
+
+if __name__ == "__main__":
+    import timeit
+
+    CENTER, R, SEGMENTS, STEPS = (400, 400), 324, 12, 30
+
+    def loop_segments(ang):
+        rad = math.radians(ang)
+        polys = []
+        for i in range(SEGMENTS):
+            start = math.radians(i * 360 / SEGMENTS) + rad
+            end = start + math.radians(360 / SEGMENTS)
+            pts = [CENTER]
+            for s in range(STEPS + 1):
+                a = start + (end - start) * (s / STEPS)
+                pts.append((int(CENTER[0] + R * math.cos(a)), int(CENTER[1] + R * math.sin(a))))
+            polys.append(pts)
+        return polys
+
+    def loop_icons(ang):
+        rad = math.radians(ang)
+        out = []
+        for i in range(SEGMENTS):
+            a = math.radians((i + 0.5) * 360 / SEGMENTS) + rad
+            out.append((int(CENTER[0] + R * math.cos(a)), int(CENTER[1] + R * math.sin(a))))
+        return out
+
+    def loop_stripes():
+        out = []
+        for i in range(8):
+            a, half = math.radians(i * 45), math.radians(10)
+            out.append([(R + int((R - 1) * math.cos(a + half)), R + int((R - 1) * math.sin(a + half))),
+                        (R + int((R - 1) * math.cos(a - half)), R + int((R - 1) * math.sin(a - half))),
+                        (R + int(R * 0.7 * math.cos(a - half)), R + int(R * 0.7 * math.sin(a - half))),
+                        (R + int(R * 0.7 * math.cos(a + half)), R + int(R * 0.7 * math.sin(a + half)))])
+        return out
+
+    cases = [
+        ("segments, step angle",   lambda: loop_segments(37.0),
+                                   lambda: segment_polygons(CENTER, R, SEGMENTS, STEPS, 37.0)),
+        ("segments, any angle",    lambda: loop_segments(37.3),
+                                   lambda: segment_polygons(CENTER, R, SEGMENTS, STEPS, 37.3)),
+        ("icon positions",         lambda: loop_icons(37.3),
+                                   lambda: ring_points.__wrapped__(CENTER, R, SEGMENTS, 37.3, offset=0.5)),
+        ("icon positions, still",  lambda: loop_icons(37.3),
+                                   lambda: ring_points(CENTER, R, SEGMENTS, 37.3, offset=0.5)),
+        ("chip stripes",           loop_stripes,
+                                   lambda: chip_stripes.__wrapped__(R, R - 1, int(R * 0.7), 8, 20)),
+        ("chip stripes, cached",   loop_stripes,
+                                   lambda: chip_stripes(R, R - 1, int(R * 0.7), 8, 20)),
+    ]
+    print(f"numpy: {'yes' if np is not None else 'no'}")
+    for name, old, new in cases:
+        n = 2000
+        t_old = timeit.timeit(old, number=n) / n * 1e6
+        t_new = timeit.timeit(new, number=n) / n * 1e6
+        print(f"{name:<24} loops {t_old:8.1f} us   tables {t_new:8.1f} us   x{t_old / t_new:.1f}")
@@ -0,0 +1,313 @@
+"""
+When to send the next dashboard poll.
+
+api_loop used to poll every 2 seconds all cycle long: 60 requests per
+2-minute cycle, 43,200 per terminal per day, nearly all of them returning
+what the last one did. What the poll brings in changes at a few known
+moments: results and settled tickets at the spin, and a new or claimed
+ticket right after this terminal bets or claims. PollPolicy polls fast
+around those and slowly the rest of the time:
+
+    spin     SPIN_BEFORE s before the cycle ends to SPIN_AFTER s after,
+             every SPIN_INTERVAL s
+    action   ACTION_WINDOW s after `note_action()` (a bet or claim went
+             through), every ACTION_INTERVAL s; note_action also wakes
+             a pending `wait()`, so the first of these polls goes at once
+    open     otherwise (betting open), every OPEN_INTERVAL s, but the
+             open-phase wait never runs past the start of the spin window
+
+Each delay is jittered by ±JITTER so a fleet of terminals on the same
+cycle clock doesn't poll in lockstep. After failed polls the delay is
+at least a backoff that starts at SPIN_INTERVAL and doubles per failure
+in a row up to ERROR_CAP, drawn from its upper half ("equal jitter");
+the first success resets it.
+
+While a push stream is up (`set_push(True)`, see push_client) there is
+nothing to poll for: `next_delay()` returns None, so `wait()` blocks
+until the stream drops and `set_push(False)` wakes it to poll at once.
+
+`record()` counts the polls actually sent per cycle and per phase;
+`stats()` / `report()` summarise them.
+
+    python poll_policy.py --cycles 720
+
+simulates a day of cycles with bets, claims and settlements, and compares
+requests per cycle and how stale each change is when it is first seen,
+fixed 2-second polling against this policy. With --check it also exits 1
+unless the policy sends at least CHECK_SAVING fewer polls and sees settled
+tickets and this terminal's own bets and claims no later (mean and p95,
+within CHECK_SLACK s) than fixed polling; the simulation is seeded, so the
+result is repeatable.
+"""
+import random
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+CYCLE_DURATION   = 120      # seconds, as in main_app
+OPEN_INTERVAL    = 10.0     # seconds between polls while betting is open
+SPIN_INTERVAL    = 2.0      # ... around the spin, as before
+ACTION_INTERVAL  = 2.0      # ... right after a bet or claim
+SPIN_BEFORE      = 6.0      # spin window: from before the cycle ends (result at 5 s) ...
+SPIN_AFTER       = 15.0     # ... to after it (spin 4 s, blink 5 s, win at 5 s)
+ACTION_WINDOW    = 6.0
+JITTER           = 0.1      # ± fraction of each delay
+ERROR_CAP        = 30.0     # longest wait after failures
+CYCLES_KEPT      = 30       # recent cycles kept for stats()
+PHASES = ("open", "spin", "action")
+
+
+class PollPolicy:
+    def __init__(self, open_interval=OPEN_INTERVAL, spin_interval=SPIN_INTERVAL,
+                 action_interval=ACTION_INTERVAL, spin_before=SPIN_BEFORE, spin_after=SPIN_AFTER,
+                 action_window=ACTION_WINDOW, jitter=JITTER, error_cap=ERROR_CAP,
+                 cycle=CYCLE_DURATION, clock=time.monotonic, rng=None):
+        self.open_interval = open_interval
+        self.spin_interval = spin_interval
+        self.action_interval = action_interval
+        self.spin_before = spin_before
+        self.spin_after = spin_after
+        self.action_window = action_window
+        self.jitter = jitter
+        self.error_cap = error_cap
+        self.cycle = cycle
+        self.clock = clock              # for the action window only
+        self.rng = rng or random.Random()
+        self._action_at = None
+        self._errors = 0                # failed polls in a row
+        self.push_up = False            # a push stream is delivering updates
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._cycles = OrderedDict()    # cycle start -> [polls, failures]
+        self._phases = dict.fromkeys(PHASES, 0)
+
+    def phase(self, to_end):
+        """Phase for a poll `to_end` seconds before the current cycle ends."""
+        if self._action_at is not None and self.clock() - self._action_at < self.action_window:
+            return "action"
+        if to_end <= self.spin_before or to_end > self.cycle - self.spin_after:
+            return "spin"
+        return "open"
+
+    def next_delay(self, to_end):
+        """
+        Seconds to wait before the next poll, `to_end` seconds before the
+        cycle ends; None (no poll) while the push stream is up.
+        """
+        if self.push_up:
+            return None
+        phase = self.phase(to_end)
+        interval = {"open": self.open_interval, "spin": self.spin_interval,
+                    "action": self.action_interval}[phase]
+        delay = interval * self.rng.uniform(1 - self.jitter, 1 + self.jitter)
+        if phase == "open":
+            # Land in the spin window's first interval, spread over it
+            to_window = max(0.0, to_end - self.spin_before)
+            delay = min(delay, to_window + self.rng.uniform(0, self.spin_interval))
+        if self._errors:
+            backoff = min(self.error_cap, self.spin_interval * 2 ** self._errors)
+            delay = max(delay, self.rng.uniform(backoff / 2, backoff))
+        return delay
+
+    def note_action(self):
+        """A bet or claim went through: poll now and often for a while."""
+        self._action_at = self.clock()
+        self._wake.set()
+
+    def set_push(self, up):
+        """The push stream came up or went down; polling resumes at once when down."""
+        self.push_up = up
+        if not up:
+            self._wake.set()
+
+    def wait(self, delay):
+        """Sleep up to `delay` seconds (None: until woken); returns early (True) on note_action()."""
+        woken = self._wake.wait(delay)
+        self._wake.clear()
+        return woken
+
+    def record(self, cycle_start, phase, ok):
+        """Count one poll sent in `phase` of the cycle starting at `cycle_start`."""
+        self._errors = 0 if ok else self._errors + 1
+        with self._lock:
+            counts = self._cycles.get(cycle_start)
+            if counts is None:
+                counts = self._cycles[cycle_start] = [0, 0]
+                while len(self._cycles) > CYCLES_KEPT:
+                    self._cycles.popitem(last=False)
+            counts[0] += 1
+            counts[1] += not ok
+            self._phases[phase] += 1
+
+    def stats(self):
+        """
+        Polls per finished cycle (mean / min / max over the last CYCLES_KEPT),
+        failures in them, and polls per phase since start.
+        """
+        with self._lock:
+            done = list(self._cycles.values())[:-1]     # the last one is still running
+            phases = dict(self._phases)
+        polls = [n for n, _ in done]
+        return {
+            "cycles":          len(done),
+            "polls_per_cycle": round(sum(polls) / len(polls), 1) if polls else 0.0,
+            "min":             min(polls, default=0),
+            "max":             max(polls, default=0),
+            "failures":        sum(f for _, f in done),
+            "phases":          phases,
+        }
+
+    def report(self):
+        """One-line summary of polls per cycle."""
+        s = self.stats()
+        if not s["cycles"]:
+            return "poll: no full cycle yet"
+        phases = ", ".join(f"{n} {p}" for p, n in s["phases"].items())
+        return (f"poll: {s['polls_per_cycle']} polls/cycle (min {s['min']}, max {s['max']}) "
+                f"over {s['cycles']} cycles, {s['failures']} failed; {phases}")
+
+
+policy = PollPolicy()
+
+
+# ─── Simulation ───────────────────────────────────────────────────────────────
+
+def _changes(cycles, rng, bets_per_cycle, claim_rate, rtt):
+    """
+    Server-side changes the poll has to bring in, as (time, kind), plus the
+    times this terminal learns its own bet or claim went through.
+    """
+    changes, actions = [], []
+    for k in range(cycles):
+        start, end = k * CYCLE_DURATION, (k + 1) * CYCLE_DURATION
+        # Bets while betting is open (it closes 10 s before the spin)
+        n = sum(rng.random() < bets_per_cycle / 4 for _ in range(4))
+        for _ in range(n):
+            t = rng.uniform(start + 2, end - 10)
+            changes.append((t, "bet"))
+            actions.append(t + rtt)
+        # Results and settled tickets, just after the cycle ends
+        changes.append((end + rng.uniform(0, 1), "settle"))
+        if n and rng.random() < claim_rate:
+            t = end + rng.uniform(10, 60)
+            changes.append((t, "claim"))
+            actions.append(t + rtt)
+    changes.sort()
+    actions.sort()
+    return changes, actions
+
+
+def simulate(cycles=720, adaptive=True, seed=0, bets_per_cycle=1.0, claim_rate=0.3,
+             rtt=0.25, error_rate=0.02):
+    """
+    Run `cycles` cycles of polling on a simulated clock; returns the poll
+    times and, per kind of change, the seconds from each change until a
+    successful poll read it. Without `adaptive`, polls every 2 s after the
+    previous reply, as the old api_loop did.
+    """
+    import bisect
+
+    rng = random.Random(seed)
+    changes, actions = _changes(cycles, rng, bets_per_cycle, claim_rate, rtt)
+    now = [0.0]
+    pol = PollPolicy(clock=lambda: now[0], rng=random.Random(seed + 1))
+    horizon = cycles * CYCLE_DURATION
+    polls, seen = [], []            # send times; read times of successful polls
+    next_action = 0
+    t = 0.0
+    while t < horizon:
+        now[0] = t
+        cycle_start = t - t % CYCLE_DURATION
+        phase = pol.phase(cycle_start + CYCLE_DURATION - t)
+        ok = rng.random() >= error_rate
+        polls.append(t)
+        if ok:
+            seen.append(t + rtt / 2)        # the server reads mid-round-trip
+        t += rtt
+        now[0] = t
+        if not adaptive:
+            t += 2.0
+            continue
+        pol.record(cycle_start, phase, ok)
+        # Actions already noted while this poll was out take effect now
+        while next_action < len(actions) and actions[next_action] <= t:
+            pol.note_action()
+            next_action += 1
+        wake = t + pol.next_delay(t - t % CYCLE_DURATION + CYCLE_DURATION - t)
+        if next_action < len(actions) and actions[next_action] < wake:
+            # note_action() ends the wait early
+            wake = actions[next_action]
+            now[0] = wake
+            pol.note_action()
+            next_action += 1
+        t = wake
+
+    staleness = {}
+    for tc, kind in changes:
+        i = bisect.bisect_left(seen, tc)
+        if i < len(seen):
+            staleness.setdefault(kind, []).append(seen[i] - tc)
+    return polls, staleness
+
+
+CHECK_SAVING = 0.4      # --check: least fraction of polls saved
+CHECK_SLACK  = 0.25     # --check: seconds staleness may exceed fixed polling's
+
+
+def _mean_p95(values):
+    values = sorted(values)
+    n = len(values)
+    return sum(values) / n, values[min(n - 1, n * 95 // 100)]
+
+
+def check(fixed, adaptive):
+    """Failures of the adaptive simulate() result against the fixed one, as messages."""
+    failures = []
+    saving = 1 - len(adaptive[0]) / len(fixed[0])
+    if saving < CHECK_SAVING:
+        failures.append(f"only {saving:.0%} fewer polls (want {CHECK_SAVING:.0%})")
+    for kind in ("settle", "bet", "claim"):
+        if kind not in fixed[1]:
+            continue
+        for label, old, new in zip(("mean", "p95"), _mean_p95(fixed[1][kind]), _mean_p95(adaptive[1][kind])):
+            if new > old + CHECK_SLACK:
+                failures.append(f"{kind} {label} seen after {new:.2f} s, fixed polling {old:.2f} s")
+    return failures
+
+
+def _summary(values):
+    values = sorted(values)
+    n = len(values)
+    return (f"mean {sum(values) / n:5.2f} s  p95 {values[min(n - 1, n * 95 // 100)]:5.2f} s  "
+            f"max {values[-1]:5.2f} s")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Simulate fixed vs adaptive dashboard polling.")
+    parser.add_argument("--cycles", type=int, default=720, help="2-minute cycles to simulate (720 = a day)")
+    parser.add_argument("--bets", type=float, default=1.0, help="bets per cycle")
+    parser.add_argument("--errors", type=float, default=0.02, help="fraction of polls that fail")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--check", action="store_true",
+                        help="exit 1 unless the policy polls less without seeing changes later")
+    args = parser.parse_args()
+
+    results = {}
+    for adaptive in (False, True):
+        results[adaptive] = simulate(args.cycles, adaptive, args.seed, args.bets, error_rate=args.errors)
+    for adaptive, (polls, staleness) in results.items():
+        print(f"{'adaptive' if adaptive else 'fixed 2 s':<9} {len(polls) / args.cycles:5.1f} polls/cycle "
+              f"({len(polls):,} over {args.cycles} cycles)")
+        for kind in ("settle", "bet", "claim"):
+            if kind in staleness:
+                print(f"    {kind:<7} seen after  {_summary(staleness[kind])}")
+    fixed, adaptive = len(results[False][0]), len(results[True][0])
+    print(f"{1 - adaptive / fixed:.0%} fewer requests")
+    if args.check:
+        failures = check(results[False], results[True])
+        for msg in failures:
+            print("FAIL:", msg)
+        sys.exit(1 if failures else 0)
@@ -0,0 +1,263 @@
+"""
+Server push channel for results, history and balance updates.
+
+Polling puts a floor under how soon the terminal sees a change, and every
+poll costs the server a request whether anything changed or not. When
+enabled (SPIN_PUSH=1), PushClient holds a server-sent events stream open
+instead:
+
+    GET app_events.php?user_id=<id>&cursor=<dashboard cursor>
+    Accept: text/event-stream
+
+    event: history   a dashboard-shaped body ("mapped" + "sync"), fed to
+                     DashboardSync.apply(): first the changes since the
+                     cursor sent (or the full history), then each change
+    event: result    the app_make_result.php reply for the coming spin,
+                     plus its "withdraw_time", ahead of the result fetch
+    event: balance   {"points": ...} whenever the balance changes
+    event: time      {"server_timestamp", "last_spin_timestamp"}, at least
+                     every 10 s; also the stream's heartbeat
+
+Every event also carries "changed_at", the server time of the change it
+reports; the delay from it to receipt is recorded per event kind (it
+includes any clock offset between server and terminal).
+
+History events are applied on the stream's thread, as the poll applies
+them on its own; the others go to `on_event(name, data)`. While events
+are arriving `on_state(True)` is called, and polling stands down (see
+poll_policy); when the stream drops, `on_state(False)` resumes polling at
+once. A history event the sync can't apply (DashboardSync dropped the
+cursor) also ends the stream, so the reconnect asks for the full history.
+
+Reconnects back off with full jitter, from BACKOFF_BASE up to BACKOFF_CAP,
+the backoff resetting once a connection has lasted STABLE_S. A stream
+silent for READ_TIMEOUT (several missed heartbeats) counts as dropped.
+
+    python push_client.py --changes 40
+
+runs dev_server in-process and measures how long new tickets take to
+reach a push subscriber and a 2-second poller.
+"""
+import json
+import random
+import threading
+import time
+from collections import deque
+
+import requests
+
+import http_client
+
+EVENTS_URL      = http_client.BASE_URL + "app_events.php"
+CONNECT_TIMEOUT = 3.05
+READ_TIMEOUT    = 25.0      # no bytes for this long: the stream is dead
+BACKOFF_BASE    = 0.5
+BACKOFF_CAP     = 30.0
+STABLE_S        = 10.0      # a connection this old resets the backoff
+LATENCY_WINDOW  = 200
+
+
+def parse_events(lines):
+    """Yield (event, data) from the lines of a text/event-stream."""
+    name, data = "message", []
+    for line in lines:
+        if not line:
+            if data:
+                yield name, "\n".join(data)
+            name, data = "message", []
+        elif line.startswith(":"):
+            continue                    # comment / keep-alive
+        else:
+            field, _, value = line.partition(":")
+            value = value[1:] if value.startswith(" ") else value
+            if field == "event":
+                name = value
+            elif field == "data":
+                data.append(value)
+
+
+class PushClient:
+    def __init__(self, user_id, dashboard, on_event, on_state=None, url=None):
+        self.user_id = user_id
+        self.dashboard = dashboard      # dashboard_sync.DashboardSync
+        self.on_event = on_event        # (name, data) for result / balance / time
+        self.on_state = on_state        # (up) when the stream comes up or drops
+        self.url = url or EVENTS_URL
+        self.up = False
+        self.connects = 0
+        self.last_error = None
+        self._session = requests.Session()     # the stream would pin a pooled connection
+        self._stop = threading.Event()
+        self._response = None
+        self._lock = threading.Lock()
+        self._events = {}               # name -> count
+        self._latency = {}              # name -> deque of seconds
+
+    def start(self):
+        threading.Thread(target=self._run, name="push", daemon=True).start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        resp = self._response
+        if resp is not None:
+            resp.close()                # unblocks the read
+
+    def _set_up(self, up):
+        if up != self.up:
+            self.up = up
+            if self.on_state is not None:
+                self.on_state(up)
+
+    def _run(self):
+        attempt = 0
+        while not self._stop.is_set():
+            t0 = time.monotonic()
+            try:
+                self._stream()
+            except Exception as e:
+                # a read cut short by stop() fails with whatever it hits
+                if not self._stop.is_set():
+                    self.last_error = e
+                    print("Push stream dropped:", e)
+            finally:
+                self._response = None
+                self._set_up(False)
+            if time.monotonic() - t0 >= STABLE_S:
+                attempt = 0
+            wait = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+            attempt += 1
+            self._stop.wait(wait)
+
+    def _stream(self):
+        params = {"user_id": str(self.user_id)}
+        if self.dashboard.cursor is not None:
+            params["cursor"] = self.dashboard.cursor
+        resp = self._response = self._session.get(
+            self.url, params=params, stream=True,
+            headers={"Accept": "text/event-stream"},
+            timeout=(CONNECT_TIMEOUT, READ_TIMEOUT))
+        with resp:
+            resp.raise_for_status()
+            self.connects += 1
+            # chunk_size=None: hand over each chunk (one event) as it arrives
+            for name, body in parse_events(resp.iter_lines(chunk_size=None, decode_unicode=True)):
+                received = time.time()
+                self._set_up(True)
+                if name == "history":
+                    data = self.dashboard.apply(body.encode())
+                    if self.dashboard.cursor is None:
+                        return          # out of step: reconnect for the full history
+                else:
+                    data = json.loads(body)
+                    self.on_event(name, data)
+                self._record(name, data, received)
+                if self._stop.is_set():
+                    return
+
+    def _record(self, name, data, received):
+        changed_at = data.get("changed_at")
+        with self._lock:
+            self._events[name] = self._events.get(name, 0) + 1
+            if changed_at:
+                lat = self._latency.get(name)
+                if lat is None:
+                    lat = self._latency[name] = deque(maxlen=LATENCY_WINDOW)
+                lat.append(received - changed_at)
+
+    def stats(self):
+        """Per event kind: count and change-to-receipt delay p50 / p95 in ms."""
+        with self._lock:
+            items = [(name, n, sorted(self._latency.get(name, ()))) for name, n in self._events.items()]
+        out = {}
+        for name, n, lat in items:
+            k = len(lat)
+            out[name] = {
+                "events": n,
+                "p50_ms": round(lat[k // 2] * 1000, 1) if k else 0.0,
+                "p95_ms": round(lat[min(k - 1, k * 95 // 100)] * 1000, 1) if k else 0.0,
+            }
+        return out
+
+    def report(self):
+        """One-line summary of the stream's connections and event delays."""
+        parts = [f"{name} {s['events']} (p50 {s['p50_ms']:.0f} ms)" for name, s in self.stats().items()]
+        state = "up" if self.up else "down"
+        return (f"push: {state}, {self.connects} connects; "
+                + (", ".join(parts) or "no events"))
+
+
+# ─── Push vs poll benchmark ───────────────────────────────────────────────────
+
+def bench(changes, poll_interval=2.0, seed=0):
+    """
+    New tickets at random intervals on an in-process dev_server; for each,
+    the seconds until a push subscriber and a `poll_interval` poller hold it.
+    """
+    import dev_server
+    import history_model
+    from dashboard_sync import DashboardSync
+    from ticket_store import TicketStore
+
+    class Watched(DashboardSync):
+        # Records when each ticket serial first arrives
+        def __init__(self):
+            super().__init__(TicketStore(), history_model.MarkerTotals())
+            self.first_seen = {}
+
+        def _apply(self, body):
+            data = super()._apply(body)
+            now = time.time()
+            for row in data.get("mapped") or ():
+                self.first_seen.setdefault(row["ticket_serial"], now)
+            return data
+
+    rng = random.Random(seed)
+    history = dev_server.History(rows=1000)
+    server = dev_server.serve(dev_server.Game(history))
+    base = f"http://127.0.0.1:{server.server_port}/api/"
+    http_client.ENDPOINTS["dashboard"] = http_client.ENDPOINTS["dashboard"]._replace(
+        url=base + "app_dashboard_data.php")
+
+    pushed, polled = Watched(), Watched()
+    push = PushClient(1, pushed, on_event=lambda name, data: None, url=base + "app_events.php").start()
+    done = threading.Event()
+
+    def poller():
+        while not done.is_set():
+            polled.poll(1)
+            done.wait(poll_interval)
+
+    threading.Thread(target=poller, daemon=True).start()
+    time.sleep(1.0)                     # both hold the initial history
+
+    made = {}
+    for _ in range(changes):
+        time.sleep(rng.uniform(0.3, 1.7))
+        with history.changed:
+            serial = history.add_ticket(10, time.time())
+            made[serial] = time.time()
+            history.changed.notify_all()
+    time.sleep(poll_interval + 0.5)
+    done.set()
+    push.stop()
+    dev_server.stop(server)
+
+    for label, sync in (("push", pushed), (f"poll every {poll_interval:g} s", polled)):
+        lat = sorted(sync.first_seen[s] - t for s, t in made.items() if s in sync.first_seen)
+        n = len(lat)
+        print(f"  {label:<16} {n}/{len(made)} seen   mean {sum(lat) / n * 1000:7.1f} ms   "
+              f"p50 {lat[n // 2] * 1000:7.1f} ms   p95 {lat[min(n - 1, n * 95 // 100)] * 1000:7.1f} ms   "
+              f"max {lat[-1] * 1000:7.1f} ms")
+    print(f"  {push.report()}")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Measure push vs poll delivery delay against dev_server.")
+    parser.add_argument("--changes", type=int, default=40, help="tickets to add, about one a second")
+    parser.add_argument("--interval", type=float, default=2.0, help="poll interval to compare with")
+    args = parser.parse_args()
+    print(f"{args.changes} new tickets; delay until each client holds it")
+    bench(args.changes, args.interval)
@@ -0,0 +1,283 @@
+"""
+Headless rendering benchmark.
+
+Times draw_wheel, draw_left_table and table_module.draw_table on their own
+and as a full frame, for several resolutions and UI states, using SDL's dummy
+video driver so it runs on build machines without a display:
+
+    python render_bench.py --out bench.json
+    python render_bench.py --baseline bench.json --threshold 10
+
+Each case is warmed up with one frame (its time is kept as first_ms, i.e. the
+cold cost of filling the caches) and then timed over --frames frames. Results
+are written as JSON keyed "<resolution>/<state>/<part>". With --baseline the
+p50 of every case is compared against the saved run, and the exit status is 1
+if any case got slower by more than --threshold percent.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+import app_globals
+import asset_cache
+import font_registry
+import layout
+import wheel_module
+import table_module
+from font_registry import get_font
+from ticket_store import TicketStore
+
+RESOLUTIONS = [(1366, 768), (1920, 1080), (2560, 1440), (3840, 2160)]
+STATES = ["idle", "spinning", "blinking", "bets12", "history500", "history50000", "scroll100000"]
+TABLE_ROWS = {"history500": 500, "history50000": 50000, "scroll100000": 100000}
+HISTORY_COLS = ["card_type", "ticket_serial", "bet_amount", "win_point", "claim_point",
+                "unclaim_point", "withdraw_time", "status", "action"]
+
+
+def _resource(name):
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+
+
+def _history_rows(n):
+    """View of synthetic mapped history rows cycling through bet placed / lost / won."""
+    rows = []
+    for i in range(n):
+        kind = i % 3
+        rows.append({
+            "ticket_serial": f"T{100000 + i}",
+            "bet_amount":    "10",
+            "claim_point":   ["", "0", "20"][kind],
+            "unclaim_point": ["", "0", "0"][kind],
+            "withdraw_time": f"{(i // 30) % 24:02d}:{(i * 2) % 60:02d}:00",
+            "game_result":   {"winning_number": i % 12},
+        })
+    tickets = TicketStore()
+    tickets.sync(rows)
+    return tickets.view()
+
+
+class Scene:
+    """Everything launch_main_app sets up before its loop, for one resolution."""
+
+    def __init__(self, size):
+        self.sw, self.sh = sw, sh = size
+        self.screen = pygame.display.set_mode(size)
+        font_registry.set_screen_size(size)
+        layout.set_screen_size(size)
+        self.lay = lay = layout.screen(size)
+        self.small_font = get_font("Arial", 20)
+        self.title_font = get_font("Arial", 32, bold=True)
+
+        self.label_size = lay.label_size
+        self.labels_kjq = {}
+        for key in ["K", "J", "Q"]:
+            name = f"golden-{key.lower()}"
+            asset_cache.register(name, pygame.image.load(_resource(f"{name}.png")).convert_alpha())
+            self.labels_kjq[key] = asset_cache.scaled(name, (self.label_size, self.label_size))
+
+        self.suit_size = lay.suit_size
+        self.labels_suits = {}
+        for suit in ["clubs", "diamond", "hearts", "spades"]:
+            name = f"golden-{suit}"
+            asset_cache.register(name, pygame.image.load(_resource(f"{name}.png")).convert_alpha())
+            self.labels_suits[suit.capitalize()] = asset_cache.scaled(name, (self.suit_size, self.suit_size))
+
+        self.outer_colors = [(150, 0, 0)] * lay.num_segments
+        self.mid_colors = [(0, 0, 100) if i % 2 == 0 else (0, 0, 50) for i in range(lay.num_segments)]
+
+        # Plain stand-in for the background image, plus the header bar
+        self.backdrop = pygame.Surface(size).convert()
+        self.backdrop.fill((40, 10, 30))
+        pygame.draw.rect(self.backdrop, (34, 21, 11), (0, 0, sw, lay.margin_top))
+        # Spin angles keep advancing across cases, so a case never replays
+        # angles an earlier one already left in the wheel's caches
+        self.spin_step = 0
+
+    def wheel(self, i, state):
+        spinning = state == "spinning"
+        blink = state == "blinking"
+        if spinning:
+            self.spin_step += 1
+        return wheel_module.draw_wheel(
+            self.screen, self.lay.wheel_center, self.lay.outer_radius,
+            self.lay.mid_radius, self.lay.inner_radius, self.lay.ribbon_thickness,
+            self.lay.num_segments, self.outer_colors, self.mid_colors,
+            self.labels_kjq, self.labels_suits,
+            (self.spin_step * 7.3) % 360 if spinning else 255.0,
+            is_spinning=spinning,
+            anim_offset=i * 0.08 if spinning else 0.0,
+            result_index=None if spinning else 3,
+            highlight_index=3 if blink else None,
+            highlight_on=blink and i % 2 == 0,
+        )
+
+    def board(self, i, state):
+        blink = state == "blinking"
+        return wheel_module.draw_left_table(
+            self.screen, 1000.0 + i / 60, self.labels_kjq, self.labels_suits,
+            x0=self.lay.board_origin[0], y0=self.lay.board_origin[1],
+            label_size=self.label_size, suit_size=self.suit_size,
+            small_font=self.small_font,
+            highlight_cell=(1, 4) if blink else None,
+            highlight_on=blink and i % 2 == 0,
+        )
+
+    def table(self, rows, state=None):
+        if state == "scroll100000":
+            # One wheel notch down per frame, so rows keep scrolling into view
+            table_module.scroll(-1)
+        table_module.draw_table(
+            self.screen, HISTORY_COLS, rows, "History",
+            self.title_font, self.small_font, self.sw,
+            labels_kjq=self.labels_kjq, labels_suits=self.labels_suits,
+        )
+
+    def frame(self, i, state, rows=None):
+        self.screen.blit(self.backdrop, (0, 0))
+        self.board(i, state)
+        self.wheel(i, state)
+        if rows is not None:
+            self.table(rows, state)
+
+
+def _setup_state(state):
+    app_globals.Withdraw_time = "12:34:00"
+    app_globals.history_json = [{"created_time": f"12:{i:02d}", "result_number": i % 12}
+                                for i in range(10)]
+    wheel_module.selected_chip = None
+    if state == "bets12":
+        wheel_module.placed_chips = {(r, c): 10 * (r + c) for r in range(1, 4) for c in range(1, 5)}
+    else:
+        wheel_module.placed_chips = {}
+    rows = None
+    if state in TABLE_ROWS:
+        rows = _history_rows(TABLE_ROWS[state])
+        # Scrolled to the middle of the history (rows are 50 px high)
+        table_module.scroll_to(len(rows) // 2 * 50)
+    return rows
+
+
+def _measure(fn, frames):
+    first = time.perf_counter()
+    fn(0)
+    first = (time.perf_counter() - first) * 1000
+    samples = []
+    for i in range(1, frames + 1):
+        t0 = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - t0) * 1000)
+    samples.sort()
+    n = len(samples)
+    return {
+        "first_ms": round(first, 3),
+        "mean_ms":  round(sum(samples) / n, 3),
+        "p50_ms":   round(samples[n // 2], 3),
+        "p95_ms":   round(samples[min(n - 1, n * 95 // 100)], 3),
+        "max_ms":   round(samples[-1], 3),
+    }
+
+
+def run(resolutions, states, frames):
+    results = {}
+    for size in resolutions:
+        scene = Scene(size)
+        res = f"{size[0]}x{size[1]}"
+        for state in states:
+            rows = _setup_state(state)
+            cases = {
+                "wheel": lambda i: scene.wheel(i, state),
+                "board": lambda i: scene.board(i, state),
+                "frame": lambda i: scene.frame(i, state, rows),
+            }
+            if rows is not None:
+                cases["table"] = lambda i: scene.table(rows, state)
+            for part, fn in cases.items():
+                key = f"{res}/{state}/{part}"
+                results[key] = _measure(fn, frames)
+                print(f"{key:<36} p50 {results[key]['p50_ms']:8.3f} ms  "
+                      f"p95 {results[key]['p95_ms']:8.3f} ms  first {results[key]['first_ms']:8.3f} ms")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Print p50 changes against `baseline`; returns the keys that regressed."""
+    regressed = []
+    print(f"\n{'case':<36} {'base':>9} {'now':>9} {'change':>8}")
+    for key, now in results.items():
+        base = baseline.get(key)
+        if base is None:
+            print(f"{key:<36} {'-':>9} {now['p50_ms']:9.3f}      new")
+            continue
+        change = (now["p50_ms"] - base["p50_ms"]) / base["p50_ms"] * 100 if base["p50_ms"] else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  SLOWER"
+            regressed.append(key)
+        elif change < -threshold:
+            flag = "  faster"
+        print(f"{key:<36} {base['p50_ms']:9.3f} {now['p50_ms']:9.3f} {change:+7.1f}%{flag}")
+    return regressed
+
+
+def _parse_size(text):
+    w, h = text.lower().split("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--resolutions", default=",".join(f"{w}x{h}" for w, h in RESOLUTIONS),
+                        help="comma-separated WxH list")
+    parser.add_argument("--states", default=",".join(STATES), help="comma-separated subset of: " + ", ".join(STATES))
+    parser.add_argument("--frames", type=int, default=30, help="timed frames per case")
+    parser.add_argument("--out", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="compare against a JSON file written by --out")
+    parser.add_argument("--threshold", type=float, default=10.0, help="p50 slowdown in %% counted as a regression")
+    args = parser.parse_args(argv)
+
+    states = args.states.split(",")
+    unknown = set(states) - set(STATES)
+    if unknown:
+        parser.error(f"unknown states: {', '.join(sorted(unknown))}")
+
+    pygame.init()
+
+    results = run([_parse_size(r) for r in args.resolutions.split(",")], states, args.frames)
+    report = {
+        "meta": {
+            "time":     time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python":   platform.python_version(),
+            "pygame":   pygame.version.ver,
+            "sdl":      ".".join(map(str, pygame.get_sdl_version())),
+            "platform": platform.platform(),
+            "driver":   os.environ.get("SDL_VIDEODRIVER"),
+            "frames":   args.frames,
+        },
+        "results": results,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nresults written to {args.out}")
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressed = compare(results, baseline["results"], args.threshold)
+        if regressed:
+            print(f"\n{len(regressed)} case(s) slower than the baseline by more than {args.threshold:g}%")
+            status = 1
+    pygame.quit()
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Small LRU container for pygame surfaces.
+
+Entries are evicted least-recently-used first once either the entry count
+or the total pixel-buffer size goes over its cap.
+"""
+from collections import OrderedDict
+
+
+def surface_bytes(surf):
+    """Approximate memory held by a surface's pixel buffer."""
+    return surf.get_pitch() * surf.get_height()
+
+
+class SurfaceCache:
+    def __init__(self, max_items=None, max_bytes=None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> (surface, size in bytes)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """Return the cached surface for `key` (marking it recently used) or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, key, surf):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes -= old[1]
+        size = surface_bytes(surf)
+        self._entries[key] = (surf, size)
+        self.bytes += size
+        self._evict()
+        return surf
+
+    def get_or_create(self, key, factory):
+        """Return the surface for `key`, building it with `factory()` on a miss."""
+        surf = self.get(key)
+        if surf is None:
+            surf = self.put(key, factory())
+        return surf
+
+    def _evict(self):
+        # Never evict the entry that was just inserted
+        while len(self._entries) > 1 and (
+            (self.max_items is not None and len(self._entries) > self.max_items) or
+            (self.max_bytes is not None and self.bytes > self.max_bytes)
+        ):
+            _, (_, size) = self._entries.popitem(last=False)
+            self.bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes = 0
+
+    def stats(self):
+        return {
+            "entries":   len(self._entries),
+            "bytes":     self.bytes,
+            "hits":      self.hits,
+            "misses":    self.misses,
+            "evictions": self.evictions,
+        }
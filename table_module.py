@@ -1,7 +1,135 @@
 import pygame
-import requests
+import http_client
 import json
 import app_globals as G   
+import asset_cache
+import hit_index
+import net_executor
+import poll_policy
+from surface_cache import SurfaceCache
+from text_cache import render_text
+
+# --------------------------------------------------
+# Row cache + scrolling
+# --------------------------------------------------
+# Each row is rendered once into a surface keyed by the table style, its
+# stripe, its record's key (ticket_serial + a hash of the raw values) and
+# any unresolved claim on it, so a row is redrawn only when those change.
+# The LRU holds ROW_CACHE_SCREENS screenfuls of rows; the rows evicted
+# first are the ones scrolled furthest out of view. Everything else on the
+# table screen is static and cached as one surface.
+ROW_CACHE_SCREENS = 3
+SCROLL_STEP_PX    = 50      # per mouse-wheel notch
+SCROLL_EASE       = 0.35    # share of the remaining scroll distance covered per frame
+
+_row_cache    = SurfaceCache(max_items=64)
+# Action button label / colour while a claim is unresolved (see _claim_state)
+_CLAIM_BUTTONS = {
+    "pending": ("Claiming...", (120,120,60)),
+    "failed":  ("Retry",       (170,40,40)),
+    "claimed": ("Claimed",     (100,100,100)),
+}
+_chrome_cache = SurfaceCache(max_items=3)     # one per table screen (history, summary, simple)
+
+def scroll(notches):
+    """Scroll by mouse-wheel notches (positive = up, as in MOUSEWHEEL.y)."""
+    draw_table.scroll_target = getattr(draw_table, "scroll_target", 0) - notches * SCROLL_STEP_PX
+
+
+def scroll_to(px):
+    """Jump to a pixel offset without easing (clamped on the next draw)."""
+    draw_table.scroll_target = draw_table.scroll_px = px
+
+
+def scrolling():
+    """True while the table is still easing toward its scroll target."""
+    return getattr(draw_table, "scroll_px", 0) != getattr(draw_table, "scroll_target", 0)
+
+
+def _render_row(surf, rec, cols, cw, tw, row_height, bg,
+                font_cells, labels_kjq, labels_suits, WHITE, claim=None):
+    """One table row (stripe, cells, action button) on a tw × row_height surface."""
+    out = pygame.Surface((tw, row_height), 0, surf)
+    out.fill(bg)
+    text_y = (row_height-font_cells.get_height())//2
+
+    # draw cells
+    for cidx, key in enumerate(cols):
+        cell_x = cidx*cw
+        kl = key.lower()
+
+        # Marker Card images
+        if kl == "card_type" and labels_kjq and labels_suits:
+            if rec.card is None:
+                out.blit(render_text(font_cells, "NA", WHITE), (cell_x+5, text_y))
+            else:
+                face, suit = rec.face, rec.suit
+                img1, img2 = labels_kjq[face], labels_suits[suit]
+                h_img = row_height - 16
+                w1 = img1.get_width()*h_img//img1.get_height()
+                w2 = img2.get_width()*h_img//img2.get_height()
+                i1 = asset_cache.scaled(f"rank-{face}", (w1,h_img), source=img1)
+                i2 = asset_cache.scaled(f"suit-{suit}", (w2,h_img), source=img2)
+                total_w = w1 + 4 + w2
+                x0 = cell_x + (cw - total_w)//2
+                y0 = (row_height - h_img)//2
+                out.blit(i1,(x0,y0))
+                out.blit(i2,(x0+w1+4,y0))
+
+        # Win_point column
+        elif kl == "win_point":
+            out.blit(render_text(font_cells, rec.win_point, WHITE), (cell_x+5, text_y))
+
+        # Status column
+        elif kl == "status":
+            out.blit(render_text(font_cells, rec.status, WHITE), (cell_x+5, text_y))
+
+        # Action button
+        elif kl == "action":
+            bw, bh = cw-10, row_height-10
+            bx, by = cell_x+5, 5
+            label, color = _CLAIM_BUTTONS.get(claim) or (
+                rec.action, (0,150,0) if rec.claimable else (100,100,100))
+            pygame.draw.rect(out, color, (bx,by,bw,bh), border_radius=6)
+            txt_s = render_text(font_cells, label, WHITE)
+            out.blit(txt_s, (bx + (bw-txt_s.get_width())//2,
+                             by + (bh-txt_s.get_height())//2))
+
+        # default text
+        else:
+            out.blit(render_text(font_cells, rec.text(kl), WHITE), (cell_x+5, text_y))
+    return out
+
+
+def _render_chrome(surf, cols, title, font_titles, font_cells, sw, m, tw, cw, visible_rows,
+                   TABLE_BG, GRID, WHITE, YELLOW, ORANGE, row_height, header_height):
+    """Full-size surface with everything but the rows: background, title, headers, grid."""
+    out = pygame.Surface(surf.get_size(), 0, surf)
+
+    # background + title
+    out.fill(TABLE_BG)
+    title_surf = render_text(font_titles, title, ORANGE)
+    out.blit(title_surf, (sw//2 - title_surf.get_width()//2, m))
+
+    # header labels
+    for i, h in enumerate(cols):
+        display = "Marker Card" if h.lower() == "card_type" else h.title()
+        x = m + i*cw
+        pygame.draw.rect(out, YELLOW, (x, m+header_height, cw, header_height))
+        out.blit(render_text(font_cells, display, WHITE),
+                 (x+5, m+header_height + (header_height-font_cells.get_height())//2))
+
+    # grid lines
+    start_y = m + header_height*2
+    for r in range(visible_rows+1):
+        y = start_y + r*row_height
+        pygame.draw.line(out, GRID, (m, y), (m+tw, y))
+    for c in range(len(cols)+1):
+        x = m + c*cw
+        pygame.draw.line(out, GRID, (x, start_y),
+                         (x, start_y + visible_rows*row_height))
+    return out
+
 
 def draw_table(surf, cols, rows, title,
                font_titles, font_cells, sw,
@@ -16,221 +144,182 @@ def draw_table(surf, cols, rows, title,
                STRIPE2=(65, 65, 65),
                row_height=50,
                header_height=50):
+    """
+    Draw `rows` (history_model.HistoryRecord) with only the rows in view,
+    each blitted from the row cache. The view scrolls by pixels: `scroll_px` eases toward
+    `scroll_target`, which the mouse wheel moves (see scroll()).
+    """
 
     # persistent scroll + button state
-    if not hasattr(draw_table, "scroll_offset"):
-        draw_table.scroll_offset = 0
+    if not hasattr(draw_table, "scroll_px"):
+        draw_table.scroll_px = 0
+        draw_table.scroll_target = getattr(draw_table, "scroll_target", 0)
+        draw_table.scroll_offset = 0    # first visible row
     if not hasattr(draw_table, "buttons"):
         draw_table.buttons = []
+        draw_table.hits = hit_index.HitIndex()
+        draw_table.hits_key = None
 
     draw_table.buttons.clear()
 
-    # handle scroll wheel
+    # handle scroll wheel (events the main loop hasn't already taken)
     for ev in pygame.event.get(pygame.MOUSEWHEEL):
-        draw_table.scroll_offset = max(0, draw_table.scroll_offset - ev.y)
+        scroll(ev.y)
 
     # layout
     tw = sw - 2*m
     cw = tw // len(cols)
     surf_h = surf.get_height()
     visible_rows = (surf_h - (m + header_height*2 + m)) // row_height
-    draw_table.scroll_offset = min(draw_table.scroll_offset,
-                                   max(0, len(rows) - visible_rows))
+    start_y = m + header_height*2
+    view = pygame.Rect(m, start_y, tw, max(0, visible_rows)*row_height)
 
-    # background + title
-    surf.fill(TABLE_BG)
-    title_surf = font_titles.render(title, True, ORANGE)
-    surf.blit(title_surf, (sw//2 - title_surf.get_width()//2, m))
+    # ease toward the target offset, both clamped to the last full page
+    max_px = max(0, len(rows)*row_height - view.height)
+    target = draw_table.scroll_target = min(max(0, draw_table.scroll_target), max_px)
+    px = min(max(0, draw_table.scroll_px), max_px)
+    if abs(target - px) < 1:
+        px = target
+    else:
+        px += (target - px) * SCROLL_EASE
+    draw_table.scroll_px = px
+    top = int(px)
+    first = draw_table.scroll_offset = top // row_height
 
-    # header labels
-    for i, h in enumerate(cols):
-        display = "Marker Card" if h.lower() == "card_type" else h.title()
-        x = m + i*cw
-        pygame.draw.rect(surf, YELLOW, (x, m+header_height, cw, header_height))
-        surf.blit(font_cells.render(display, True, WHITE),
-                  (x+5, m+header_height + (header_height-font_cells.get_height())//2))
+    # background, title, header labels and grid lines: static per table style
+    chrome_key = (surf.get_size(), tuple(cols), title, sw, m, row_height, header_height,
+                  id(font_titles), id(font_cells), TABLE_BG, GRID, WHITE, YELLOW, ORANGE)
+    chrome = _chrome_cache.get_or_create(chrome_key, lambda: _render_chrome(
+        surf, cols, title, font_titles, font_cells, sw, m, tw, cw, visible_rows,
+        TABLE_BG, GRID, WHITE, YELLOW, ORANGE, row_height, header_height))
 
-    # grid lines
-    start_y = m + header_height*2
-    for r in range(visible_rows+1):
-        y = start_y + r*row_height
-        pygame.draw.line(surf, GRID, (m, y), (m+tw, y))
-    for c in range(len(cols)+1):
-        x = m + c*cw
-        pygame.draw.line(surf, GRID, (x, start_y),
-                         (x, start_y + visible_rows*row_height))
+    # Rows are opaque, so only the chrome around the part of the view they
+    # cover is copied: above, below, left and right of it
+    shown = max(0, min(len(rows) - first, visible_rows + 1))
+    covered = pygame.Rect(m, start_y, tw, min(view.height, shown*row_height - (top - first*row_height)))
+    sw_, sh_ = surf.get_size()
+    for area in ((0, 0, sw_, covered.top),
+                 (0, covered.bottom, sw_, sh_ - covered.bottom),
+                 (0, covered.top, covered.left, covered.height),
+                 (covered.right, covered.top, sw_ - covered.right, covered.height)):
+        surf.blit(chrome, area[:2], area)
 
-    # draw each visible row
-    for idx in range(visible_rows):
-        ridx = draw_table.scroll_offset + idx
-        if ridx >= len(rows):
-            break
-        row = rows[ridx]
-        row_y = start_y + idx*row_height
-        bg = STRIPE1 if idx % 2 == 0 else STRIPE2
-        pygame.draw.rect(surf, bg, (m, row_y, tw, row_height))
-
-        # parse numeric points
-        def to_val(v):
-            try:
-                return float(v) if v not in (None, '', 'NA') else None
-            except:
-                return None
-        cp = to_val(row.get('claim_point'))
-        up = to_val(row.get('unclaim_point'))
-
-        # status logic
-        if cp is None and up is None:
-            status = "Bet Placed"
-        elif cp == 0 and up == 0:
-            status = "Loose"
-        elif (cp or 0) > 0 or (up or 0) > 0:
-            status = "WIN"
-        else:
-            status = "Loose"
-
-        # draw cells
-        for cidx, key in enumerate(cols):
-            cell_x = m + cidx*cw
-            kl = key.lower()
-
-            # Marker Card images
-            if kl == "card_type" and labels_kjq and labels_suits:
-                if status == "Bet Placed":
-                    txt_val = "NA"
-                    surf.blit(font_cells.render(txt_val, True, WHITE),
-                              (cell_x+5, row_y + (row_height-font_cells.get_height())//2))
-                else:
-                    gr = row.get('game_result', {})
-                    num = gr.get('winning_number') or gr.get('lose_number')
-                    try:
-                        ct = int(num)
-                    except:
-                        ct = None
-                    if ct is None:
-                        txt_val = "NA"
-                        surf.blit(font_cells.render(txt_val, True, WHITE),
-                                  (cell_x+5, row_y + (row_height-font_cells.get_height())//2))
-                    else:
-                        face = 'K' if ct < 4 else 'Q' if ct < 8 else 'J'
-                        suit_map = ['Spades','Diamond','Clubs','Hearts']
-                        suit = suit_map[ct % 4]
-                        img1, img2 = labels_kjq[face], labels_suits[suit]
-                        h_img = row_height - 16
-                        w1 = img1.get_width()*h_img//img1.get_height()
-                        w2 = img2.get_width()*h_img//img2.get_height()
-                        i1 = pygame.transform.smoothscale(img1,(w1,h_img))
-                        i2 = pygame.transform.smoothscale(img2,(w2,h_img))
-                        total_w = w1 + 4 + w2
-                        x0 = cell_x + (cw - total_w)//2
-                        y0 = row_y + (row_height - h_img)//2
-                        surf.blit(i1,(x0,y0))
-                        surf.blit(i2,(x0+w1+4,y0))
-
-            # Win_point column
-            elif kl == "win_point":
-                if cp is None and up is None:
-                    out = "NA"
-                elif cp == 0 and up == 0:
-                    out = "0"
-                elif cp and cp > 0:
-                    out = str(int(cp)) if cp.is_integer() else str(cp)
-                elif up and up > 0:
-                    out = str(int(up)) if up.is_integer() else str(up)
-                else:
-                    out = "0"
-                surf.blit(font_cells.render(out, True, WHITE),
-                          (cell_x+5, row_y + (row_height-font_cells.get_height())//2))
-
-            # Status column
-            elif kl == "status":
-                surf.blit(font_cells.render(status, True, WHITE),
-                          (cell_x+5, row_y + (row_height-font_cells.get_height())//2))
-
-            # Action button
-            elif kl == "action":
-                if (cp in (None,0)) and (up in (None,0)):
-                    label, off = "Unclaimable", True
-                elif up == 0 and cp and cp > 0:
-                    label, off = "Claimed", True
-                elif cp == 0 and up and up > 0:
-                    label, off = "Claim", False
-                else:
-                    label, off = "Unclaimable", True
-
-                bw, bh = cw-10, row_height-10
-                bx, by = cell_x+5, row_y+5
-                color = (100,100,100) if off else (0,150,0)
-                pygame.draw.rect(surf, color, (bx,by,bw,bh), border_radius=6)
-                txt_s = font_cells.render(label, True, WHITE)
-                surf.blit(txt_s, (bx + (bw-txt_s.get_width())//2,
-                                  by + (bh-txt_s.get_height())//2))
-
-                if not off:
-                    draw_table.buttons.append({
-                        'rect': pygame.Rect(bx,by,bw,bh),
-                        'ticket_serial': row.get('ticket_serial')
-                    })
-
-            # default text
-            else:
-                text = str(row.get(kl, ''))
-                surf.blit(font_cells.render(text, True, WHITE),
-                          (cell_x+5, row_y + (row_height-font_cells.get_height())//2))
-
-    # cursor change: pointer over any active button
-    mx, my = pygame.mouse.get_pos()
-    over = any(btn['rect'].collidepoint((mx,my)) for btn in draw_table.buttons)
-    if over:
-        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_HAND)
-    else:
-        pygame.mouse.set_cursor(pygame.SYSTEM_CURSOR_ARROW)
+    # visible rows (plus the one partly scrolled in at the bottom), from the cache
+    _row_cache.max_items = max(1, visible_rows + 1) * ROW_CACHE_SCREENS
+    style = (tuple(cols), cw, tw, row_height, id(font_cells),
+             id(labels_kjq), id(labels_suits), WHITE)
+    lower = [k.lower() for k in cols]
+    action_x = m + lower.index("action")*cw if "action" in lower else None
+
+    prev_clip = surf.get_clip()
+    surf.set_clip(view)
+    for ridx in range(first, min(len(rows), first + visible_rows + 1)):
+        rec = rows[ridx]
+        row_y = start_y + ridx*row_height - top
+        bg = STRIPE1 if ridx % 2 == 0 else STRIPE2
+        claim = _claim_state(rec) if action_x is not None else None
+        key = (style, bg, rec.key, claim)
+        row_surf = _row_cache.get(key)
+        if row_surf is None:
+            row_surf = _row_cache.put(key, _render_row(
+                surf, rec, cols, cw, tw, row_height, bg,
+                font_cells, labels_kjq, labels_suits, WHITE, claim))
+        surf.blit(row_surf, (m, row_y))
+
+        if action_x is not None and rec.claimable and claim in (None, "failed"):
+            rect = pygame.Rect(action_x+5, row_y+5, cw-10, row_height-10).clip(view)
+            if rect:
+                draw_table.buttons.append({
+                    'rect': rect,
+                    'ticket_serial': rec.ticket_serial
+                })
+    surf.set_clip(prev_clip)
+
+    # re-index the Claim buttons only when the visible set changed (scroll, new rows)
+    key = tuple((btn['rect'].topleft, btn['rect'].size, btn['ticket_serial'])
+                for btn in draw_table.buttons)
+    if key != draw_table.hits_key:
+        draw_table.hits = hit_index.HitIndex((btn['rect'], btn) for btn in draw_table.buttons)
+        draw_table.hits_key = key
+
+    # cursor change: pointer over any active button (set only when it changes)
+    over = draw_table.hits.hit(pygame.mouse.get_pos()) is not None
+    hit_index.cursor.set(pygame.SYSTEM_CURSOR_HAND if over else pygame.SYSTEM_CURSOR_ARROW)
 
 
 _claimed_tickets = set()
+_claims = {}                # ticket_serial -> "pending" / "failed" while a claim is unresolved
+
+
+def _claim_state(rec):
+    """Action button override for a claimable row: None, "pending", "failed" or "claimed"."""
+    if not rec.claimable:
+        return None
+    if rec.ticket_serial in _claimed_tickets:
+        # until the next poll turns the row into "Claimed"
+        return "claimed"
+    return _claims.get(rec.ticket_serial)
+
+
+def _send_claim(ts):
+    """Worker side of a Claim click."""
+    payload = {"ticket_serial": ts}
+    payload_json = json.dumps(payload)
+    headers = {
+        "Content-Type":   "application/json; charset=UTF-8",
+        "Content-Length": str(len(payload_json))
+    }
+    resp = http_client.post("claim_point", data=payload_json, headers=headers)
+    # if the server chokes, this will raise an HTTPError
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _claim_done(ts, data, error):
+    """Back on the UI thread once the claim call has finished."""
+    if error is not None:
+        print("Error claiming ticket:", error)
+        _claims[ts] = "failed"
+        G.message = f"Claim for ticket {ts} failed. Click Retry to try again."
+        G.message_time = pygame.time.get_ticks()
+        return
+    _claims.pop(ts, None)
+    poll_policy.policy.note_action()        # fetch the claimed ticket now
+
+    status = data.get('status')
+    if status == 'already_claimed':
+        # server‑side guard
+        #print(f"[DEBUG] Server says ticket {ts} already claimed.")
+        _claimed_tickets.add(ts)
+        return
+
+    if status != 'success':
+        #print("Claim failed:", data.get('message'))
+        return
+
+    # 3) SUCCESS → update globals, mark locally claimed
+    added = data.get('added_points', 0)
+    G.user_data_points += added
+    _claimed_tickets.add(ts)
+
 
 def handle_claim_click(pos):
     """Call from your main loop on left‐click to fire the Claim API."""
-    if not hasattr(draw_table, "buttons"):
+    if not hasattr(draw_table, "hits"):
+        return
+
+    btn = draw_table.hits.hit(pos)
+    if btn is None:
+        return
+
+    ts = btn['ticket_serial']
+
+    # 1) LOCAL GUARD: if we already claimed this ticket, or a claim is on the wire, stop here
+    if ts in _claimed_tickets or _claims.get(ts) == "pending":
+        #print(f"[DEBUG] Ticket {ts} already claimed locally – skipping.")
         return
 
-    for btn in draw_table.buttons:
-        if btn['rect'].collidepoint(pos):
-            ts = btn['ticket_serial']
-
-            # 1) LOCAL GUARD: if we already claimed this ticket, stop here
-            if ts in _claimed_tickets:
-                #print(f"[DEBUG] Ticket {ts} already claimed locally – skipping.")
-                return
-
-            # 2) BUILD & SEND
-            url     = "https://spintofortune.in/api/app_claim_point.php"
-            payload = {"ticket_serial": ts}
-            payload_json = json.dumps(payload)
-            headers = {
-                "Content-Type":   "application/json; charset=UTF-8",
-                "Content-Length": str(len(payload_json))
-            }
-
-            resp = requests.post(url, data=payload_json, headers=headers)
-            # if the server chokes, this will raise an HTTPError
-            resp.raise_for_status()
-
-            data = resp.json()
-            status = data.get('status')
-            if status == 'already_claimed':
-                # server‑side guard
-                #print(f"[DEBUG] Server says ticket {ts} already claimed.")
-                _claimed_tickets.add(ts)
-                return
-
-            if status != 'success':
-                #print("Claim failed:", data.get('message'))
-                return
-
-            # 3) SUCCESS → update globals, mark locally claimed
-            added = data.get('added_points', 0)
-            G.user_data_points += added
-            _claimed_tickets.add(ts)
-
-            #print(f"[DEBUG] HTTP {resp.status_code}: {resp.text!r}")
\ No newline at end of file
+    # 2) SEND on a worker; the row shows "Claiming..." until _claim_done
+    _claims[ts] = "pending"
+    net_executor.submit(_send_claim, ts, key=("claim", ts),
+                        on_done=lambda data, error: _claim_done(ts, data, error))
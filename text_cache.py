@@ -0,0 +1,32 @@
+"""
+LRU cache of rendered text surfaces.
+
+Labels, button captions and table cells are mostly the same strings every
+frame. `render_text()` keys the rendered surface by (font, text, color,
+antialias) and only calls `font.render` on a miss, so only strings that
+actually change get rasterised again. The cache holds at most
+TEXT_CACHE_MB of pixel data; `stats()` reports hits, misses and bytes held.
+"""
+from surface_cache import SurfaceCache
+
+TEXT_CACHE_MB = 8
+
+_texts = SurfaceCache(max_bytes=TEXT_CACHE_MB * 1024 * 1024)
+
+
+def render_text(font, text, color, antialias=True):
+    """Cached equivalent of `font.render(text, antialias, color)`."""
+    key = (font, text, tuple(color), antialias)
+    surf = _texts.get(key)
+    if surf is None:
+        surf = _texts.put(key, font.render(text, antialias, color))
+    return surf
+
+
+def clear():
+    _texts.clear()
+
+
+def stats():
+    """Hit/miss/eviction counters and bytes held by the text cache."""
+    return _texts.stats()
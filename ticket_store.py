@@ -0,0 +1,551 @@
+"""
+Columnar in-memory store for the ticket history.
+
+Instead of one JSON dict (plus a nested game_result dict) per ticket, the
+history is held in typed `array` columns, one slot per ticket: amounts as
+doubles (NaN where missing), the card numbers, a status code, the withdraw
+time in seconds of the day, and the display text of each field as an index
+into an interned StringTable, since bet amounts, points and withdraw times
+repeat across thousands of rows.
+
+`upsert()` / `apply()` / `sync()` add or update tickets by serial (kept
+as the server sent it, str or int) and report what changed, so callers
+can keep derived state (history_model.MarkerTotals) in step without
+rescanning. `select()` filters by status and withdraw time and `sums()`
+totals the amounts; both are vectorised with NumPy when it's installed.
+
+Rows sit in the columns in arrival order; a separate position column holds
+the server's order. A full `sync()` renumbers every row by its place in
+the list. `apply()` (a delta) keeps existing rows where they are and puts
+new tickets at the head or the tail, in the order they are listed, as the
+caller says (newest-first histories grow at the head).
+
+`view()` is a read-only sequence of history_model.HistoryRecords in server
+order over the store as it was when taken, which draw_table can render
+while the poll thread keeps writing: it holds its own row permutation,
+updates bump the row's version (part of the record key the row cache
+uses) and removals build fresh columns instead of shifting the ones a view
+may be reading.
+
+Run `python ticket_store.py` to compare memory and lookup time with a list
+of dicts.
+"""
+import math
+import sys
+import threading
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+import history_model
+
+# Status codes
+BET_PLACED, LOOSE, WIN = 0, 1, 2
+_STATUS_CODES = {history_model.BET_PLACED: BET_PLACED,
+                 history_model.LOOSE: LOOSE,
+                 history_model.WIN: WIN}
+
+NO_NUMBER = -1          # card number / withdraw time missing
+_NAN = float('nan')
+_RECORD_MEMO_MAX = 512
+
+
+class StringTable:
+    """
+    Interned strings: each distinct string is stored once and referred to
+    by index. Ticket serials go in as sent, so an int serial is an int here.
+    """
+
+    def __init__(self):
+        self.strings = []
+        self._ids = {}
+
+    def __len__(self):
+        return len(self.strings)
+
+    def __getitem__(self, sid):
+        return self.strings[sid]
+
+    def intern(self, s):
+        sid = self._ids.get(s)
+        if sid is None:
+            sid = self._ids[s] = len(self.strings)
+            self.strings.append(s)
+        return sid
+
+    def find(self, s):
+        """Index of `s`, or -1 if it was never interned."""
+        return self._ids.get(s, -1)
+
+
+_VALUE_COLUMNS = ("bet", "claim", "unclaim", "bet_s", "claim_s", "unclaim_s",
+                  "withdraw_s", "withdraw", "win", "lose", "status", "version")
+
+
+class _Columns:
+    __slots__ = ("serial", "position", "bet", "claim", "unclaim",
+                 "bet_s", "claim_s", "unclaim_s", "withdraw_s", "withdraw",
+                 "win", "lose", "status", "version", "values")
+
+    def __init__(self):
+        self.serial     = array('i')    # string id of the ticket serial
+        self.position   = array('q')    # sort key for the server's order
+        self.bet        = array('d')    # amounts; NaN where missing / not a number
+        self.claim      = array('d')
+        self.unclaim    = array('d')
+        self.bet_s      = array('i')    # string ids of the fields as the server sent them
+        self.claim_s    = array('i')
+        self.unclaim_s  = array('i')
+        self.withdraw_s = array('i')
+        self.withdraw   = array('i')    # withdraw time as seconds of the day, or NO_NUMBER
+        self.win        = array('h')    # game_result winning / lose number, or NO_NUMBER
+        self.lose       = array('h')
+        self.status     = array('B')    # BET_PLACED / LOOSE / WIN
+        self.version    = array('I')    # bumped on every change; part of the record key
+        # Everything but serial and position, in the order _upsert writes them
+        self.values = tuple(getattr(self, name) for name in _VALUE_COLUMNS)
+
+    def arrays(self):
+        return [self.serial, self.position, *self.values]
+
+
+def _number(v):
+    try:
+        n = int(v)
+    except (TypeError, ValueError):
+        return NO_NUMBER
+    return n if 0 <= n < 32768 else NO_NUMBER
+
+
+def _seconds(text):
+    try:
+        h, m, s = text.split(":")
+        return int(h) * 3600 + int(m) * 60 + int(s)
+    except (AttributeError, ValueError):
+        return NO_NUMBER
+
+
+def _amount(v):
+    v = history_model.to_val(v)
+    return _NAN if v is None else v
+
+
+def _np_copy(col, dtype, n):
+    # A copy, so no buffer export outlives the caller's lock (an exported
+    # array can't be appended to)
+    return np.frombuffer(col, dtype=dtype, count=n).copy()
+
+
+class TicketStore:
+    def __init__(self):
+        self.strings = StringTable()
+        self._cols = _Columns()
+        self._row_by_sid = array('i')   # string id -> row, or -1 (serials only)
+        self._next_version = 1
+        self._records = {}              # version -> HistoryRecord
+        self._amount_of = {}            # string id -> parsed amount (NaN if not a number)
+        self._head = 0                  # lowest / highest position in use
+        self._tail = -1
+        self._order = None              # rows sorted by position, rebuilt after a reorder
+        self._lock = threading.Lock()   # writers, and NumPy reads of the columns
+
+    def __len__(self):
+        return len(self._cols.serial)
+
+    # ─── Lookup ───
+
+    def index(self, serial):
+        """Row of ticket `serial`, or -1."""
+        sid = self.strings.find(serial)
+        if sid < 0 or sid >= len(self._row_by_sid):
+            return -1
+        return self._row_by_sid[sid]
+
+    def record(self, row):
+        return self._record(self._cols, row)
+
+    def view(self):
+        """Read-only sequence of HistoryRecords for the rows present now, in server order."""
+        with self._lock:
+            if self._order is None:
+                self._order = self._sorted_rows(self._cols)
+            return _View(self, self._cols, self._order)
+
+    @staticmethod
+    def _sorted_rows(cols):
+        n = len(cols.serial)
+        if np is not None:
+            order = np.argsort(_np_copy(cols.position, np.int64, n), kind="stable")
+            return array('i', order.astype(np.int32).tobytes())
+        return array('i', sorted(range(n), key=cols.position.__getitem__))
+
+    def _record(self, cols, row):
+        # Versions are unique per write, so one identifies a row's content
+        # whichever columns (before or after a removal) it is read from
+        version = cols.version[row]
+        rec = self._records.get(version)
+        if rec is None:
+            if len(self._records) >= _RECORD_MEMO_MAX:
+                self._records.clear()
+            rec = self._records[version] = self._build_record(cols, row)
+        return rec
+
+    def _build_record(self, cols, row):
+        s = self.strings
+        win, lose = cols.win[row], cols.lose[row]
+        serial = s[cols.serial[row]]
+        return history_model.record({
+            'ticket_serial': serial,
+            'bet_amount':    s[cols.bet_s[row]],
+            'claim_point':   s[cols.claim_s[row]],
+            'unclaim_point': s[cols.unclaim_s[row]],
+            'withdraw_time': s[cols.withdraw_s[row]],
+            'game_result':   {'winning_number': None if win == NO_NUMBER else win,
+                              'lose_number':    None if lose == NO_NUMBER else lose},
+        }, key=(serial, cols.version[row]))
+
+    # ─── Writes ───
+
+    def upsert(self, row):
+        """
+        Add or update one raw `mapped` row; a new ticket goes at the tail.
+        Returns (old, new) history_model.Amounts: old is None for a new
+        ticket, and both are None if nothing changed.
+        """
+        with self._lock:
+            return self._upsert(row, self._tail + 1)[1:]
+
+    def upsert_many(self, rows):
+        """upsert() each row; returns the (old, new) pairs of the ones that changed."""
+        with self._lock:
+            changes = []
+            for row in rows:
+                _, old, new = self._upsert(row, self._tail + 1)
+                if new is not None:
+                    changes.append((old, new))
+            return changes
+
+    def sync(self, rows):
+        """
+        Make the store hold exactly `rows` (a full history): upsert them and
+        remove tickets that are gone. Returns (old, new) lists of
+        history_model.Amounts: the previous amounts of updated and removed
+        tickets, and the current ones of inserted and updated tickets.
+        """
+        with self._lock:
+            old, new, seen = [], [], set()
+            # Everything is renumbered by its place in `rows`
+            self._order = None
+            self._head, self._tail = 0, len(rows) - 1
+            for pos, row in enumerate(rows):
+                sid, before, after = self._upsert(row, pos, reposition=True)
+                seen.add(sid)
+                if after is not None:
+                    new.append(after)
+                    if before is not None:
+                        old.append(before)
+            if len(seen) < len(self._cols.serial):
+                old.extend(self._remove([r for r, sid in enumerate(self._cols.serial) if sid not in seen]))
+            return old, new
+
+    def apply(self, rows, removed=(), new_at="head"):
+        """
+        Upsert `rows` and drop the tickets whose serials are in `removed`,
+        e.g. one delta of the dashboard sync. Existing tickets keep their
+        place; new ones go at the "head" or "tail", in the order listed.
+        Returns (old, new) lists of Amounts like sync().
+        """
+        with self._lock:
+            old, new = [], []
+            fresh = [row for row in rows if self.index(row.get('ticket_serial')) < 0]
+            if new_at == "head":
+                pos = self._head - len(fresh)
+                self._head = pos
+            else:
+                pos = self._tail + 1
+            for row in rows:
+                _, before, after = self._upsert(row, pos)
+                if after is not None:
+                    new.append(after)
+                    if before is not None:
+                        old.append(before)
+                    else:
+                        pos += 1
+            if removed:
+                old.extend(self._remove([r for r in map(self.index, removed) if r >= 0]))
+            return old, new
+
+    def remove(self, serials):
+        """Drop the given tickets; returns their Amounts."""
+        with self._lock:
+            return self._remove([r for r in map(self.index, serials) if r >= 0])
+
+    def _amounts(self, cols, r):
+        marker = None
+        if cols.status[r] != BET_PLACED:
+            win, lose = cols.win[r], cols.lose[r]
+            marker = win if win != NO_NUMBER else lose if lose != NO_NUMBER else None
+        bet, claim, unclaim = cols.bet[r], cols.claim[r], cols.unclaim[r]
+        # NaN (missing) counts as 0, as in HistoryRecord's amounts
+        return history_model.Amounts(self.strings[cols.serial[r]], marker,
+                                     bet if bet == bet else 0.0,
+                                     claim if claim == claim else 0.0,
+                                     unclaim if unclaim == unclaim else 0.0)
+
+    def _upsert(self, row, pos, reposition=False):
+        # `pos` places a new ticket; with `reposition`, an existing one too
+        s = self.strings
+        cols = self._cols
+        sid = s.intern(row.get('ticket_serial'))
+        gr = row.get('game_result') or {}
+        bet_s     = s.intern(str(row.get('bet_amount', '')))
+        claim_s   = s.intern(str(row.get('claim_point', '')))
+        unclaim_s = s.intern(str(row.get('unclaim_point', '')))
+        wt_s      = s.intern(str(row.get('withdraw_time', '')))
+        win       = _number(gr.get('winning_number'))
+        lose      = _number(gr.get('lose_number'))
+
+        if sid >= len(self._row_by_sid):
+            self._row_by_sid.extend([-1] * (sid + 1 - len(self._row_by_sid)))
+        r = self._row_by_sid[sid]
+        old = None
+        if r >= 0:
+            if reposition:
+                cols.position[r] = pos
+            if (cols.bet_s[r] == bet_s and cols.claim_s[r] == claim_s and cols.unclaim_s[r] == unclaim_s
+                    and cols.withdraw_s[r] == wt_s and cols.win[r] == win and cols.lose[r] == lose):
+                return sid, None, None
+            old = self._amounts(cols, r)
+
+        # Parse each distinct string once; a history repeats a handful of them
+        cp, up = self._parsed(claim_s), self._parsed(unclaim_s)
+        status = _STATUS_CODES[history_model.status_of(
+            None if cp != cp else cp, None if up != up else up)]
+        values = (self._parsed(bet_s), cp, up, bet_s, claim_s, unclaim_s,
+                  wt_s, _seconds(s[wt_s]), win, lose, status, self._next_version)
+        self._next_version += 1
+
+        if r >= 0:
+            for col, v in zip(cols.values, values):
+                col[r] = v
+        else:
+            # serial last: a concurrent view() sees the row only once it's complete
+            r = len(cols.serial)
+            for col, v in zip(cols.values, values):
+                col.append(v)
+            cols.position.append(pos)
+            cols.serial.append(sid)
+            self._row_by_sid[sid] = r
+            self._tail = max(self._tail, pos)
+            self._order = None
+        return sid, old, self._amounts(cols, r)
+
+    def _parsed(self, sid):
+        v = self._amount_of.get(sid)
+        if v is None:
+            v = self._amount_of[sid] = _amount(self.strings[sid])
+        return v
+
+    def _remove(self, rows):
+        if not rows:
+            return []
+        cols = self._cols
+        gone = set(rows)
+        removed = [self._amounts(cols, r) for r in rows]
+        keep = [r for r in range(len(cols.serial)) if r not in gone]
+
+        fresh = _Columns()
+        for src, dst in zip(cols.arrays(), fresh.arrays()):
+            dst.extend(src[r] for r in keep)
+        for r in rows:
+            self._row_by_sid[cols.serial[r]] = -1
+        for new_r, sid in enumerate(fresh.serial):
+            self._row_by_sid[sid] = new_r
+        # Swap in one assignment; views keep reading the old columns
+        self._cols = fresh
+        self._order = None
+        return removed
+
+    # ─── Queries ───
+
+    def select(self, status=None, since=None, until=None):
+        """
+        Rows (array of indices) whose status is `status` (a code or a
+        collection of codes) and whose withdraw time, in seconds of the day,
+        is within [since, until].
+        """
+        codes = None if status is None else (
+            {status} if isinstance(status, int) else set(status))
+        with self._lock:
+            cols = self._cols
+            if np is not None:
+                n = len(cols.serial)
+                mask = np.ones(n, dtype=bool)
+                if codes is not None:
+                    mask &= np.isin(_np_copy(cols.status, np.uint8, n), list(codes))
+                if since is not None or until is not None:
+                    wt = _np_copy(cols.withdraw, np.int32, n)
+                    mask &= wt != NO_NUMBER
+                    if since is not None:
+                        mask &= wt >= since
+                    if until is not None:
+                        mask &= wt <= until
+                return array('i', np.flatnonzero(mask).astype(np.int32).tobytes())
+
+            out = array('i')
+            for r, (code, wt) in enumerate(zip(cols.status, cols.withdraw)):
+                if codes is not None and code not in codes:
+                    continue
+                if (since is not None or until is not None) and wt == NO_NUMBER:
+                    continue
+                if (since is not None and wt < since) or (until is not None and wt > until):
+                    continue
+                out.append(r)
+            return out
+
+    def sums(self, rows=None):
+        """(bet, claim, unclaim) totals over `rows` (default: all); missing amounts count as 0."""
+        with self._lock:
+            cols = self._cols
+            if np is not None:
+                n = len(cols.serial)
+                idx = None if rows is None else np.asarray(rows, dtype=np.intp)
+                out = []
+                for col in (cols.bet, cols.claim, cols.unclaim):
+                    a = _np_copy(col, np.float64, n)
+                    out.append(float(np.nansum(a if idx is None else a[idx])))
+                return tuple(out)
+
+            picked = range(len(cols.serial)) if rows is None else rows
+            return tuple(math.fsum(v for v in (col[r] for r in picked) if v == v)
+                         for col in (cols.bet, cols.claim, cols.unclaim))
+
+    def nbytes(self):
+        """Memory held by the columns and the string table (approximate)."""
+        total = sum(a.buffer_info()[1] * a.itemsize for a in self._cols.arrays())
+        total += self._row_by_sid.buffer_info()[1] * self._row_by_sid.itemsize
+        total += sys.getsizeof(self.strings.strings) + sys.getsizeof(self.strings._ids)
+        total += sys.getsizeof(self._amount_of)
+        total += sum(sys.getsizeof(x) for x in self.strings.strings)
+        return total
+
+
+class _View:
+    """Snapshot sequence over a TicketStore's rows, in the order of `rows`."""
+
+    def __init__(self, store, cols, rows):
+        self._store = store
+        self._cols = cols
+        self._rows = rows           # row indices into cols, shared until the next reorder
+
+    def __len__(self):
+        return len(self._rows)
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self._rows):
+            raise IndexError(i)
+        return self._store._record(self._cols, self._rows[i])
+
+    def __iter__(self):
+        for row in self._rows:
+            yield self._store._record(self._cols, row)
+
+
+if __name__ == "__main__":
+    import argparse
+    import gc
+    import random
+    import time
+    import tracemalloc
+
+    parser = argparse.ArgumentParser(description="TicketStore vs list of dicts: memory and lookups")
+    parser.add_argument("--rows", default="10000,1000000", help="comma-separated history sizes")
+    parser.add_argument("--lookups", type=int, default=200)
+    args = parser.parse_args()
+
+    def mapped_rows(n):
+        """Rows shaped like the dashboard's `mapped` array."""
+        rows = []
+        for i in range(n):
+            kind = i % 3
+            rows.append({
+                "ticket_serial": f"T{1000000 + i}",
+                "bet_amount":    str(10 * (1 + i % 5)),
+                "claim_point":   ["", "0", "20"][kind],
+                "unclaim_point": ["", "0", "0"][kind],
+                "withdraw_time": f"{(i // 30) % 24:02d}:{(i * 2) % 60:02d}:00",
+                "game_result":   {"winning_number": i % 12},
+            })
+        return rows
+
+    def traced(fn):
+        gc.collect()
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        out = fn()
+        elapsed = time.perf_counter() - t0
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        return out, size, elapsed
+
+    def per_call_us(fn, calls):
+        # Collector off: with a million dicts alive, a gen-2 pass landing in
+        # one side's loop would swamp the comparison
+        gc.collect()
+        gc.disable()
+        t0 = time.perf_counter()
+        for _ in range(calls):
+            fn()
+        elapsed = time.perf_counter() - t0
+        gc.enable()
+        return elapsed / calls * 1e6
+
+    print(f"numpy: {'yes' if np is not None else 'no'}")
+    for n in (int(x) for x in args.rows.split(",")):
+        rng = random.Random(n)
+        wanted = [f"T{1000000 + rng.randrange(n)}" for _ in range(args.lookups)]
+
+        rows, dict_bytes, _ = traced(lambda: mapped_rows(n))
+        # Memory under tracemalloc (the change list upsert_many returns is
+        # dropped first); ingest is timed again untraced, as tracing slows
+        # allocation-heavy code several times over
+        def ingest():
+            store = TicketStore()
+            store.upsert_many(rows)
+            return store
+
+        traced_store, store_bytes, _ = traced(ingest)
+        del traced_store
+        store = TicketStore()
+        gc.collect()
+        t0 = time.perf_counter()
+        store.upsert_many(rows)
+        ingest_s = time.perf_counter() - t0
+
+        def scan(serial):
+            return next(r for r in rows if r["ticket_serial"] == serial)
+
+        scan_calls = max(1, min(args.lookups, 2_000_000 // n))
+        it = iter(wanted)
+        t_scan = per_call_us(lambda: scan(next(it)), scan_calls)
+        it = iter(wanted)
+        t_index = per_call_us(lambda: store.record(store.index(next(it))), len(wanted))
+
+        def dict_won_sums():
+            won = [r for r in rows if (history_model.to_val(r["claim_point"]) or 0) > 0
+                   and "06:00:00" <= r["withdraw_time"] <= "12:00:00"]
+            return sum(float(r["bet_amount"]) for r in won), len(won)
+
+        t_dict_sum = per_call_us(dict_won_sums, 3)
+        t_store_sum = per_call_us(lambda: store.sums(store.select(WIN, 6 * 3600, 12 * 3600)), 3)
+
+        del rows
+        gc.collect()
+        print(f"\n{n:,} rows")
+        print(f"  memory     list of dicts {dict_bytes / 2**20:8.1f} MiB   store {store_bytes / 2**20:7.1f} MiB"
+              f"   ({dict_bytes / max(1, store_bytes):.1f}x smaller; ingest {ingest_s:.2f} s)")
+        print(f"  lookup     linear scan   {t_scan:10.1f} us    store index {t_index:7.2f} us")
+        print(f"  filter+sum list of dicts {t_dict_sum / 1000:8.1f} ms    store {t_store_sum / 1000:9.2f} ms")
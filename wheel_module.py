@@ -5,6 +5,9 @@ import subprocess
 import sys
 import io
 import requests
+import http_client
+import net_executor
+import poll_policy
 import math
 import pygame
 import pygame.gfxdraw
@@ -16,6 +19,14 @@ from reportlab.graphics.barcode import code128
 from reportlab.lib.units import mm
 
 import app_globals
+from surface_cache import SurfaceCache, surface_bytes
+import polar
+import asset_cache
+import gradients
+import layout
+from hit_index import HitIndex
+from font_registry import get_font
+from text_cache import render_text
 new_withdraw_time = None
 
 def print_withdraw_time():
@@ -34,20 +45,15 @@ BLUE_BG  = (30, 60, 200)
 BUTTON_BG = (50, 50, 50)
 BUTTON_BORDER = (200, 200, 200)
 
+SPIN_DURATION = 4.0     # seconds, see update_spin
+
 # --------------------------------------------------
 # GLOBAL STATE FOR CHIP SELECTION / PLACEMENT
 # --------------------------------------------------
 selected_chip = None  # Index of the currently selected chip in the tray
 placed_chips = {}     # key: (row, col), value: total amount in that cell
 
-chip_rects = []
-cell_rects = {}
-rank_icon_rects = {}
-suit_icon_rects = {}
-bet_button_rect = None  # Will hold pygame.Rect for the "Bet" button
-clear_button_rect = None  # Will hold pygame.Rect for the "Bet" button
-double_button_rect = None  # Will hold pygame.Rect for the "Bet" button
-repeat_button_rect = None  # Will hold pygame.Rect for the "Bet" button
+board_layout = None   # layout.BoardLayout last drawn; handle_click hit-tests against it
 
 # --------------------------------------------------
 # CHIP DEFINITIONS (color + amount)
@@ -349,6 +355,133 @@ RIBBON_ALPHA     = 200
 GOLD             = (212, 175, 55)
 RED_BG           = (200, 0, 0)      # Solid red inner circle background
 
+# ─── WHEEL RENDER CACHE ────────────────────────────────────────────────────────
+# The wheel is split into layers so a frame is only a handful of blits:
+#   disc  – drop shadow, background, segments, mid-ring gradient,
+#           radial lines and the (round) ribbon
+#   front – ribbon dots/arrows and the inner 12 o'clock arrow (fixed)
+# Rank/suit icons stay upright while the wheel turns, so they are blitted at
+# their rotated positions from the shared asset cache; the highlight and the inner
+# circle are drawn live as well.
+#
+# The disc repeats every `period` degrees (30° for a single-colour palette), so
+# spin frames are rendered once per WHEEL_FRAME_STEP_DEG within one period and
+# kept in an LRU cache. If a full period would not fit in WHEEL_FRAME_CACHE_MB
+# the step is widened until it does.
+WHEEL_FRAME_STEP_DEG = 1                 # Angular resolution of cached spin frames
+WHEEL_FRAME_CACHE_MB = 64                # Memory cap for cached spin frames
+
+_wheel_layers = SurfaceCache(max_items=32)
+_wheel_frames = SurfaceCache(max_bytes=WHEEL_FRAME_CACHE_MB * 1024 * 1024)
+
+
+def _palette_period(colors):
+    """Smallest segment shift that maps the palette onto itself."""
+    n = len(colors)
+    for p in range(1, n + 1):
+        if n % p == 0 and all(colors[i] == colors[(i + p) % n] for i in range(n)):
+            return p
+    return n
+
+
+def _render_wheel_disc(outer_radius, mid_radius, inner_radius, num_segments,
+                       outer_segment_colors, ribbon_thickness, current_ang):
+    """Drop shadow plus the rotating geometry of the wheel, drawn at `current_ang` degrees."""
+    temp_size = outer_radius * 2 + SHADOW_OFFSET * 2
+    disc = pygame.Surface((temp_size, temp_size), pygame.SRCALPHA)
+    center = (outer_radius + SHADOW_OFFSET, outer_radius + SHADOW_OFFSET)
+
+    # Drop shadow (does not turn, but sits under every frame)
+    gfxdraw.filled_circle(disc, center[0], center[1] + SHADOW_OFFSET, outer_radius, SHADOW_COLOR)
+
+    # Outer wheel background + border
+    gfxdraw.filled_circle(disc, center[0], center[1], outer_radius, (*TABLE_BG, 255))
+    gfxdraw.aacircle(disc, center[0], center[1], outer_radius, (*GRID, 255))
+
+    # Outer-ring segments
+    polygons = polar.segment_polygons(center, outer_radius, num_segments, ANGLE_STEPS, current_ang)
+    for i, pts in enumerate(polygons):
+        gfxdraw.filled_polygon(disc, pts, outer_segment_colors[i])
+        pygame.draw.polygon(disc, GRID, pts, 1)
+
+    # Mid-ring: white→darker gradient
+    inner_grad = mid_radius - int(mid_radius * 0.3)
+    for r in range(mid_radius, inner_grad, -1):
+        shade = 255 - int((mid_radius - r) / (mid_radius - inner_grad) * 100)
+        gfxdraw.filled_circle(disc, center[0], center[1], r, (shade, shade, shade))
+
+    # Radial lines connecting mid ring → inner circle
+    inner_pts = polar.ring_points(center, inner_radius, num_segments, current_ang)
+    mid_pts   = polar.ring_points(center, mid_radius, num_segments, current_ang)
+    for p1, p2 in zip(inner_pts, mid_pts):
+        pygame.draw.aaline(disc, GRID, p1, p2)
+
+    # Ribbon (outermost border circle). It is round, so it is baked in here where,
+    # as before, its translucent pixels replace the segment edge rather than blend.
+    ribbon_rad   = outer_radius + ribbon_thickness // 2
+    ribbon_color = (*RIBBON_COLOR_RGB, RIBBON_ALPHA)
+    gfxdraw.aacircle(disc, center[0], center[1], ribbon_rad, ribbon_color)
+    pygame.draw.circle(disc, ribbon_color, center, ribbon_rad, ribbon_thickness)
+
+    return disc
+
+
+def _render_wheel_front(outer_radius, inner_radius, num_segments, ribbon_thickness):
+    """Ribbon dots/arrows plus the static inner arrow; none of it rotates."""
+    temp_size = outer_radius * 2 + SHADOW_OFFSET * 2
+    front = pygame.Surface((temp_size, temp_size), pygame.SRCALPHA)
+    c = outer_radius + SHADOW_OFFSET
+
+    inner_arrow_w = inner_arrow_h = 20
+    ribbon_arrow_w = ribbon_arrow_h = 20
+
+    # Dots/arrows on the ribbon
+    ribbon_rad = outer_radius + ribbon_thickness // 2
+    inner_edge = ribbon_rad - ribbon_thickness // 2
+    tip_r  = inner_edge - ribbon_arrow_h
+    base_r = inner_edge
+    # Arrow base corners sit half an arrow-width either side of the base point,
+    # i.e. on a slightly larger circle turned by ±base_ang
+    base_ang = math.degrees(math.atan2(ribbon_arrow_w / 2, base_r))
+    corner_r = math.hypot(ribbon_arrow_w / 2, base_r)
+    dots = polar.ring_points((c, c), inner_edge, num_segments)
+    tips = polar.ring_points((c, c), tip_r, num_segments)
+    b1s  = polar.ring_points((c, c), corner_r, num_segments, -base_ang)
+    b2s  = polar.ring_points((c, c), corner_r, num_segments, base_ang)
+    for i in range(num_segments):
+        if i % 2 == 0:
+            px, py = dots[i]
+            gfxdraw.filled_circle(front, px, py, ribbon_thickness // 2 + 2, (*GOLD, 255))
+        else:
+            gfxdraw.filled_polygon(front, [tips[i], b1s[i], b2s[i]], (*GOLD, 255))
+
+    # Static inner arrow at 12 o’clock
+    tip = (c, c - inner_radius - inner_arrow_h)
+    b1  = (c - inner_arrow_w // 2, c - inner_radius)
+    b2  = (c + inner_arrow_w // 2, c - inner_radius)
+    gfxdraw.filled_polygon(front, [tip, b1, b2], (*GOLD, 255))
+    gfxdraw.aapolygon(front, [tip, b1, b2], (*GOLD, 255))
+    return front
+
+
+def _wheel_disc_frame(layer_key, period_deg, frame_bytes, current_ang, is_spinning, build_disc):
+    """
+    Still wheel → disc rendered at the exact angle (kept in the layer cache).
+    Spinning    → disc for the nearest cached step within one symmetry period.
+    """
+    phase = current_ang % period_deg
+    if not is_spinning:
+        phase = round(phase, 2)
+        return _wheel_layers.get_or_create(('disc', layer_key, phase), lambda: build_disc(phase))
+
+    budget = WHEEL_FRAME_CACHE_MB * 1024 * 1024
+    step = WHEEL_FRAME_STEP_DEG
+    while step < period_deg and (period_deg / step) * frame_bytes > budget:
+        step += WHEEL_FRAME_STEP_DEG
+    phase = (round(phase / step) * step) % period_deg
+    return _wheel_frames.get_or_create((layer_key, phase), lambda: build_disc(phase))
+
+
 # ─── WHEEL DRAWING ─────────────────────────────────────────────────────────────
 def draw_wheel(
     surf,
@@ -356,6 +489,7 @@ def draw_wheel(
     outer_radius,
     mid_radius,
     inner_radius,
+    ribbon_thickness,
     num_segments,
     outer_segment_colors,
     mid_segment_colors,
@@ -369,7 +503,8 @@ def draw_wheel(
     highlight_on=False
 ):
     """
-    Draws the spinning wheel onto `surf`.
+    Draws the spinning wheel onto `surf`, at the center and radii the
+    screen layout gives (layout.ScreenLayout).
 
     • highlight_index/highlight_on: if highlight_on=True, the outer segment at
       highlight_index is filled solid green and outlined in green.
@@ -380,215 +515,109 @@ def draw_wheel(
     • Once is_spinning=False and result_index is provided, that same red inner
       circle displays the winning segment’s rank+suit icons side-by-side, with a
       large “N” directly below them.
-    """
 
-    # 1) Recompute radii if surface size changed
-    width, height = surf.get_size()
-    min_dim = min(width, height)
-    outer_radius = int(min_dim * 0.30)
-    mid_radius   = int(min_dim * 0.18)
-    inner_radius = int(min_dim * 0.08)
-
-    # Arrow sizes (unchanged)
-    inner_arrow_w = inner_arrow_h = 20
-    ribbon_arrow_w = ribbon_arrow_h = 20
-
-    # Ribbon thickness
-    ribbon_thickness = max(6, int(min_dim * 0.015))
-    current_rad = math.radians(current_ang)
+    Disc and ribbon come from the wheel render cache (see WHEEL RENDER CACHE).
+    Returns the rect drawn over.
+    """
 
     # If no palette provided, generate one
     if outer_segment_colors is None:
         outer_segment_colors = _generate_hsv_palette(num_segments, 75, 100, 255)
 
-    # 2) Off-screen surface for drop shadow + drawing
-    temp_size   = (outer_radius * 2 + SHADOW_OFFSET * 2,
-                   outer_radius * 2 + SHADOW_OFFSET * 2)
-    temp_surf   = pygame.Surface(temp_size, pygame.SRCALPHA)
     temp_center = (outer_radius + SHADOW_OFFSET,
                    outer_radius + SHADOW_OFFSET)
+    origin = (wheel_center[0] - temp_center[0], wheel_center[1] - temp_center[1])
+    cx, cy = wheel_center
 
-    # 3) Draw drop shadow
-    gfxdraw.filled_circle(
-        temp_surf,
-        temp_center[0],
-        temp_center[1] + SHADOW_OFFSET,
-        outer_radius,
-        SHADOW_COLOR
-    )
-
-    # 4) Draw outer wheel background + border
-    gfxdraw.filled_circle(temp_surf, temp_center[0], temp_center[1],
-                          outer_radius, (*TABLE_BG, 255))
-    gfxdraw.aacircle(temp_surf, temp_center[0], temp_center[1],
-                     outer_radius, (*GRID, 255))
+    # 1) Cached layers, keyed on everything that shapes them
+    palette = tuple(tuple(c) for c in outer_segment_colors)
+    layer_key = ((outer_radius, mid_radius, inner_radius, ribbon_thickness), num_segments, palette)
+    period_deg = _palette_period(palette) * 360 / num_segments
 
-    # 5) Draw outer-ring segments
-    for i in range(num_segments):
-        start = math.radians(i * 360 / num_segments) + current_rad
-        end   = start + math.radians(360 / num_segments)
-        pts   = [temp_center]
-        for s in range(ANGLE_STEPS + 1):
-            a = start + (end - start) * (s / ANGLE_STEPS)
-            x = temp_center[0] + outer_radius * math.cos(a)
-            y = temp_center[1] + outer_radius * math.sin(a)
-            pts.append((int(x), int(y)))
-
-        if i == highlight_index and highlight_on:
-            # Fill this segment solid green and outline in green
-            green_fill = (0, 255, 0)
-            gfxdraw.filled_polygon(temp_surf, pts, green_fill)
-            pygame.draw.polygon(temp_surf, green_fill, pts, 3)
-        else:
-            gfxdraw.filled_polygon(temp_surf, pts, outer_segment_colors[i])
-            pygame.draw.polygon(temp_surf, GRID, pts, 1)
+    front = _wheel_layers.get_or_create(
+        ('front', layer_key),
+        lambda: _render_wheel_front(outer_radius, inner_radius, num_segments, ribbon_thickness)
+    )
+    disc = _wheel_disc_frame(
+        layer_key, period_deg, surface_bytes(front), current_ang, is_spinning,
+        lambda ang: _render_wheel_disc(outer_radius, mid_radius, inner_radius, num_segments,
+                                       outer_segment_colors, ribbon_thickness, ang)
+    )
 
-    # 6) Draw “K/Q/J” rank icons around the outer ring (no suit icons in outer ring)
+    # 2) Shadow + disc
+    disc_rect = surf.blit(disc, origin)
+
+    # 3) Highlighted segment: green over the outer ring, up to the ribbon
+    if highlight_on and highlight_index is not None and 0 <= highlight_index < num_segments:
+        wedge_radius = outer_radius + ribbon_thickness // 2 - ribbon_thickness
+        outer_pts = polar.segment_arc(wheel_center, wedge_radius, num_segments,
+                                      ANGLE_STEPS, highlight_index, current_ang)
+        inner_pts = polar.segment_arc(wheel_center, mid_radius, num_segments,
+                                      ANGLE_STEPS, highlight_index, current_ang)
+        green_fill = (0, 255, 0)
+        gfxdraw.filled_polygon(surf, outer_pts + inner_pts[::-1], green_fill)
+        pygame.draw.lines(surf, green_fill, False, [inner_pts[0]] + outer_pts + [inner_pts[-1]], 3)
+
+    # 4) Upright “K/Q/J” icons on the outer ring, suit icons on the mid ring
     ranks = ['K', 'Q', 'J']
-    for i in range(num_segments):
-        rank = ranks[i // 4]  # 0–3→K, 4–7→Q, 8–11→J
-        ang  = math.radians((i + 0.5) * 360 / num_segments) + current_rad
-        rank_radius = outer_radius * 0.85
-        rx = int(temp_center[0] + rank_radius * math.cos(ang))
-        ry = int(temp_center[1] + rank_radius * math.sin(ang))
-        rank_img = labels_kjq[rank]
-        temp_surf.blit(rank_img, rank_img.get_rect(center=(rx, ry)))
-
-    # 7) Mid-ring: white→darker gradient
-    inner_grad = mid_radius - int(mid_radius * 0.3)
-    for r in range(mid_radius, inner_grad, -1):
-        shade = 255 - int((mid_radius - r) / (mid_radius - inner_grad) * 100)
-        gfxdraw.filled_circle(temp_surf, temp_center[0], temp_center[1], r,
-                              (shade, shade, shade))
-
-    # 8) Draw radial lines connecting mid ring → inner circle
-    for i in range(num_segments):
-        ang = math.radians(i * 360 / num_segments) + current_rad
-        x1  = temp_center[0] + inner_radius * math.cos(ang)
-        y1  = temp_center[1] + inner_radius * math.sin(ang)
-        x2  = temp_center[0] + mid_radius * math.cos(ang)
-        y2  = temp_center[1] + mid_radius * math.sin(ang)
-        pygame.draw.aaline(temp_surf, GRID, (int(x1), int(y1)), (int(x2), int(y2)))
-
-    # 9) Draw suit icons in the mid ring
     suits = ['Spades', 'Diamond', 'Clubs', 'Hearts']
     suit_size = int(mid_radius * 0.3)
+    rank_pos = polar.ring_points(tuple(wheel_center), outer_radius * 0.85, num_segments,
+                                 current_ang, offset=0.5)
+    suit_pos = polar.ring_points(tuple(wheel_center), mid_radius * 0.75, num_segments,
+                                 current_ang, offset=0.5)
     for i in range(num_segments):
-        ang = math.radians((i + 0.5) * 360 / num_segments) + current_rad
-        mx  = int(temp_center[0] + mid_radius * 0.75 * math.cos(ang))
-        my  = int(temp_center[1] + mid_radius * 0.75 * math.sin(ang))
+        rank_img = labels_kjq[ranks[i // 4]]  # 0–3→K, 4–7→Q, 8–11→J
+        surf.blit(rank_img, rank_img.get_rect(center=rank_pos[i]))
+
         suit = suits[i % 4]
-        suit_img = pygame.transform.smoothscale(
-            labels_suits[suit], (suit_size, suit_size)
-        )
-        temp_surf.blit(suit_img, suit_img.get_rect(center=(mx, my)))
+        suit_img = asset_cache.scaled(f"suit-{suit}", (suit_size, suit_size), source=labels_suits[suit])
+        surf.blit(suit_img, suit_img.get_rect(center=suit_pos[i]))
 
-    # 10) Inner circle:
-    if is_spinning:
-        # 10a) Solid red background + border
-        gfxdraw.filled_circle(temp_surf, temp_center[0], temp_center[1],
-                              inner_radius, RED_BG)
-        gfxdraw.aacircle(temp_surf, temp_center[0], temp_center[1],
-                         inner_radius, (*GRID, 255))
+    # 5) Inner circle: solid red background + border
+    gfxdraw.filled_circle(surf, cx, cy, inner_radius, RED_BG)
+    gfxdraw.aacircle(surf, cx, cy, inner_radius, (*GRID, 255))
 
-        # 10b) Single scrolling label: ["1X", "2X", "3X", "4X", "N"]
+    if is_spinning:
+        # 6a) Single scrolling label: ["1X", "2X", "3X", "4X", "N"]
         scroll_texts = ["1X", "2X", "3X", "4X", "N"]
         font_size = max(12, inner_radius // 2)
-        tw_font = pygame.font.SysFont("Arial", font_size, bold=True)
+        tw_font = get_font("Arial", font_size, bold=True)
 
         idx = int(anim_offset) % len(scroll_texts)
         txt = scroll_texts[idx]
-        rendered = tw_font.render(txt, True, (255, 255, 255))
+        rendered = render_text(tw_font, txt, (255, 255, 255))
         text_w   = rendered.get_width()
         text_h   = rendered.get_height()
-        x = temp_center[0] - text_w // 2
-        y = temp_center[1] - text_h // 2
-        temp_surf.blit(rendered, (x, y))
+        surf.blit(rendered, (cx - text_w // 2, cy - text_h // 2))
 
-    else:
-        # 10c) Once stopped → fill inner circle solid red + border
-        gfxdraw.filled_circle(temp_surf, temp_center[0], temp_center[1],
-                              inner_radius, RED_BG)
-        gfxdraw.aacircle(temp_surf, temp_center[0], temp_center[1],
-                         inner_radius, (*GRID, 255))
-
-        # 10d) If result_index is valid, draw its rank+suit icons side-by-side
-        if isinstance(result_index, int) and 0 <= result_index < num_segments:
-            ranks = ['K', 'Q', 'J']
-            suits = ['Spades', 'Diamond', 'Clubs', 'Hearts']
-            rank = ranks[result_index // 4]
-            suit = suits[result_index % 4]
-
-            # Icon dimensions: about 70% of inner_radius in height
-            icon_h = int(inner_radius * 0.7)
-            icon_w = icon_h  # square
-            rank_img = pygame.transform.smoothscale(labels_kjq[rank], (icon_w, icon_h))
-            suit_img = pygame.transform.smoothscale(labels_suits[suit], (icon_w, icon_h))
-
-            # Place side-by-side, with 10px gap
-            total_width = icon_w * 2 + 10
-            left_x = temp_center[0] - total_width // 2
-            rank_rect = rank_img.get_rect(center=(left_x + icon_w // 2, temp_center[1]))
-            suit_rect = suit_img.get_rect(center=(left_x + icon_w + 10 + icon_w // 2, temp_center[1]))
-            temp_surf.blit(rank_img, rank_rect)
-            temp_surf.blit(suit_img, suit_rect)
-
-            # Draw letter “N” just below the icons
-            font_n = pygame.font.SysFont("Arial", max(16, inner_radius // 3), bold=True)
-            text_n = font_n.render("N", True, (255, 255, 255))
-            text_rect = text_n.get_rect(center=(temp_center[0], temp_center[1] + icon_h // 2 + 15))
-            temp_surf.blit(text_n, text_rect)
-
-    # 11) Draw ribbon (outermost border circle)
-    ribbon_rad   = outer_radius + ribbon_thickness // 2
-    ribbon_color = (*RIBBON_COLOR_RGB, RIBBON_ALPHA)
-    gfxdraw.aacircle(
-        temp_surf, temp_center[0], temp_center[1],
-        ribbon_rad, ribbon_color
-    )
-    pygame.draw.circle(temp_surf, ribbon_color, temp_center,
-                       ribbon_rad, ribbon_thickness)
+    # 6b) Once stopped, if result_index is valid, draw its rank+suit icons side-by-side
+    elif isinstance(result_index, int) and 0 <= result_index < num_segments:
+        rank = ranks[result_index // 4]
+        suit = suits[result_index % 4]
 
-    # 12) Dots/arrows on the ribbon (unchanged)
-    inner_edge = ribbon_rad - ribbon_thickness // 2
-    for i in range(num_segments):
-        ang = math.radians(i * 360 / num_segments)
-        if i % 2 == 0:
-            px = int(temp_center[0] + inner_edge * math.cos(ang))
-            py = int(temp_center[1] + inner_edge * math.sin(ang))
-            gfxdraw.filled_circle(
-                temp_surf, px, py,
-                ribbon_thickness // 2 + 2, (*GOLD, 255)
-            )
-        else:
-            tip_r  = inner_edge - ribbon_arrow_h
-            base_r = inner_edge
-            tip = (
-                int(temp_center[0] + tip_r * math.cos(ang)),
-                int(temp_center[1] + tip_r * math.sin(ang))
-            )
-            bx = temp_center[0] + base_r * math.cos(ang)
-            by = temp_center[1] + base_r * math.sin(ang)
-            perp_dx = (ribbon_arrow_w / 2) * math.sin(ang)
-            perp_dy = (ribbon_arrow_w / 2) * -math.cos(ang)
-            b1 = (int(bx + perp_dx), int(by + perp_dy))
-            b2 = (int(bx - perp_dx), int(by - perp_dy))
-            gfxdraw.filled_polygon(temp_surf, [tip, b1, b2], (*GOLD, 255))
-
-    # 13) Static inner arrow at 12 o’clock (unchanged)
-    tip = (temp_center[0], temp_center[1] - inner_radius - inner_arrow_h)
-    b1  = (temp_center[0] - inner_arrow_w // 2, temp_center[1] - inner_radius)
-    b2  = (temp_center[0] + inner_arrow_w // 2, temp_center[1] - inner_radius)
-    gfxdraw.filled_polygon(temp_surf, [tip, b1, b2], (*GOLD, 255))
-    gfxdraw.aapolygon(temp_surf, [tip, b1, b2], (*GOLD, 255))
-
-    # 14) Blit onto the main surface
-    dest = pygame.Rect(
-        wheel_center[0] - temp_center[0],
-        wheel_center[1] - temp_center[1],
-        temp_size[0], temp_size[1]
-    )
-    surf.blit(temp_surf, dest)
+        # Icon dimensions: about 70% of inner_radius in height
+        icon_h = int(inner_radius * 0.7)
+        icon_w = icon_h  # square
+        rank_img = asset_cache.scaled(f"rank-{rank}", (icon_w, icon_h), source=labels_kjq[rank])
+        suit_img = asset_cache.scaled(f"suit-{suit}", (icon_w, icon_h), source=labels_suits[suit])
+
+        # Place side-by-side, with 10px gap
+        total_width = icon_w * 2 + 10
+        left_x = cx - total_width // 2
+        rank_rect = rank_img.get_rect(center=(left_x + icon_w // 2, cy))
+        suit_rect = suit_img.get_rect(center=(left_x + icon_w + 10 + icon_w // 2, cy))
+        surf.blit(rank_img, rank_rect)
+        surf.blit(suit_img, suit_rect)
+
+        # Draw letter “N” just below the icons
+        font_n = get_font("Arial", max(16, inner_radius // 3), bold=True)
+        text_n = render_text(font_n, "N", (255, 255, 255))
+        text_rect = text_n.get_rect(center=(cx, cy + icon_h // 2 + 15))
+        surf.blit(text_n, text_rect)
+
+    # 6) Ribbon dots/arrows and the inner arrow over everything
+    return disc_rect.union(surf.blit(front, origin))
 
 
 
@@ -598,7 +627,7 @@ def update_spin(current_time, spin_start, total_rotation):
      - first 3s: linear from 0 to 75% of total_rotation
      - last 1s: ease‐out from 75% to 100% of total_rotation
     """
-    duration = 4.0
+    duration = SPIN_DURATION
     elapsed  = min(current_time - spin_start, duration)
 
     if elapsed <= 3.0:
@@ -617,116 +646,164 @@ def draw_vertical_gradient_rect(surf, rect, top_color, bottom_color, border_radi
     Draws a vertical gradient from top_color to bottom_color inside 'rect' on 'surf'.
     border_radius controls corner curvature.
     """
-    grad_surf = pygame.Surface((rect.width, rect.height))
-    for y in range(rect.height):
-        t = y / (rect.height - 1)
-        r = int(top_color[0] + (bottom_color[0] - top_color[0]) * t)
-        g = int(top_color[1] + (bottom_color[1] - top_color[1]) * t)
-        b = int(top_color[2] + (bottom_color[2] - top_color[2]) * t)
-        pygame.draw.line(grad_surf, (r, g, b), (0, y), (rect.width, y))
-    grad_surf.set_alpha(255)
-
-    # Create a rounded mask to preserve corner_radius
-    rounded = pygame.Surface((rect.width, rect.height), pygame.SRCALPHA)
-    pygame.draw.rect(rounded, (255, 255, 255, 255), (0, 0, rect.width, rect.height), border_radius=border_radius)
-    rounded.blit(grad_surf, (0, 0), special_flags=pygame.BLEND_RGBA_MULT)
-    surf.blit(rounded, (rect.x, rect.y))
+    surf.blit(gradients.vertical(rect.size, top_color, bottom_color, border_radius), rect.topleft)
 
 # --------------------------------------
-# Main drawing function
+# Chip sprites
 # --------------------------------------
-def draw_left_table(
-    surf,
-    now_ts,
-    labels_kjq,
-    labels_suits,
-    x0,
-    y0,
-    label_size,
-    suit_size,
-    small_font,
-    rows=4,
-    cols=5,
-    highlight_cell=None,
-    highlight_on=False
-):
-    """
-    Draws:
-      1) Table background + borders
-      2) “Withdraw time” header
-      3) Suit header cells (All Spades, All Diamond, etc.)
-      4) Rank header cells (All Kings, All Queens, All Jacks)
-      5) Play cells with ribbons
-      6) Placed chips on ribbons
-      7) Chip tray below
-      8) “Current Bet:” text + 2×2 button grid
-      9) History row under everything
-    """
-    global chip_rects, cell_rects, rank_icon_rects, suit_icon_rects
-    global bet_button_rect, clear_button_rect, double_button_rect, repeat_button_rect, ribbon_rects
+# Tray chips are drawn at CHIP_SUPERSAMPLE× and smoothscaled down once per
+# (radius, colour). The selected chip spins; its stripes repeat every
+# 360/CHIP_STRIPES degrees, so rotated frames are cached lazily for that
+# span only, at CHIP_ROTATION_STEP_DEG resolution. The amount label is
+# blitted upright on top (from the text cache), so it is not baked in.
+CHIP_SUPERSAMPLE       = 4
+CHIP_STRIPES           = 8
+CHIP_STRIPE_WIDTH_DEG  = 20
+CHIP_ROTATION_STEP_DEG = 1
+
+_chip_sprites = SurfaceCache(max_items=32)
+_chip_frames  = SurfaceCache(max_bytes=8 * 1024 * 1024)
+
+
+def _chip_body(chip_radius, color):
+    """Chip face (edge, stripes, centre disc) of radius `chip_radius`."""
+    def build():
+        WHITE = (255, 255, 255)
+        BLACK = (  0,   0,   0)
+        hr_radius = chip_radius * CHIP_SUPERSAMPLE
+        hr_dia    = hr_radius * 2
+        chip_body_hr = pygame.Surface((hr_dia, hr_dia), pygame.SRCALPHA)
+
+        pygame.gfxdraw.filled_circle(chip_body_hr, hr_radius, hr_radius, hr_radius, color)
+        pygame.gfxdraw.aacircle(chip_body_hr, hr_radius, hr_radius, hr_radius, BLACK)
+
+        # stripes on the large chip
+        outer_r_hr = hr_radius
+        inner_r_hr = int(hr_radius * 0.7)
+        for quad in polar.chip_stripes(hr_radius, outer_r_hr - 1, inner_r_hr,
+                                       CHIP_STRIPES, CHIP_STRIPE_WIDTH_DEG):
+            pygame.gfxdraw.filled_polygon(chip_body_hr, quad, WHITE)
+            pygame.gfxdraw.aapolygon(chip_body_hr,   quad, BLACK)
+
+        # center circle on the large chip
+        center_r_hr = int(hr_radius * 0.6)
+        pygame.gfxdraw.filled_circle(chip_body_hr, hr_radius, hr_radius, center_r_hr, WHITE)
+        pygame.gfxdraw.aacircle(chip_body_hr, hr_radius, hr_radius, center_r_hr, BLACK)
+
+        return pygame.transform.smoothscale(chip_body_hr, (chip_radius * 2, chip_radius * 2))
+
+    return _chip_sprites.get_or_create((chip_radius, tuple(color)), build)
+
+
+def _chip_step(angle):
+    """Index of the cached rotation frame closest to `angle` degrees."""
+    period = 360 / CHIP_STRIPES
+    frames = int(period / CHIP_ROTATION_STEP_DEG)
+    return int(round((angle % period) / CHIP_ROTATION_STEP_DEG)) % frames
+
+
+def _chip_frame(chip_radius, color, angle):
+    """_chip_body rotated by `angle` degrees, snapped to the cached frame grid."""
+    step = _chip_step(angle)
+    return _chip_frames.get_or_create(
+        (chip_radius, tuple(color), step),
+        lambda: pygame.transform.rotate(_chip_body(chip_radius, color), step * CHIP_ROTATION_STEP_DEG),
+    )
+
+
+# --------------------------------------
+# Static board layer
+# --------------------------------------
+# The table background, header boxes, play cells and button grid depend only
+# on the screen size, the fonts and the card assets. They are drawn once onto
+# opaque layers in screen coordinates (so antialiased edges blend exactly as
+# they would on screen), cropped to the table and the button grid, and
+# blitted by draw_left_table, which draws only the changing parts on top.
+# The rounded corners outside those shapes are left as a colour key.
+BOARD_LAYER_KEY   = (255, 0, 255)
+
+_board_static = None    # dict: key, pieces, “Current Bet:” anchor
+_board_hits   = None    # (BoardLayout, HitIndex) for handle_click
+
 
+def _board_layout(surf, x0, y0, rows, cols):
+    """Shared geometry for the board at (x0, y0) on `surf` (see layout.py)."""
+    return layout.board(surf.get_size(), x0, y0, rows, cols, len(chip_defs))
+
+
+def _board_hit_index(lay):
+    """HitIndex of the board's clickable widgets, rebuilt when the layout changes.
+
+    Targets are (kind, key) pairs, added in the order handle_click used to
+    test them.
+    """
+    global _board_hits
+    if _board_hits is None or _board_hits[0] is not lay:
+        items = [(lay.bet_button_rect, ("bet", None))]
+        items += [(rect, ("chip", idx)) for idx, rect in enumerate(lay.chip_rects)]
+        items += [(rect, ("rank", ridx)) for ridx, rect in lay.rank_icon_rects.items()]
+        items += [(rect, ("suit", cidx)) for cidx, rect in lay.suit_icon_rects.items()]
+        items += [(rect, ("cell", rc)) for rc, rect in lay.cell_rects.items()]
+        items += [(lay.clear_button_rect, ("clear", None)),
+                  (lay.double_button_rect, ("double", None)),
+                  (lay.repeat_button_rect, ("repeat", None))]
+        _board_hits = (lay, HitIndex(items))
+    return _board_hits[1]
+
+
+def _new_layer(size):
+    layer = pygame.Surface(size)
+    layer.fill(BOARD_LAYER_KEY)
+    layer.set_colorkey(BOARD_LAYER_KEY)
+    return layer
+
+
+def _crop_layer(layer, rect):
+    """(surface, topleft) of `rect` cut out of a full-screen layer."""
+    rect = rect.clip(layer.get_rect())
+    piece = layer.subsurface(rect).copy()
+    if pygame.display.get_surface() is not None:
+        piece = piece.convert()
+    return piece, rect.topleft
+
+
+def _build_board_static(key, size, lay, labels_kjq, labels_suits,
+                        label_size, suit_size, small_font):
     TABLE_BG       = (16,  16,  16)
     WHITE          = (255, 255, 255)
     BLUE_BG_TOP    = (255, 255, 255)
     BLUE_BG_BOTTOM = (200, 200, 200)
-    RED            = (200,   0,   0)
-    BLUE_RIBBON    = (  0,   0, 200)
-    BUTTON_BG      = ( 50,  50,  50)
     BUTTON_BORDER  = (200, 200, 200)
     GOLDEN         = (255, 215,   0)
     YELLOW         = (255, 255,   0)
     BLACK          = (  0,   0,   0)
     DARK_BORDER    = ( 20,  20,  20)
-    GREEN          = (  0, 255,   0)
 
-    # We'll populate these inside draw_left_table():
-    chip_rects       = []
-    cell_rects       = {}
-    rank_icon_rects  = {}
-    suit_icon_rects  = {}
-    bet_button_rect  = None
-    clear_button_rect   = None
-    double_button_rect  = None
-    repeat_button_rect  = None
-    ribbon_rects     = {}
-
-    # Move table up by 60 px
-    y0_adj = y0 - 60
-
-    sw, sh = surf.get_size()
-    base_height = int(sh * 0.55)
-    cell_h      = base_height // rows
-    extra_h     = cell_h // 2
-    table_h     = cell_h * rows + extra_h
-    col_w       = int((sw * 0.48) // cols)
-    table_w     = col_w * cols
-    radius      = 12
-
-    grid_total_h = cell_h * rows
-    y_start      = y0_adj + (table_h - grid_total_h) // 2
+    col_w, cell_h = lay.col_w, lay.cell_h
+    radius = 12
+
+    layer = _new_layer(size)
 
     # ----------------------
     # 1) Table background
     # ----------------------
-    table_rect = pygame.Rect(x0, y0_adj, table_w, table_h)
-    pygame.draw.rect(surf, TABLE_BG, table_rect, border_radius=radius)
-    pygame.draw.rect(surf, DARK_BORDER, table_rect, 1, border_radius=radius)
+    table_rect = lay.table_rect
+    pygame.draw.rect(layer, TABLE_BG, table_rect, border_radius=radius)
+    pygame.draw.rect(layer, DARK_BORDER, table_rect, 1, border_radius=radius)
     inner_rect = table_rect.inflate(-2, -2)
-    pygame.draw.rect(surf, BLACK, inner_rect, 1, border_radius=max(0, radius-1))
+    pygame.draw.rect(layer, BLACK, inner_rect, 1, border_radius=max(0, radius-1))
 
     # ----------------------
-    # 2) “Withdraw time” header
+    # 2) “Withdraw time” label (the value is drawn per frame)
     # ----------------------
-    header_cell = pygame.Rect(x0, y_start, col_w, cell_h)
-    label_surf  = small_font.render("Withdraw time:", True, WHITE)
-    value_surf  = small_font.render(app_globals.Withdraw_time, True, WHITE)
+    header_cell = lay.withdraw_cell
+    label_surf  = render_text(small_font, "Withdraw time:", WHITE)
     cx = header_cell.centerx
     cy = header_cell.centery
-    surf.blit(label_surf, (cx - label_surf.get_width() / 2, cy - label_surf.get_height()))
-    surf.blit(value_surf, (cx - value_surf.get_width() / 2, cy + 2))
+    layer.blit(label_surf, (cx - label_surf.get_width() / 2, cy - label_surf.get_height()))
 
     # Font for “All <Suit>” / “All <Rank>” boxes
-    label_font = pygame.font.Font(None, max(6, int(small_font.get_height() * 0.6)))
+    label_font = get_font(None, max(6, int(small_font.get_height() * 0.6)))
 
     # ----------------------
     # 3) Header row columns 1–4: suits
@@ -734,8 +811,7 @@ def draw_left_table(
     suits = ['Spades', 'Diamond', 'Clubs', 'Hearts']
     small_radius = max(4, radius // 4)
     for i, suit in enumerate(suits, start=1):
-        cell = pygame.Rect(x0 + col_w * i, y_start, col_w, cell_h)
-        suit_icon_rects[i] = cell
+        cell = lay.suit_icon_rects[i]
 
         circle_radius = int(min(col_w, cell_h) * 0.18)
         circle_dia    = circle_radius * 2
@@ -748,7 +824,7 @@ def draw_left_table(
         combined_w = img_w + box_pad_horiz + circle_dia
         total_w    = int(combined_w * 1.3)
         label_text = f"All {suit}{'s' if suit not in ('Spades', 'Clubs') else ''}"
-        label_surf2 = label_font.render(label_text, True, BLACK)
+        label_surf2 = render_text(label_font, label_text, BLACK)
         label_h     = label_surf2.get_height() + 8
         base_h      = max(img_h, circle_dia) + box_pad_vert * 2
         total_h     = int(base_h * 1.2)
@@ -761,31 +837,24 @@ def draw_left_table(
         # Gradient‐bordered “All <Suit>” box
         grad_rect = golden_box.inflate(-2, -2)
         if grad_rect.width > 0 and grad_rect.height > 0:
-            grad_surf = pygame.Surface((grad_rect.width, grad_rect.height))
-            for yi in range(grad_rect.height):
-                t = yi / max(1, grad_rect.height - 1)
-                r = int(YELLOW[0] + t * (GOLDEN[0] - YELLOW[0]))
-                g = int(YELLOW[1] + t * (GOLDEN[1] - YELLOW[1]))
-                b = int(YELLOW[2] + t * (GOLDEN[2] - YELLOW[2]))
-                pygame.draw.line(grad_surf, (r, g, b), (0, yi), (grad_rect.width, yi))
-            surf.blit(grad_surf, (grad_rect.left, grad_rect.top))
-        pygame.draw.rect(surf, GOLDEN, golden_box, 1, border_radius=small_radius)
+            layer.blit(gradients.vertical(grad_rect.size, YELLOW, GOLDEN), grad_rect.topleft)
+        pygame.draw.rect(layer, GOLDEN, golden_box, 1, border_radius=small_radius)
 
         # Suit icon + “Play” circle
         combined_left = box_left + (total_w - combined_w) / 2
         center_y_box  = box_top + total_h / 2
 
-        img = pygame.transform.smoothscale(labels_suits[suit], (img_w, img_h))
+        img = asset_cache.scaled(f"suit-{suit}", (img_w, img_h), source=labels_suits[suit])
         img_rect = img.get_rect(center=(int(combined_left + img_w/2), int(center_y_box - total_h*0.1)))
-        surf.blit(img, img_rect)
+        layer.blit(img, img_rect)
 
         circle_center_x = int(combined_left + img_w + box_pad_horiz + circle_radius)
         circle_center_y = int(center_y_box - total_h * 0.1)
-        pygame.gfxdraw.filled_circle(surf, circle_center_x, circle_center_y, circle_radius, GOLDEN)
-        pygame.gfxdraw.aacircle(surf, circle_center_x, circle_center_y, circle_radius, BLACK)
+        pygame.gfxdraw.filled_circle(layer, circle_center_x, circle_center_y, circle_radius, GOLDEN)
+        pygame.gfxdraw.aacircle(layer, circle_center_x, circle_center_y, circle_radius, BLACK)
 
-        play_surf = label_font.render("Play", True, BLACK)
-        surf.blit(
+        play_surf = render_text(label_font, "Play", BLACK)
+        layer.blit(
             play_surf,
             (
                 circle_center_x - play_surf.get_width() / 2,
@@ -801,16 +870,9 @@ def draw_left_table(
         label_box = pygame.Rect(int(label_box_left), int(label_box_top), label_box_w, label_box_h)
         grad_rect2 = label_box.inflate(-2, -2)
         if grad_rect2.width > 0 and grad_rect2.height > 0:
-            grad_surf2 = pygame.Surface((grad_rect2.width, grad_rect2.height))
-            for yi in range(grad_rect2.height):
-                t = yi / max(1, grad_rect2.height - 1)
-                r = int(YELLOW[0] + t * (GOLDEN[0] - YELLOW[0]))
-                g = int(YELLOW[1] + t * (GOLDEN[1] - YELLOW[1]))
-                b = int(YELLOW[2] + t * (GOLDEN[2] - YELLOW[2]))
-                pygame.draw.line(grad_surf2, (r, g, b), (0, yi), (grad_rect2.width, yi))
-            surf.blit(grad_surf2, (grad_rect2.left, grad_rect2.top))
-        pygame.draw.rect(surf, GOLDEN, label_box, 1, border_radius=small_radius)
-        surf.blit(
+            layer.blit(gradients.vertical(grad_rect2.size, YELLOW, GOLDEN), grad_rect2.topleft)
+        pygame.draw.rect(layer, GOLDEN, label_box, 1, border_radius=small_radius)
+        layer.blit(
             label_surf2,
             (
                 label_box.centerx - label_surf2.get_width() / 2,
@@ -824,8 +886,7 @@ def draw_left_table(
     ranks = ['K', 'Q', 'J']
     rank_label_map = {'K': 'All Kings', 'Q': 'All Queens', 'J': 'All Jacks'}
     for ridx, rank in enumerate(ranks, start=1):
-        cell_rank = pygame.Rect(x0, y_start + ridx * cell_h, col_w, cell_h)
-        rank_icon_rects[ridx] = cell_rank
+        cell_rank = lay.rank_icon_rects[ridx]
 
         circle_radius = int(min(col_w, cell_h) * 0.18)
         circle_dia    = circle_radius * 2
@@ -838,7 +899,7 @@ def draw_left_table(
         combined_w = img_w + box_pad_horiz + circle_dia
         total_w    = int(combined_w * 1.3)
         label_text = rank_label_map[rank]
-        label_surf2 = label_font.render(label_text, True, BLACK)
+        label_surf2 = render_text(label_font, label_text, BLACK)
         label_h     = label_surf2.get_height() + 8
         base_h      = max(img_h, circle_dia) + box_pad_vert * 2
         total_h     = int(base_h * 1.2)
@@ -851,31 +912,24 @@ def draw_left_table(
         # Gradient “All <Rank>” box
         grad_rect = golden_box.inflate(-2, -2)
         if grad_rect.width > 0 and grad_rect.height > 0:
-            grad_surf = pygame.Surface((grad_rect.width, grad_rect.height))
-            for yi in range(grad_rect.height):
-                t = yi / max(1, grad_rect.height - 1)
-                r = int(YELLOW[0] + t * (GOLDEN[0] - YELLOW[0]))
-                g = int(YELLOW[1] + t * (GOLDEN[1] - YELLOW[1]))
-                b = int(YELLOW[2] + t * (GOLDEN[2] - YELLOW[2]))
-                pygame.draw.line(grad_surf, (r, g, b), (0, yi), (grad_rect.width, yi))
-            surf.blit(grad_surf, (grad_rect.left, grad_rect.top))
-        pygame.draw.rect(surf, GOLDEN, golden_box, 1, border_radius=small_radius)
+            layer.blit(gradients.vertical(grad_rect.size, YELLOW, GOLDEN), grad_rect.topleft)
+        pygame.draw.rect(layer, GOLDEN, golden_box, 1, border_radius=small_radius)
 
         # Rank icon + “Play” circle
         combined_left = box_left + (total_w - combined_w) / 2
         center_y_box  = box_top + total_h / 2
 
-        img_rank = pygame.transform.smoothscale(labels_kjq[rank], (img_w, img_h))
+        img_rank = asset_cache.scaled(f"rank-{rank}", (img_w, img_h), source=labels_kjq[rank])
         img_rect = img_rank.get_rect(center=(int(combined_left + img_w/2), int(center_y_box - total_h*0.1)))
-        surf.blit(img_rank, img_rect)
+        layer.blit(img_rank, img_rect)
 
         circle_center_x = int(combined_left + img_w + box_pad_horiz + circle_radius)
         circle_center_y = int(center_y_box - total_h * 0.1)
-        pygame.gfxdraw.filled_circle(surf, circle_center_x, circle_center_y, circle_radius, GOLDEN)
-        pygame.gfxdraw.aacircle(surf, circle_center_x, circle_center_y, circle_radius, BLACK)
+        pygame.gfxdraw.filled_circle(layer, circle_center_x, circle_center_y, circle_radius, GOLDEN)
+        pygame.gfxdraw.aacircle(layer, circle_center_x, circle_center_y, circle_radius, BLACK)
 
-        play_surf = label_font.render("Play", True, BLACK)
-        surf.blit(
+        play_surf = render_text(label_font, "Play", BLACK)
+        layer.blit(
             play_surf,
             (
                 circle_center_x - play_surf.get_width() / 2,
@@ -892,16 +946,9 @@ def draw_left_table(
 
         grad_rect2 = label_box.inflate(-2, -2)
         if grad_rect2.width > 0 and grad_rect2.height > 0:
-            grad_surf2 = pygame.Surface((grad_rect2.width, grad_rect2.height))
-            for yi in range(grad_rect2.height):
-                t = yi / max(1, grad_rect2.height - 1)
-                r = int(YELLOW[0] + t * (GOLDEN[0] - YELLOW[0]))
-                g = int(YELLOW[1] + t * (GOLDEN[1] - YELLOW[1]))
-                b = int(YELLOW[2] + t * (GOLDEN[2] - YELLOW[2]))
-                pygame.draw.line(grad_surf2, (r, g, b), (0, yi), (grad_rect2.width, yi))
-            surf.blit(grad_surf2, (grad_rect2.left, grad_rect2.top))
-        pygame.draw.rect(surf, GOLDEN, label_box, 1, border_radius=small_radius)
-        surf.blit(
+            layer.blit(gradients.vertical(grad_rect2.size, YELLOW, GOLDEN), grad_rect2.topleft)
+        pygame.draw.rect(layer, GOLDEN, label_box, 1, border_radius=small_radius)
+        layer.blit(
             label_surf2,
             (
                 label_box.centerx - label_surf2.get_width() / 2,
@@ -910,333 +957,492 @@ def draw_left_table(
         )
 
     # ----------------------
-    # 5) Play cells (ribbons)
+    # 5) Play cells (ribbons are drawn per frame)
     # ----------------------
-    ribbon_font = pygame.font.Font(None, max(6, int(small_font.get_height() * 0.6)))
     for ridx, rank in enumerate(ranks, start=1):
         for cidx, suit in enumerate(suits, start=1):
-            cell = pygame.Rect(
-                x0 + col_w * cidx,
-                y_start + ridx * cell_h,
-                col_w,
-                cell_h
-            )
-            box_w = int(col_w * 0.7)
-            box_h = int(cell_h * 0.9)
-            inset_x = int(cell.left + (col_w - box_w) / 2)
-            inset_y = int(cell.top  + (cell_h - box_h) / 2)
-            blue_box = pygame.Rect(inset_x, inset_y, box_w, box_h)
-
-            cell_rects[(ridx, cidx)] = blue_box
+            blue_box = lay.cell_rects[(ridx, cidx)]
+            box_h = blue_box.height
 
             # Draw blue gradient cell
             grad_rect = blue_box.inflate(-2, -2)
             if grad_rect.width > 0 and grad_rect.height > 0:
-                grad_surf = pygame.Surface((grad_rect.width, grad_rect.height))
-                for yi in range(grad_rect.height):
-                    t = yi / max(1, grad_rect.height - 1)
-                    r = int(BLUE_BG_TOP[0] + t * (BLUE_BG_BOTTOM[0] - BLUE_BG_TOP[0]))
-                    g = int(BLUE_BG_TOP[1] + t * (BLUE_BG_BOTTOM[1] - BLUE_BG_TOP[1]))
-                    b = int(BLUE_BG_TOP[2] + t * (BLUE_BG_BOTTOM[2] - BLUE_BG_TOP[2]))
-                    pygame.draw.line(grad_surf, (r, g, b), (0, yi), (grad_rect.width, yi))
-                surf.blit(grad_surf, (grad_rect.left, grad_rect.top))
-            pygame.draw.rect(surf, BLACK, blue_box, 1, border_radius=radius//3)
+                layer.blit(gradients.vertical(grad_rect.size, BLUE_BG_TOP, BLUE_BG_BOTTOM), grad_rect.topleft)
+            pygame.draw.rect(layer, BLACK, blue_box, 1, border_radius=radius//3)
 
             # Rank + suit icons inside
             total_w = int(label_size * 1 + suit_size * 1.2 + 8)
             yc      = blue_box.centery - int(box_h * 0.1)
 
-            img_rank_scaled = pygame.transform.smoothscale(labels_kjq[rank], (label_size, label_size))
-            surf.blit(
+            img_rank_scaled = asset_cache.scaled(f"rank-{rank}", (label_size, label_size), source=labels_kjq[rank])
+            layer.blit(
                 img_rank_scaled,
                 img_rank_scaled.get_rect(
                     center=(int(blue_box.centerx - total_w/2 + label_size/2), yc)
                 )
             )
 
-            img_s = pygame.transform.smoothscale(labels_suits[suit], (int(suit_size*1.2), int(suit_size*1.2)))
-            surf.blit(
+            img_s = asset_cache.scaled(f"suit-{suit}", (int(suit_size*1.2), int(suit_size*1.2)), source=labels_suits[suit])
+            layer.blit(
                 img_s,
                 img_s.get_rect(
                     center=(int(blue_box.centerx - total_w/2 + label_size + 8 + (int(suit_size*1.2))/2), yc)
                 )
             )
 
-            # Ribbon (colored rectangle at bottom of cell)
-            ribbon_h = int(box_h * 0.2)
-            ribbon_w = int(box_w * 1.05)
-            ribbon_x = int(blue_box.left - (ribbon_w - box_w)/2)
-            ribbon_y = int(blue_box.bottom - ribbon_h - int(box_h * 0.1))
-            ribbon_rect = pygame.Rect(ribbon_x, ribbon_y, ribbon_w, ribbon_h)
-            ribbon_rects[(ridx, cidx)] = ribbon_rect
-
-            # Determine ribbon color
-            if highlight_cell == (ridx, cidx):
-                blink_color = GREEN if highlight_on else RED
-                color = blink_color
-            else:
-                color = BLUE_RIBBON if (ridx, cidx) in placed_chips else RED
 
-            pygame.gfxdraw.filled_polygon(
-                surf,
-                [ribbon_rect.topleft, ribbon_rect.topright,
-                 ribbon_rect.bottomright, ribbon_rect.bottomleft],
-                color
-            )
-            pygame.gfxdraw.aapolygon(
-                surf,
-                [ribbon_rect.topleft, ribbon_rect.topright,
-                 ribbon_rect.bottomright, ribbon_rect.bottomleft],
-                BLACK
-            )
-
-            if (ridx, cidx) not in placed_chips:
-                play_surf = ribbon_font.render("Play", True, BLACK)
-                surf.blit(
-                    play_surf,
-                    (
-                        ribbon_rect.left + (ribbon_w - play_surf.get_width())/2,
-                        ribbon_rect.top  + (ribbon_h - play_surf.get_height())/2
-                    )
-                )
+    buttons = _new_layer(size)
 
     # ----------------------
-    # 6) Draw placed chips on ribbons
+    # 8) 2×2 button grid (“Current Bet:” is drawn per frame)
     # ----------------------
-    for (ridx, cidx), total_amt in placed_chips.items():
-        if (ridx, cidx) in ribbon_rects:
-            rrect = ribbon_rects[(ridx, cidx)]
-            cx, cy = rrect.center
-            chip_radius = int(min(cell_h, col_w) // 6)
-            pygame.gfxdraw.filled_circle(surf, cx, cy, chip_radius, chip_defs[0]['color'])
-            pygame.gfxdraw.aacircle(surf, cx, cy, chip_radius, BLACK)
-            amt_surf = small_font.render(str(total_amt), True, WHITE)
-            surf.blit(amt_surf, amt_surf.get_rect(center=(cx, cy)))
+    bet_button_rect    = lay.bet_button_rect
+    clear_button_rect  = lay.clear_button_rect
+    double_button_rect = lay.double_button_rect
+    repeat_button_rect = lay.repeat_button_rect
+    btn_h = bet_button_rect.height
 
-    # ----------------------
-    # 7) Draw chip tray below table
-    # ----------------------
-    chip_radius  = int(min(cell_h, col_w) // 3)
-    chip_dia     = chip_radius * 2
-    chip_spacing = chip_dia + 20
-    start_x      = x0 + 10
-    chips_y      = y0_adj + table_h + chip_radius + 20
-    SS = 4
-
-    for idx, chip in enumerate(chip_defs):
-        cx = start_x + idx * chip_spacing
-        cy = chips_y
-
-        hr_dia    = chip_dia * SS
-        hr_radius = chip_radius * SS
-        chip_body_hr = pygame.Surface((hr_dia, hr_dia), pygame.SRCALPHA)
+    # “Current Bet:” sits above the “Bet” button
+    bet_text_pos = (bet_button_rect.x + 30, bet_button_rect.y - small_font.get_height() - 8)
 
-        pygame.gfxdraw.filled_circle(chip_body_hr, hr_radius, hr_radius, hr_radius, chip['color'])
-        pygame.gfxdraw.aacircle(chip_body_hr, hr_radius, hr_radius, hr_radius, BLACK)
+    # Green gradient colors and corner radius
+    DARK_GREEN  = (0, 100, 0)
+    radius_btn  = btn_h // 2
+    pad_x       = 8   # horizontal padding
+    pad_y       = 4   # vertical padding
 
-        # draw stripes on the large chip
-        strip_count     = 8
-        strip_ang_width = 20
-        outer_r_hr = hr_radius
-        inner_r_hr = int(hr_radius * 0.7)
-        for i in range(strip_count):
-            a    = math.radians(i * (360 / strip_count))
-            half = math.radians(strip_ang_width / 2)
-            p1 = (hr_radius + int((outer_r_hr - 1) * math.cos(a + half)),
-                  hr_radius + int((outer_r_hr - 1) * math.sin(a + half)))
-            p2 = (hr_radius + int((outer_r_hr - 1) * math.cos(a - half)),
-                  hr_radius + int((outer_r_hr - 1) * math.sin(a - half)))
-            p3 = (hr_radius + int(inner_r_hr * math.cos(a - half)),
-                  hr_radius + int(inner_r_hr * math.sin(a - half)))
-            p4 = (hr_radius + int(inner_r_hr * math.cos(a + half)),
-                  hr_radius + int(inner_r_hr * math.sin(a + half)))
-            pygame.gfxdraw.filled_polygon(chip_body_hr, [p1, p2, p3, p4], WHITE)
-            pygame.gfxdraw.aapolygon(chip_body_hr,   [p1, p2, p3, p4], BLACK)
+    # Top-Left: “Bet”
+    pygame.draw.rect(buttons, DARK_GREEN, bet_button_rect, border_radius=radius_btn)
+    pygame.draw.rect(buttons, BUTTON_BORDER, bet_button_rect, 1, border_radius=radius_btn)
+    btn_txt_surf = render_text(small_font, "Bet", WHITE)
+    inner = bet_button_rect.inflate(-pad_x*2, -pad_y*2)
+    buttons.blit(btn_txt_surf, btn_txt_surf.get_rect(center=inner.center))
 
-        # center circle on the large chip
-        center_r_hr = int(hr_radius * 0.6)
-        pygame.gfxdraw.filled_circle(chip_body_hr, hr_radius, hr_radius, center_r_hr, WHITE)
-        pygame.gfxdraw.aacircle(chip_body_hr, hr_radius, hr_radius, center_r_hr, BLACK)
+    # Top-Right: “Clear Bet”
+    pygame.draw.rect(buttons, DARK_GREEN, clear_button_rect, border_radius=radius_btn)
+    pygame.draw.rect(buttons, BUTTON_BORDER, clear_button_rect, 1, border_radius=radius_btn)
+    clear_txt_surf = render_text(small_font, "Clear Bet", WHITE)
+    inner = clear_button_rect.inflate(-pad_x*2, -pad_y*2)
+    buttons.blit(clear_txt_surf, clear_txt_surf.get_rect(center=inner.center))
+
+    # Second row-left: “Double Bet”
+    pygame.draw.rect(buttons, DARK_GREEN, double_button_rect, border_radius=radius_btn)
+    pygame.draw.rect(buttons, BUTTON_BORDER, double_button_rect, 1, border_radius=radius_btn)
+    double_txt_surf = render_text(small_font, "Double Bet", WHITE)
+    inner = double_button_rect.inflate(-pad_x*2, -pad_y*2)
+    buttons.blit(double_txt_surf, double_txt_surf.get_rect(center=inner.center))
+
+    # Second row-right: “Repeat Bet”
+    pygame.draw.rect(buttons, DARK_GREEN, repeat_button_rect, border_radius=radius_btn)
+    pygame.draw.rect(buttons, BUTTON_BORDER, repeat_button_rect, 1, border_radius=radius_btn)
+    repeat_txt_surf = render_text(small_font, "Repeat Bet", WHITE)
+    inner = repeat_button_rect.inflate(-pad_x*2, -pad_y*2)
+    buttons.blit(repeat_txt_surf, repeat_txt_surf.get_rect(center=inner.center))
 
-        chip_body = pygame.transform.smoothscale(chip_body_hr, (chip_dia, chip_dia))
+    return {
+        "key":                key,
+        "pieces":             [_crop_layer(layer, table_rect),
+                               _crop_layer(buttons, bet_button_rect.union(repeat_button_rect))],
+        "bet_text_pos":       bet_text_pos,
+    }
+
+
+# --------------------------------------
+# Chip tray
+# --------------------------------------
+def draw_chip_tray(surf, now_ts, x0, y0, small_font, rows=4, cols=5):
+    """
+    Draws the chip tray under the betting board (the selected chip spins).
+    Returns the rect it covered.
+    """
+    BLACK = (0, 0, 0)
+
+    lay = _board_layout(surf, x0, y0, rows, cols)
+    chip_radius = lay.chip_radius
+    tray_rect   = pygame.Rect(lay.chip_centers[0], (0, 0))
+
+    for idx, (chip, (cx, cy)) in enumerate(zip(chip_defs, lay.chip_centers)):
+        chip_body = _chip_body(chip_radius, chip['color'])
         chip_body_rect = chip_body.get_rect()
-        amt_surf = small_font.render(str(chip['amount']), True, BLACK)
+        amt_surf = render_text(small_font, str(chip['amount']), BLACK)
 
         if selected_chip == idx:
             angle = -(now_ts * 60) % 360
-            rotated_body = pygame.transform.rotate(chip_body, angle)
+            rotated_body = _chip_frame(chip_radius, chip['color'], angle)
             rot_rect     = rotated_body.get_rect(center=(cx, cy))
-            surf.blit(rotated_body, rot_rect)
+            tray_rect.union_ip(surf.blit(rotated_body, rot_rect))
             surf.blit(amt_surf, amt_surf.get_rect(center=rot_rect.center))
-            chip_rects.append(pygame.Rect(cx-chip_radius, cy-chip_radius, chip_dia, chip_dia))
         else:
             chip_body_rect.center = (cx, cy)
-            surf.blit(chip_body, chip_body_rect)
+            tray_rect.union_ip(surf.blit(chip_body, chip_body_rect))
             surf.blit(amt_surf, amt_surf.get_rect(center=(cx, cy)))
-            chip_rects.append(pygame.Rect(cx-chip_radius, cy-chip_radius, chip_dia, chip_dia))
 
-    # ----------------------
-    # 8) “Current Bet:” text + 2×2 buttons
-    # ----------------------
-    total_bet   = sum(placed_chips.values())
-    bet_text    = small_font.render(f"Current Bet: {total_bet}", True, WHITE)
+    return tray_rect
 
-    # Align “Current Bet:” left edge with left edge of the “Bet” button:
-    btn_w        = 100
-    btn_h        = 30
-    btn_spacing  = 8
 
-    # Calculate total width of two buttons + spacing
-    total_btns_w = btn_w * 2 + btn_spacing
-    left_shift   = 70   # push everything further left; adjust as needed
-    margin       = 180
+def chip_tray_state(now_ts):
+    """Hashable key that changes whenever draw_chip_tray would draw differently."""
+    if selected_chip is None:
+        return None
+    return selected_chip, _chip_step(-(now_ts * 60) % 360)
 
-    btn_x_base   = sw - margin - total_btns_w - left_shift
-    btn_y_top    = y0_adj + table_h + chip_dia + 30  # vertical position just below the chips
 
-    # Draw “Current Bet:” so its left == btn_x_base
-    surf.blit(bet_text, (btn_x_base + 30, btn_y_top - small_font.get_height() - 8))
+# --------------------------------------
+# History row
+# --------------------------------------
+HISTORY_CARDS = {
+    0: ("K", "Spades"),   1: ("K", "Diamond"),
+    2: ("K", "Clubs"),    3: ("K", "Hearts"),
+    4: ("Q", "Spades"),   5: ("Q", "Diamond"),
+    6: ("Q", "Clubs"),    7: ("Q", "Hearts"),
+    8: ("J", "Spades"),   9: ("J", "Diamond"),
+    10: ("J", "Clubs"),  11: ("J", "Hearts"),
+}
+HISTORY_BLINK_MS = 500
 
-    # Green gradient colors and corner radius
-    DARK_GREEN  = (0, 100, 0)
-    radius_btn  = btn_h // 2
-    pad_x       = 8   # horizontal padding
-    pad_y       = 4   # vertical padding
+_history_strip = None   # dict: key, piece (older boxes pre-rendered), box rects
 
-    # Top-Left: “Bet”
-    bet_button_rect = pygame.Rect(btn_x_base, btn_y_top, btn_w, btn_h)
-    pygame.draw.rect(surf, DARK_GREEN, bet_button_rect, border_radius=radius_btn)
-    pygame.draw.rect(surf, BUTTON_BORDER, bet_button_rect, 1, border_radius=radius_btn)
-    btn_txt_surf = small_font.render("Bet", True, WHITE)
-    inner = bet_button_rect.inflate(-pad_x*2, -pad_y*2)
-    surf.blit(btn_txt_surf, btn_txt_surf.get_rect(center=inner.center))
 
-    # Top-Right: “Clear Bet”
-    clear_button_rect = pygame.Rect(
-        btn_x_base + btn_w + btn_spacing,
-        btn_y_top,
-        btn_w,
-        btn_h
-    )
-    pygame.draw.rect(surf, DARK_GREEN, clear_button_rect, border_radius=radius_btn)
-    pygame.draw.rect(surf, BUTTON_BORDER, clear_button_rect, 1, border_radius=radius_btn)
-    clear_txt_surf = small_font.render("Clear Bet", True, WHITE)
-    inner = clear_button_rect.inflate(-pad_x*2, -pad_y*2)
-    surf.blit(clear_txt_surf, clear_txt_surf.get_rect(center=inner.center))
+def history_signature(history):
+    """
+    Cheap change key for app_globals.history_json: its length plus the
+    newest and oldest entries. The list is replaced once per cycle, so this
+    avoids walking every entry each frame.
+    """
+    if not history:
+        return None
+    first, last = history[0], history[-1]
+    return (len(history),
+            first['created_time'], first['result_number'],
+            last['created_time'], last['result_number'])
+
+
+def _draw_history_box(surf, rect, item, box_size, labels_kjq, labels_suits, fill=None):
+    """One history box: background (gradient unless `fill`), time, rank and suit."""
+    DARK_BORDER = (20, 20, 20)
+    grad_rect = rect.inflate(-2, -2)
+    if fill is not None:
+        pygame.draw.rect(surf, fill, grad_rect, border_radius=4)
+    else:
+        surf.blit(gradients.vertical(grad_rect.size, (255, 255, 255), (0, 0, 30)), grad_rect.topleft)
+    pygame.draw.rect(surf, DARK_BORDER, rect, 1, border_radius=4)
+
+    time_font = get_font(None, max(14, int(box_size * 0.2)))
+    time_surf = render_text(time_font, item['created_time'], (0, 0, 0))
+    time_rect = time_surf.get_rect(midtop=(rect.centerx, rect.top + 4))
+    surf.blit(time_surf, time_rect)
+
+    rank_key, suit_key = HISTORY_CARDS.get(item['result_number'], ("J", "Hearts"))
+    icon_size = int(box_size * 0.4)
+    rank_img  = asset_cache.scaled(f"rank-{rank_key}", (icon_size, icon_size), source=labels_kjq[rank_key])
+    rank_rect = rank_img.get_rect(midtop=(rect.centerx, time_rect.bottom + 2))
+    surf.blit(rank_img, rank_rect)
+
+    suit_img  = asset_cache.scaled(f"suit-{suit_key}", (icon_size, icon_size), source=labels_suits[suit_key])
+    suit_rect = suit_img.get_rect(midtop=(rect.centerx, rank_rect.bottom + 2))
+    surf.blit(suit_img, suit_rect)
+    # The icons can hang below the box
+    return rect.unionall([time_rect, rank_rect, suit_rect])
+
+
+def _build_history_strip(key, size, rects, box_size, history, labels_kjq, labels_suits):
+    # Per-pixel alpha rather than a colour key: the icons hang past the boxes
+    # and their soft edges must blend with whatever is behind the strip
+    layer  = pygame.Surface(size, pygame.SRCALPHA)
+    bounds = None
+    for rect, item in zip(rects[1:], history[1:]):
+        r = _draw_history_box(layer, rect, item, box_size, labels_kjq, labels_suits)
+        bounds = r if bounds is None else bounds.union(r)
+
+    piece = None
+    if bounds is not None:
+        bounds = bounds.clip(layer.get_rect())
+        surface = layer.subsurface(bounds).copy()
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        piece = (surface, bounds.topleft)
+    return {"key": key, "piece": piece, "rects": rects, "box_size": box_size}
+
+
+def _history_strip_for(surf, x0, y0, labels_kjq, labels_suits, rows, cols):
+    """Cached strip for the current history_json, rebuilt when it or the layout changes."""
+    global _history_strip
+    history = getattr(app_globals, "history_json", [])
+    if not history:
+        return None, history
+    key = (surf.get_size(), x0, y0, rows, cols, history_signature(history),
+           tuple(labels_kjq.items()), tuple(labels_suits.items()))
+    if _history_strip is None or _history_strip["key"] != key:
+        lay = _board_layout(surf, x0, y0, rows, cols)
+        box_size, rects = lay.history_box_size, lay.history_rects(len(history))
+        _history_strip = _build_history_strip(key, surf.get_size(), rects, box_size,
+                                              history, labels_kjq, labels_suits)
+    return _history_strip, history
+
+
+def draw_history_strip(surf, x0, y0, labels_kjq, labels_suits, rows=4, cols=5):
+    """
+    Draws every history box except the newest in one blit from a cached
+    strip, rebuilt only when history_json changes. Returns the rect covered.
+    """
+    strip, _ = _history_strip_for(surf, x0, y0, labels_kjq, labels_suits, rows, cols)
+    if strip is None or strip["piece"] is None:
+        return None
+    piece, pos = strip["piece"]
+    return surf.blit(piece, pos)
+
+
+def draw_history_latest(surf, x0, y0, labels_kjq, labels_suits, rows=4, cols=5):
+    """Draws the newest history box with its blinking background. Returns the rect covered."""
+    strip, history = _history_strip_for(surf, x0, y0, labels_kjq, labels_suits, rows, cols)
+    if strip is None:
+        return None
+    blink_phase = (pygame.time.get_ticks() // HISTORY_BLINK_MS) % 2
+    blink_bg    = (255, 255, 255) if blink_phase == 0 else (0, 255, 0)
+    return _draw_history_box(surf, strip["rects"][0], history[0], strip["box_size"],
+                             labels_kjq, labels_suits, fill=blink_bg)
+
+
+def history_state():
+    """Hashable key that changes whenever draw_history_latest would draw differently."""
+    history = getattr(app_globals, "history_json", [])
+    if not history:
+        return None
+    return history_signature(history), (pygame.time.get_ticks() // HISTORY_BLINK_MS) % 2
 
-    # Second row-left: “Double Bet”
-    double_button_rect = pygame.Rect(
-        btn_x_base,
-        btn_y_top + btn_h + btn_spacing,
-        btn_w,
-        btn_h
-    )
-    pygame.draw.rect(surf, DARK_GREEN, double_button_rect, border_radius=radius_btn)
-    pygame.draw.rect(surf, BUTTON_BORDER, double_button_rect, 1, border_radius=radius_btn)
-    double_txt_surf = small_font.render("Double Bet", True, WHITE)
-    inner = double_button_rect.inflate(-pad_x*2, -pad_y*2)
-    surf.blit(double_txt_surf, double_txt_surf.get_rect(center=inner.center))
 
-    # Second row-right: “Repeat Bet”
-    repeat_button_rect = pygame.Rect(
-        btn_x_base + btn_w + btn_spacing,
-        btn_y_top + btn_h + btn_spacing,
-        btn_w,
-        btn_h
+def left_table_state(highlight_cell=None, highlight_on=False):
+    """
+    Hashable key that changes whenever draw_left_table (without the chip
+    tray and history row) would draw differently: bets, ribbon highlight
+    and Withdraw time.
+    """
+    return (
+        app_globals.Withdraw_time,
+        tuple(placed_chips.items()),
+        highlight_cell, highlight_on,
     )
-    pygame.draw.rect(surf, DARK_GREEN, repeat_button_rect, border_radius=radius_btn)
-    pygame.draw.rect(surf, BUTTON_BORDER, repeat_button_rect, 1, border_radius=radius_btn)
-    repeat_txt_surf = small_font.render("Repeat Bet", True, WHITE)
-    inner = repeat_button_rect.inflate(-pad_x*2, -pad_y*2)
-    surf.blit(repeat_txt_surf, repeat_txt_surf.get_rect(center=inner.center))
 
 
+# --------------------------------------
+# Main drawing function
+# --------------------------------------
+def draw_left_table(
+    surf,
+    now_ts,
+    labels_kjq,
+    labels_suits,
+    x0,
+    y0,
+    label_size,
+    suit_size,
+    small_font,
+    rows=4,
+    cols=5,
+    highlight_cell=None,
+    highlight_on=False,
+    draw_tray=True,
+    draw_history=True
+):
+    """
+    Draws:
+      1) Table background + borders
+      2) “Withdraw time” header
+      3) Suit header cells (All Spades, All Diamond, etc.)
+      4) Rank header cells (All Kings, All Queens, All Jacks)
+      5) Play cells with ribbons
+      6) Placed chips on ribbons
+      7) Chip tray below
+      8) “Current Bet:” text + 2×2 button grid
+      9) History row under everything
+
+    The table, header boxes, play cells and buttons come from a cached
+    static layer (see _build_board_static); only the parts that change
+    are drawn each frame. With draw_tray=False the chip tray is left to a
+    separate draw_chip_tray call, and with draw_history=False the history
+    row to draw_history_strip / draw_history_latest. Returns the rects
+    drawn over.
+    """
+    global board_layout, _board_static
+
+    WHITE          = (255, 255, 255)
+    RED            = (200,   0,   0)
+    BLUE_RIBBON    = (  0,   0, 200)
+    BLACK          = (  0,   0,   0)
+    GREEN          = (  0, 255,   0)
+
+    # Geometry shared with handle_click, computed once per screen size
+    lay = board_layout = _board_layout(surf, x0, y0, rows, cols)
+
+    # Static layer: rebuilt only when the layout, fonts or assets change
+    key = (lay, label_size, suit_size, small_font,
+           tuple(labels_kjq.items()), tuple(labels_suits.items()))
+    if _board_static is None or _board_static["key"] != key:
+        _board_static = _build_board_static(key, surf.get_size(), lay,
+                                            labels_kjq, labels_suits,
+                                            label_size, suit_size, small_font)
+    static = _board_static
+
     # ----------------------
-    # 9) History row (unchanged)
+    # 1) Table, headers, play cells and buttons
     # ----------------------
-    history = getattr(app_globals, "history_json", [])
-    if history:
-        # Compute base sizes
-        box_size   = int(min(col_w, cell_h) * 0.7)
-        narrow_w   = box_size // 2
-        spacing    = 4  # fixed gap between boxes
-        text_h     = small_font.get_height()
-
-        # Button vertical position (as defined earlier)
-        btn_y_top  = y0_adj + table_h + chip_dia + 10
-
-        # Place history just beneath the two rows of buttons
-        base_y     = btn_y_top + btn_h * 2 - 14
-
-        # Build list of widths: first box full width, others narrower
-        narrow_w = int(box_size * 0.75)
-        widths   = [box_size] + [narrow_w] * (len(history) - 1)
-        total_width = sum(widths) + spacing * (len(history) - 1)
-        start_x     = x0 + (table_w - total_width) // 2
-
-        mapping = {
-            0: ("K", "Spades"),   1: ("K", "Diamond"),
-            2: ("K", "Clubs"),    3: ("K", "Hearts"),
-            4: ("Q", "Spades"),   5: ("Q", "Diamond"),
-            6: ("Q", "Clubs"),    7: ("Q", "Hearts"),
-            8: ("J", "Spades"),   9: ("J", "Diamond"),
-        10: ("J", "Clubs"),  11: ("J", "Hearts"),
-        }
-
-        blink_color_1 = (255, 255, 255)
-        blink_color_2 = (  0, 255,   0)
-        blink_speed   = 500
-        time_ms       = pygame.time.get_ticks()
-        blink_phase   = (time_ms // blink_speed) % 2
-        blink_bg      = blink_color_1 if blink_phase == 0 else blink_color_2
-
-        time_font     = pygame.font.SysFont(None, max(14, int(box_size * 0.2)))
-        TIME_TEXT_COLOR = (0, 0, 0)
-
-        x_cursor = start_x
-        for idx, item in enumerate(history):
-            w = widths[idx]
-            bx = x_cursor
-            by = base_y
-            rect     = pygame.Rect(bx, by, w, box_size)
-            grad_rect = rect.inflate(-2, -2)
-
-            if idx == 0:
-                pygame.draw.rect(surf, blink_bg, grad_rect, border_radius=4)
-            else:
-                grad_surf = pygame.Surface((grad_rect.width, grad_rect.height))
-                for yi in range(grad_rect.height):
-                    t = yi / max(1, grad_rect.height - 1)
-                    r = int(255 * (1 - t))
-                    g = int(255 * (1 - t))
-                    b = int(255 * (1 - t) + 30 * t)
-                    pygame.draw.line(grad_surf, (r, g, b), (0, yi), (grad_rect.width, yi))
-                surf.blit(grad_surf, (grad_rect.left, grad_rect.top))
+    drawn = [surf.blit(piece, pos) for piece, pos in static["pieces"]]
+
+    # ----------------------
+    # 2) “Withdraw time” value
+    # ----------------------
+    header_cell = lay.withdraw_cell
+    value_surf  = render_text(small_font, app_globals.Withdraw_time, WHITE)
+    surf.blit(value_surf, (header_cell.centerx - value_surf.get_width() / 2, header_cell.centery + 2))
+
+    # ----------------------
+    # 5) Ribbons: red, blue once a chip is placed, blinking when highlighted
+    # ----------------------
+    ribbon_font = get_font(None, max(6, int(small_font.get_height() * 0.6)))
+    for (ridx, cidx), ribbon_rect in lay.ribbon_rects.items():
+        ribbon_w, ribbon_h = ribbon_rect.size
+
+        # Determine ribbon color
+        if highlight_cell == (ridx, cidx):
+            blink_color = GREEN if highlight_on else RED
+            color = blink_color
+        else:
+            color = BLUE_RIBBON if (ridx, cidx) in placed_chips else RED
+
+        pygame.gfxdraw.filled_polygon(
+            surf,
+            [ribbon_rect.topleft, ribbon_rect.topright,
+             ribbon_rect.bottomright, ribbon_rect.bottomleft],
+            color
+        )
+        pygame.gfxdraw.aapolygon(
+            surf,
+            [ribbon_rect.topleft, ribbon_rect.topright,
+             ribbon_rect.bottomright, ribbon_rect.bottomleft],
+            BLACK
+        )
 
-            pygame.draw.rect(surf, DARK_BORDER, rect, 1, border_radius=4)
+        if (ridx, cidx) not in placed_chips:
+            play_surf = render_text(ribbon_font, "Play", BLACK)
+            surf.blit(
+                play_surf,
+                (
+                    ribbon_rect.left + (ribbon_w - play_surf.get_width())/2,
+                    ribbon_rect.top  + (ribbon_h - play_surf.get_height())/2
+                )
+            )
 
-            time_surf = time_font.render(item['created_time'], True, TIME_TEXT_COLOR)
-            time_rect = time_surf.get_rect(midtop=(rect.centerx, rect.top + 4))
-            surf.blit(time_surf, time_rect)
+    # ----------------------
+    # 6) Draw placed chips on ribbons
+    # ----------------------
+    for (ridx, cidx), total_amt in placed_chips.items():
+        if (ridx, cidx) in lay.ribbon_rects:
+            rrect = lay.ribbon_rects[(ridx, cidx)]
+            cx, cy = rrect.center
+            chip_radius = lay.placed_chip_radius
+            pygame.gfxdraw.filled_circle(surf, cx, cy, chip_radius, chip_defs[0]['color'])
+            pygame.gfxdraw.aacircle(surf, cx, cy, chip_radius, BLACK)
+            amt_surf = render_text(small_font, str(total_amt), WHITE)
+            surf.blit(amt_surf, amt_surf.get_rect(center=(cx, cy)))
 
-            rank_key, suit_key = mapping.get(item['result_number'], ("J", "Hearts"))
-            icon_size = int(box_size * 0.4)
-            rank_img  = pygame.transform.smoothscale(labels_kjq[rank_key], (icon_size, icon_size))
-            rank_rect = rank_img.get_rect(midtop=(rect.centerx, time_rect.bottom + 2))
-            surf.blit(rank_img, rank_rect)
+    # ----------------------
+    # 7) Chip tray below table
+    # ----------------------
+    if draw_tray:
+        drawn.append(draw_chip_tray(surf, now_ts, x0, y0, small_font, rows, cols))
+
+    # ----------------------
+    # 8) “Current Bet:” text
+    # ----------------------
+    total_bet = sum(placed_chips.values())
+    bet_text  = render_text(small_font, f"Current Bet: {total_bet}", WHITE)
+    drawn.append(surf.blit(bet_text, static["bet_text_pos"]))
 
-            suit_img  = pygame.transform.smoothscale(labels_suits[suit_key], (icon_size, icon_size))
-            suit_rect = suit_img.get_rect(midtop=(rect.centerx, rank_rect.bottom + 2))
-            surf.blit(suit_img, suit_rect)
 
-            # Advance cursor for next box
-            x_cursor += w + spacing
+    # ----------------------
+    # 9) History row: older boxes from the cached strip, newest one blinking
+    # ----------------------
+    if draw_history:
+        for rect in (draw_history_strip(surf, x0, y0, labels_kjq, labels_suits, rows, cols),
+                     draw_history_latest(surf, x0, y0, labels_kjq, labels_suits, rows, cols)):
+            if rect is not None:
+                drawn.append(rect)
 
+    return drawn
 
 
 # --------------------------------------
 # Click-handling function
 # --------------------------------------
+def _send_bet(payload):
+    """Worker side of the Bet button: POST the bets and print the ticket."""
+    resp = http_client.post(
+        "place_bet",
+        json=payload,
+        headers={"Content-Type": "application/json"}
+    )
+    #print("Status:", resp.status_code)
+    #print("Raw response text:", resp.text)
+    resp.raise_for_status()
+
+    data = resp.json()
+    #print(json.dumps(data, indent=2))
+    try:
+        print_json_silent(data)
+    except Exception as e:
+        # The bet is placed either way; a printer problem mustn't undo it
+        print("Error printing ticket:", e)
+    return data
+
+
+def _bet_done(sent, total_bet_amount, data, error):
+    """Back on the UI thread once the bet call has finished."""
+    global selected_chip, last_placed_chips
+
+    if error is not None:
+        print("Error placing bet:", error)
+        if http_client.never_sent(error):
+            # Nothing reached the server: the chips stay on the board
+            app_globals.user_data_points += total_bet_amount
+            app_globals.message = "Bet not placed: server unreachable. Please try again."
+        elif isinstance(error, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+            # No reply: it may have gone through; the History screen will show the ticket if so
+            for cell in sent:
+                placed_chips.pop(cell, None)
+            poll_policy.policy.note_action()
+            app_globals.message = "No reply to the bet. Check History before betting again."
+        else:
+            # The server answered with an error status or a reply we can't
+            # read: no ticket came back, so the chips stay on the board
+            app_globals.user_data_points += total_bet_amount
+            poll_policy.policy.note_action()        # the poll corrects the balance if it did go through
+            if isinstance(error, requests.exceptions.HTTPError):
+                app_globals.message = f"Bet rejected by server ({error.response.status_code}). Please try again."
+            else:
+                app_globals.message = "Bet not confirmed: unreadable reply from server. Please try again."
+        app_globals.message_time = pygame.time.get_ticks()
+        return
+
+    # --- clear the bets that were sent (chips added meanwhile stay) ---
+    last_placed_chips = dict(sent)
+    poll_policy.policy.note_action()        # fetch the new ticket now
+    for cell, amt in sent.items():
+        left = placed_chips.get(cell, 0) - amt
+        if left > 0:
+            placed_chips[cell] = left
+        else:
+            placed_chips.pop(cell, None)
+    selected_chip = None
+
+    # --- NEW: show success message ---
+    if data.get('status') == 'success':
+        payload = data.get('data', {})           # the nested object
+        ticket_serial = payload.get('serial')  
+        app_globals.message = f"Bet was placed successfully: Ticket Id - {ticket_serial}"
+        # record when we showed it
+        app_globals.message_time = pygame.time.get_ticks()
+
+
 def handle_click(mouse_pos, compute_countdown_fn):
     remaining, _ = compute_countdown_fn()
     #print('remaining', remaining)
@@ -1250,16 +1456,23 @@ def handle_click(mouse_pos, compute_countdown_fn):
     6) If a chip is selected and you click a rank/suit/icon → add that chip’s amount.
     7) Click outside → deselect.
     """
-    global selected_chip, placed_chips, last_placed_chips
+    global selected_chip, placed_chips
 
-    # — Bet button —
-    # … inside your event loop, where you handle the bet button click …
+    # Hit-test against the board layout draw_left_table last drew
+    lay = board_layout
+    if lay is None:
+        return
+    kind, key = _board_hit_index(lay).hit(mouse_pos) or (None, None)
 
-    if bet_button_rect and bet_button_rect.collidepoint(mouse_pos):
+    # — Bet button —
+    if kind == "bet":
         if remaining < 5:
             app_globals.message      = "Betting Time is Over. Wait for wheel to stop."
             app_globals.message_time = pygame.time.get_ticks()
             return
+        if net_executor.pending("bet"):
+            # One bet on the wire at a time
+            return
         total_bet_amount = sum(amt for (_, _), amt in placed_chips.items())
         if total_bet_amount > 0:
             payload = {
@@ -1272,121 +1485,41 @@ def handle_click(mouse_pos, compute_countdown_fn):
             # optimistically deduct points
             app_globals.user_data_points -= total_bet_amount
 
-            resp = requests.post(
-                "https://spintofortune.in/api/app_place_bet.php",
-                json=payload,
-                headers={"Content-Type": "application/json"}
-            )
-            #print("Status:", resp.status_code)
-            #print("Raw response text:", resp.text)
-            resp.raise_for_status()
-
-            data = resp.json()
-            #print(json.dumps(data, indent=2))
-            print_json_silent(data)
-
-            # --- clear all placed bets ---
-            last_placed_chips = placed_chips.copy()
-            placed_chips.clear()
-            selected_chip = None
-
-            # --- NEW: show success message ---
-            if data.get('status') == 'success':
-                payload = data.get('data', {})           # the nested object
-                ticket_serial = payload.get('serial')  
-                app_globals.message = f"Bet was placed successfully: Ticket Id - {ticket_serial}"
-                # record when we showed it
-                app_globals.message_time = pygame.time.get_ticks()
-
-                return
-
-
-    # 2) Tray‐chip selection
-    for idx, rect in enumerate(chip_rects):
-        if rect.collidepoint(mouse_pos):
-            selected_chip = idx
+            # The call runs on a worker; _bet_done clears the board when it's back
+            sent = placed_chips.copy()
+            net_executor.submit(
+                _send_bet, payload, key="bet", label="Placing bet...",
+                on_done=lambda data, error: _bet_done(sent, total_bet_amount, data, error))
             return
 
-    # 3) Place bets if a chip is selected
-    if selected_chip is not None:
-        # Rank row
-        for ridx, rect in rank_icon_rects.items():
-            if rect.collidepoint(mouse_pos):
-                for (r, c) in cell_rects:
-                    if r == ridx:
-                        placed_chips[(r, c)] = placed_chips.get((r, c), 0) + chip_defs[selected_chip]['amount']
-                return
-        # Suit column
-        for cidx, rect in suit_icon_rects.items():
-            if rect.collidepoint(mouse_pos):
-                for (r, c) in cell_rects:
-                    if c == cidx:
-                        placed_chips[(r, c)] = placed_chips.get((r, c), 0) + chip_defs[selected_chip]['amount']
-                return
-        # Individual cell
-        for (ridx, cidx), rect in cell_rects.items():
-            if rect.collidepoint(mouse_pos):
-                placed_chips[(ridx, cidx)] = placed_chips.get((ridx, cidx), 0) + chip_defs[selected_chip]['amount']
-                return
-
-
-    # — Clear Bet button —
-    if clear_button_rect and clear_button_rect.collidepoint(mouse_pos):
-        if remaining < 5:
-            app_globals.message      = "Betting Time is Over. Wait for wheel to stop."
-            app_globals.message_time = pygame.time.get_ticks()
-            return
-        placed_chips.clear()
-        selected_chip = None
+    # — Tray-chip selection —
+    elif kind == "chip":
+        selected_chip = key
         return
 
-    # — Double Bet button —
-    if double_button_rect and double_button_rect.collidepoint(mouse_pos):
-        if remaining < 5:
-            app_globals.message      = "Betting Time is Over. Wait for wheel to stop."
-            app_globals.message_time = pygame.time.get_ticks()
-            return
-        for key in list(placed_chips):
-            placed_chips[key] *= 2
+    # — Place bets if a chip is selected: a whole rank row, suit column or one cell —
+    elif kind in ("rank", "suit", "cell") and selected_chip is not None:
+        amount = chip_defs[selected_chip]['amount']
+        for (r, c) in lay.cell_rects:
+            if (kind == "rank" and r == key) or (kind == "suit" and c == key) or (r, c) == key:
+                placed_chips[(r, c)] = placed_chips.get((r, c), 0) + amount
         return
 
-    # — Repeat Bet button —
-    if repeat_button_rect and repeat_button_rect.collidepoint(mouse_pos):
+    # — Clear / Double / Repeat Bet buttons —
+    elif kind in ("clear", "double", "repeat"):
         if remaining < 5:
             app_globals.message      = "Betting Time is Over. Wait for wheel to stop."
             app_globals.message_time = pygame.time.get_ticks()
             return
-        placed_chips = last_placed_chips.copy()
+        if kind == "clear":
+            placed_chips.clear()
+            selected_chip = None
+        elif kind == "double":
+            for key in list(placed_chips):
+                placed_chips[key] *= 2
+        else:
+            placed_chips = last_placed_chips.copy()
         return
 
-    # — Tray-chip selection & placing logic —
-    # 1) Click tray chip?
-    for idx, rect in enumerate(chip_rects):
-        if rect.collidepoint(mouse_pos):
-            selected_chip = idx
-            return
-
-    # 2) If a chip is selected, clicking on a rank/suit/cell places a bet
-    if selected_chip is not None:
-        # Rank row
-        for ridx, rect in rank_icon_rects.items():
-            if rect.collidepoint(mouse_pos):
-                for (r, c) in cell_rects:
-                    if r == ridx:
-                        placed_chips[(r, c)] = placed_chips.get((r, c), 0) + chip_defs[selected_chip]['amount']
-                return
-        # Suit column
-        for cidx, rect in suit_icon_rects.items():
-            if rect.collidepoint(mouse_pos):
-                for (r, c) in cell_rects:
-                    if c == cidx:
-                        placed_chips[(r, c)] = placed_chips.get((r, c), 0) + chip_defs[selected_chip]['amount']
-                return
-        # Individual cell
-        for (ridx, cidx), rect in cell_rects.items():
-            if rect.collidepoint(mouse_pos):
-                placed_chips[(ridx, cidx)] = placed_chips.get((ridx, cidx), 0) + chip_defs[selected_chip]['amount']
-                return
-
-    # 3) Click anywhere else → deselect
-    selected_chip = None
\ No newline at end of file
+    # Click anywhere else → deselect
+    selected_chip = None